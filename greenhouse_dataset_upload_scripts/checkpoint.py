@@ -0,0 +1,120 @@
+import csv
+import os
+import threading
+from pathlib import Path
+from typing import Iterable
+
+JOURNAL_HEADERS = ["job_obj_id", "external_id"]
+
+
+class CheckpointJournal:
+    """
+    Append-only journal of completed uploads keyed on (job_obj_id, external_id).
+
+    load() reads the journal (and optionally older success CSVs) into an in-memory
+    set, so is_done() is an O(1) lookup. mark_done() appends and fsyncs every
+    `fsync_every` records, so a crash loses at most that many completions.
+    Safe to share between threads of one process.
+    """
+
+    def __init__(self, path: Path, fsync_every: int = 1):
+        self.path = Path(path)
+        self._fsync_every = max(1, fsync_every)
+        self._done: set[tuple[str, str]] = set()
+        self._lock = threading.Lock()
+        self._unsynced = 0
+        self._fh = None
+
+    def load(self, seed_csv_paths: Iterable[Path] = ()) -> int:
+        """
+        Loads completed keys from the journal plus any CSV that has job_obj_id and
+        external_id columns (e.g. profile_upload_success.csv). Returns the key count.
+        """
+        for p in [self.path, *seed_csv_paths]:
+            p = Path(p)
+            if not p.exists():
+                continue
+            with open(p, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    job_obj_id = (row.get("job_obj_id") or "").strip()
+                    external_id = (row.get("external_id") or "").strip()
+                    if job_obj_id and external_id:
+                        self._done.add((job_obj_id, external_id))
+        return len(self._done)
+
+    def __len__(self):
+        return len(self._done)
+
+    def is_done(self, job_obj_id: str, external_id: str) -> bool:
+        return (job_obj_id, external_id) in self._done
+
+    def _open(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists() or self.path.stat().st_size == 0
+        if not is_new:
+            # a crash mid-write can leave a torn last line; start on a fresh one
+            with open(self.path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b"\n"
+        self._fh = open(self.path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._fh)
+        if is_new:
+            self._writer.writerow(JOURNAL_HEADERS)
+        elif torn:
+            self._fh.write("\n")
+
+    def mark_done(self, job_obj_id: str, external_id: str):
+        with self._lock:
+            key = (job_obj_id, external_id)
+            if key in self._done:
+                return
+            if self._fh is None:
+                self._open()
+            self._writer.writerow(key)
+            self._done.add(key)
+            self._unsynced += 1
+            if self._unsynced >= self._fsync_every:
+                self._sync()
+
+    def add_pending(self, job_obj_id: str, external_id: str) -> bool:
+        """
+        Marks a key done in memory only (is_done() is True right away) and returns
+        whether it was new. The caller persists it later with mark_many().
+        """
+        with self._lock:
+            key = (job_obj_id, external_id)
+            if key in self._done:
+                return False
+            self._done.add(key)
+            return True
+
+    def mark_many(self, keys: Iterable[tuple[str, str]], sync: bool = True):
+        """
+        Journals a batch (typically keys from add_pending) with one write and, if
+        sync, one fsync regardless of fsync_every.
+        """
+        with self._lock:
+            keys = list(keys)
+            if not keys:
+                return
+            if self._fh is None:
+                self._open()
+            self._writer.writerows(keys)
+            self._done.update(keys)
+            if sync:
+                self._sync()
+            else:
+                self._fh.flush()
+                self._unsynced += len(keys)
+
+    def _sync(self):
+        self._fh.flush()
+        os.fsync(self._fh.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                self._sync()
+                self._fh.close()
+                self._fh = None
@@ -0,0 +1,143 @@
+import csv
+import hashlib
+import os
+import pickle
+import re
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+# Bump when the snapshot layout changes; old sidecars are then ignored and rewritten
+SNAPSHOT_FORMAT = 1
+# Where load_rows(snapshot=True) keeps its sidecars (never next to the data CSV)
+SNAPSHOT_DIR = Path("/home/asim/Desktop/clara-dataset-upload/logs/csv_snapshots")
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+# A field is either one column name or a tuple of alias names tried in order
+Field = Union[str, Sequence[str]]
+
+
+def norm_key(k: str) -> str:
+    """
+    "Job Obj ID" / "job-obj-id" / "\\ufeffjob_obj_id" -> "job_obj_id"
+    """
+    return _NON_ALNUM_RE.sub("_", (k or "").strip().lower()).strip("_")
+
+
+def _aliases(field: Field) -> tuple[str, ...]:
+    return (field,) if isinstance(field, str) else tuple(field)
+
+
+def _resolve(header: list[str], fields: Sequence[Field], required: Sequence[str], csv_path: Path):
+    normalized = [norm_key(h) for h in header]
+    positions = {}
+    for i, name in enumerate(normalized):
+        positions.setdefault(name, i)
+
+    missing = [r for r in required if norm_key(r) not in positions]
+    if missing:
+        raise ValueError(f"CSV must contain columns: {missing}. Found: {header} ({csv_path})")
+
+    # per field: indexes of every alias column present, in alias order
+    return [
+        tuple(positions[norm_key(a)] for a in _aliases(f) if norm_key(a) in positions)
+        for f in fields
+    ]
+
+
+def iter_rows(
+    csv_path: Path,
+    fields: Sequence[Field],
+    required: Sequence[str] = (),
+    encoding: str = "utf-8-sig",
+) -> Iterator[tuple[str, ...]]:
+    """
+    Streams `csv_path` once, one tuple of stripped strings per row, in `fields`
+    order. The header is normalized once (see norm_key); for a field with aliases
+    the first non-empty alias column wins, and a field with no matching column is
+    always "". Only the projected columns are touched per row.
+    The header is checked before this returns: ValueError if it is missing or a
+    `required` column is absent.
+    """
+    csv_path = Path(csv_path)
+    f = open(csv_path, newline="", encoding=encoding)
+    try:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header:
+            raise ValueError(f"CSV header not found: {csv_path}")
+        index = _resolve(header, fields, required, csv_path)
+    except BaseException:
+        f.close()
+        raise
+    return _stream(f, reader, index)
+
+
+def _stream(f, reader, index: list[tuple[int, ...]]) -> Iterator[tuple[str, ...]]:
+    with f:
+        for raw in reader:
+            if not raw:
+                continue
+            n = len(raw)
+            out = []
+            for idxs in index:
+                value = ""
+                for i in idxs:
+                    if i < n:
+                        value = raw[i].strip()
+                        if value:
+                            break
+                out.append(value)
+            yield tuple(out)
+
+
+def _snapshot_path(csv_path: Path, fields: Sequence[Field]) -> Path:
+    # one sidecar per (CSV location, projection), so same-named CSVs in different folders never collide
+    key = repr((str(csv_path.resolve()), [_aliases(f) for f in fields])).encode("utf-8")
+    digest = hashlib.sha1(key).hexdigest()[:12]
+    return SNAPSHOT_DIR / f"{csv_path.stem}.{digest}.snapshot.pickle"
+
+
+def load_rows(
+    csv_path: Path,
+    fields: Sequence[Field],
+    required: Sequence[str] = (),
+    snapshot: bool = False,
+    snapshot_path: Optional[Path] = None,
+) -> Iterable[tuple[str, ...]]:
+    """
+    Same rows as iter_rows, and the header is checked (ValueError) before this returns
+    in both modes. Without a snapshot the rows are an iterator streamed from the CSV.
+
+    With snapshot=True they are a list, and the projected columns are also kept in a
+    pickle sidecar (one list per column) under SNAPSHOT_DIR, or at `snapshot_path`.
+    The sidecar is reused while the CSV's size and mtime are unchanged, so later runs
+    skip CSV parsing entirely. A sidecar that cannot be read or written is ignored.
+    """
+    csv_path = Path(csv_path)
+    if not snapshot:
+        return iter_rows(csv_path, fields, required)
+
+    snapshot_path = Path(snapshot_path) if snapshot_path else _snapshot_path(csv_path, fields)
+    st = os.stat(csv_path)
+    stamp = (SNAPSHOT_FORMAT, st.st_size, st.st_mtime_ns, [_aliases(f) for f in fields], list(required))
+
+    try:
+        with open(snapshot_path, "rb") as f:
+            saved = pickle.load(f)
+        if saved.get("stamp") == stamp:
+            return list(zip(*saved["columns"])) if saved["columns"] else []
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, KeyError, TypeError):
+        pass
+
+    rows = list(iter_rows(csv_path, fields, required))
+    columns = [list(col) for col in zip(*rows)] if rows else []
+    tmp_path = snapshot_path.with_name(snapshot_path.name + ".tmp")
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump({"stamp": stamp, "columns": columns}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        pass
+    return rows
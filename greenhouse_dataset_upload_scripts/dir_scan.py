@@ -0,0 +1,48 @@
+import os
+import re
+from pathlib import Path
+from typing import Iterator, Optional
+
+PDF_SUFFIX = ".pdf"
+
+
+def scan_files(folder: Path, suffix: str = PDF_SUFFIX, name_re: Optional[re.Pattern] = None) -> Iterator[os.DirEntry]:
+    """
+    Streams the regular files (symlinks followed) directly in `folder` whose name
+    ends with `suffix` and, if given, matches `name_re`, in directory order.
+    Built on os.scandir: no Path objects, no up-front list, and the file-type check
+    comes from the directory listing itself on most filesystems.
+    """
+    with os.scandir(folder) as it:
+        for entry in it:
+            name = entry.name
+            if suffix and not name.endswith(suffix):
+                continue
+            if name_re is not None and not name_re.match(name):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+            except OSError:
+                continue
+            yield entry
+
+
+def sorted_file_names(folder: Path, suffix: str = PDF_SUFFIX, name_re: Optional[re.Pattern] = None) -> list[str]:
+    """
+    Same files as scan_files, as plain names in sorted order (the order
+    sorted(folder.glob("*.pdf")) gave), without building a Path per file.
+    """
+    return sorted(entry.name for entry in scan_files(folder, suffix, name_re))
+
+
+def file_name_set(folder: Path, suffix: str = PDF_SUFFIX) -> set[str]:
+    """
+    One directory scan -> set of file names, so "does <name> exist?" is a set
+    lookup instead of a stat() per row. An absent folder gives an empty set.
+    Files added to the folder later are not seen.
+    """
+    try:
+        return {entry.name for entry in scan_files(folder, suffix)}
+    except FileNotFoundError:
+        return set()
@@ -0,0 +1,159 @@
+import base64
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+import requests
+
+from http_client import create_session
+
+# Harvest's maximum page size
+PER_PAGE = 500
+# Pages fetched concurrently once the "last" link tells us how many there are (0 = follow "next" one by one)
+PREFETCH_PAGES = 4
+# Harvest counts X-RateLimit-Limit requests per this many seconds
+HARVEST_RATE_WINDOW = 10.0
+
+
+class GreenhouseClient:
+    def __init__(self, api_key, prefetch_pages=PREFETCH_PAGES):
+        self._base_url = "https://harvest.greenhouse.io/v1"
+        self._api_key = api_key
+        self._user_id = "4181321007"
+        self._next_page = None
+        self._prefetch_pages = prefetch_pages
+        # _process_headers also runs on the prefetch threads
+        self._state_lock = threading.Lock()
+
+        # keep-alive pool reused by every Harvest call; auth is encoded once, not per request
+        token = base64.b64encode(f"{self._api_key}:".encode("utf-8")).decode("utf-8")
+        # requests are paced by Harvest's X-RateLimit-* headers, so bulk runs stay under the limit
+        # instead of hitting 429s (the retry below is only a backstop)
+        self._session = create_session(pool_maxsize=max(1, prefetch_pages), rate_limit_window=HARVEST_RATE_WINDOW)
+        self._session.headers.update({
+            "Authorization": f"Basic {token}",
+            "Content-Type": "application/json"
+        })
+
+    def _request(self, method, endpoint, params=None, data=None, json_data=None, max_retries=3):
+        # endpoint is a path under the base URL, or an absolute URL from a "link" header
+        url = endpoint if endpoint.startswith("http") else f"{self._base_url}{endpoint}"
+
+        headers = {}
+        if method in {"POST", "PATCH", "PUT", "DELETE"}:
+            headers["On-Behalf-Of"] = self._user_id
+
+        retries = 0
+        while retries <= max_retries:
+            try:
+                response = self._session.request(
+                    method,
+                    url,
+                    params=params,
+                    data=data,
+                    json=json_data,
+                    headers=headers
+                )
+                response.raise_for_status()
+                self._process_headers(response.headers)
+                return response
+
+            except requests.HTTPError:
+                if response.status_code == 429:
+                    retry_after = response.headers.get("retry-after")
+                    time.sleep(float(retry_after or 2 ** retries))
+                    retries += 1
+                    continue
+                raise
+
+        raise Exception(f"Max retries exceeded for {method} {endpoint}")
+
+    def _make_request(self, method, endpoint, params=None, data=None, json_data=None, max_retries=3):
+        return self._request(method, endpoint, params, data, json_data, max_retries).json()
+
+    def _process_headers(self, headers):
+        link_header = headers.get("link")
+        if not link_header:
+            return
+
+        links = requests.utils.parse_header_links(link_header)
+        for link in links:
+            if link.get("rel") == "next":
+                # None when the link carries no page number (e.g. cursor-style links)
+                next_page = _page_number(link.get("url"))
+                with self._state_lock:
+                    self._next_page = next_page
+
+    # ---------------- PAGINATION ---------------- #
+
+    def _paginate(self, endpoint, params=None, per_page=PER_PAGE):
+        """
+        Yields every item of a paginated list endpoint, page by page, in order.
+
+        Follows the "next" links. When the first page's "next" link is page 2 and it
+        also has a page-numbered "last" link, the remaining pages are fetched up to
+        prefetch_pages at a time (still yielded in page order); otherwise (no page
+        numbers, e.g. cursor links) they are fetched one after another.
+        """
+        params = {**(params or {}), "per_page": per_page}
+        response = self._request("GET", endpoint, params=params)
+        yield from response.json()
+
+        next_url = response.links.get("next", {}).get("url")
+        last_page = _page_number(response.links.get("last", {}).get("url"))
+
+        if _page_number(next_url) == 2 and last_page and self._prefetch_pages > 1:
+            pages = range(2, last_page + 1)
+            with ThreadPoolExecutor(max_workers=self._prefetch_pages, thread_name_prefix="harvest-page") as pool:
+                window = []
+                for page in pages:
+                    window.append(pool.submit(self._make_request, "GET", endpoint, {**params, "page": page}))
+                    if len(window) >= self._prefetch_pages:
+                        yield from window.pop(0).result()
+                for fut in window:
+                    yield from fut.result()
+            return
+
+        while next_url:
+            response = self._request("GET", next_url)
+            yield from response.json()
+            next_url = response.links.get("next", {}).get("url")
+
+    def list_jobs(self, **params):
+        return self._paginate("/jobs", params)
+
+    def list_job_posts(self, **params):
+        return self._paginate("/job_posts", params)
+
+    def list_candidates(self, **params):
+        return self._paginate("/candidates", params)
+
+    def list_applications(self, **params):
+        return self._paginate("/applications", params)
+
+    # ---------------- JOB METHODS ---------------- #
+
+    def create_job(self, template_job_id, job_title, openings=1):
+        payload = {
+            "template_job_id": template_job_id,
+            "job_name": job_title,
+            "number_of_openings": openings
+        }
+        return self._make_request("POST", "/jobs", json_data=payload)
+
+    def get_job_posts(self, job_id):
+        return self._make_request("GET", f"/jobs/{job_id}/job_posts")
+
+    def update_job_post(self, job_post_id, description):
+        payload = {
+            "content": description,
+        }
+        return self._make_request("PATCH", f"/job_posts/{job_post_id}", json_data=payload)
+
+
+def _page_number(url):
+    if not url:
+        return None
+    page = parse_qs(urlparse(url).query).get("page", [None])[0]
+    return int(page) if page and page.isdigit() else None
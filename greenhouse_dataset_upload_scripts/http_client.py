@@ -0,0 +1,738 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+# ---------------- defaults ----------------
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+# A non-idempotent request (a resume upload) is only retried on these: the server
+# turned it away without acting on it. A 500/502/504 may come after the side effect.
+UNSAFE_RETRY_STATUSES = frozenset({429, 503})
+
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+AIMD_DECREASE_FACTOR = 0.5
+# a slow (but successful) response shrinks the window more gently than a 429/5xx
+AIMD_LATENCY_DECREASE_FACTOR = 0.9
+
+
+def is_overload_status(status: int) -> bool:
+    # "slow down" signals that shrink the concurrency window even when not retried
+    return status == 429 or 500 <= status < 600
+
+
+class TokenBucket:
+    """
+    Paces requests to `rate` per second with bursts up to `burst`; rate <= 0 disables pacing.
+    pause(seconds) blocks every caller, e.g. while honouring a server Retry-After.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate or 1)))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _take(self) -> float:
+        # 0 once a token is taken, else how long to wait before trying again
+        with self._lock:
+            now = time.monotonic()
+            if now < self._paused_until:
+                return self._paused_until - now
+            if self.rate <= 0:
+                return 0.0
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        while True:
+            wait_for = self._take()
+            if not wait_for:
+                return
+            time.sleep(wait_for)
+
+    async def acquire_async(self):
+        while True:
+            wait_for = self._take()
+            if not wait_for:
+                return
+            await asyncio.sleep(wait_for)
+
+
+class AimdLimiter:
+    """
+    Concurrency window between min_limit and max_limit.
+    Additive increase (about +1 per window of successes), multiplicative decrease on
+    overload (429/5xx/connection errors) and, if latency_target is set, on slow responses.
+    """
+
+    def __init__(self, max_limit: int, min_limit: int = 1, latency_target: Optional[float] = None):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.latency_target = latency_target
+        self.limit = float(self.max_limit)
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while self._in_flight >= int(self.limit):
+                self._cond.wait()
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._in_flight -= 1
+                self._cond.notify()
+
+    def on_success(self, latency: float):
+        with self._cond:
+            if self.latency_target and latency > self.latency_target:
+                self.limit = max(self.min_limit, self.limit * AIMD_LATENCY_DECREASE_FACTOR)
+            else:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            self._cond.notify_all()
+
+    def on_overload(self):
+        with self._cond:
+            self.limit = max(self.min_limit, self.limit * AIMD_DECREASE_FACTOR)
+
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff ("full jitter"); a server Retry-After always wins.
+    Read timeouts are only retried when retry_read_timeouts is set, because the
+    server may already have processed a non-idempotent POST. Requests the Throttle
+    marks non-idempotent are stricter still: only unsafe_retry_statuses and errors
+    raised while connecting (nothing was sent yet) are retried.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = MAX_RETRIES,
+        backoff_base: float = BACKOFF_BASE,
+        backoff_max: float = BACKOFF_MAX,
+        retry_statuses=RETRY_STATUSES,
+        retry_read_timeouts: bool = False,
+        unsafe_retry_statuses=UNSAFE_RETRY_STATUSES,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_read_timeouts = retry_read_timeouts
+        self.unsafe_retry_statuses = frozenset(unsafe_retry_statuses)
+
+    def statuses(self, idempotent: bool = True) -> frozenset:
+        return self.retry_statuses if idempotent else self.retry_statuses & self.unsafe_retry_statuses
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after) + random.uniform(0, self.backoff_base)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def is_retryable_error(self, exc: Exception) -> bool:
+        if isinstance(exc, requests.exceptions.ReadTimeout):
+            return self.retry_read_timeouts
+        return isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout))
+
+
+class RateLimitBudget:
+    """
+    Proactive pacing from the server's own budget headers (e.g. Greenhouse Harvest's
+    X-RateLimit-Limit / X-RateLimit-Remaining, counted per `window` seconds).
+
+    Once the limit is known, acquire() spreads requests evenly at limit/window per
+    second (times `headroom`), and when the remaining budget (less requests still in
+    flight) drops to `reserve` it waits for the window to roll over instead of
+    sending a request that would come back 429. Until then requests go one at a
+    time; after `probe_responses` responses without the headers the server is taken
+    not to send them and acquire() stops pacing (a later response that has them
+    turns it back on). update() must follow every acquire(), with the response
+    headers or None if the request failed. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        reserve: int = 1,
+        headroom: float = 0.95,
+        limit_header: str = "X-RateLimit-Limit",
+        remaining_header: str = "X-RateLimit-Remaining",
+        probe_responses: int = 3,
+    ):
+        self.window = window
+        self.reserve = max(0, reserve)
+        self.headroom = headroom
+        self.limit_header = limit_header
+        self.remaining_header = remaining_header
+        self.probe_responses = max(1, probe_responses)
+        self.limit: Optional[int] = None
+        self.waits = 0
+        self._unmetered = 0
+        self._remaining = 0
+        self._in_flight = 0
+        self._window_start = 0.0
+        self._next_at = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self.limit is None:
+                    if self._unmetered >= self.probe_responses:
+                        # the server doesn't send budget headers; nothing to pace by
+                        self._in_flight += 1
+                        return
+                    # nothing learned yet: let one request through at a time to learn it
+                    if self._in_flight == 0:
+                        self._in_flight += 1
+                        return
+                    wait_for = 0.05
+                else:
+                    if now >= self._window_start + self.window:
+                        # our estimate of the window has passed; assume a fresh budget
+                        self._window_start = now
+                        self._remaining = self.limit
+                    if self._remaining - self.reserve <= 0:
+                        wait_for = self._window_start + self.window - now
+                        self.waits += 1
+                    elif now < self._next_at:
+                        wait_for = self._next_at - now
+                    else:
+                        self._next_at = now + self.window / (self.limit * self.headroom)
+                        self._remaining -= 1
+                        self._in_flight += 1
+                        return
+            time.sleep(wait_for)
+
+    def update(self, headers=None):
+        with self._lock:
+            self._in_flight = max(0, self._in_flight - 1)
+            if headers is None:
+                return
+            try:
+                limit = int(headers.get(self.limit_header))
+                remaining = int(headers.get(self.remaining_header))
+            except (TypeError, ValueError):
+                if self.limit is None:
+                    self._unmetered += 1
+                return
+            now = time.monotonic()
+            if self.limit is None:
+                self.limit = max(1, limit)
+                self._window_start = now
+                self._remaining = remaining
+                return
+            self.limit = max(1, limit)
+            # responses arrive out of order; only a jump above everything we still
+            # expect to be counted means the server started a new window
+            if remaining > self._remaining + self._in_flight:
+                self._window_start = now
+                self._remaining = remaining - self._in_flight
+            else:
+                self._remaining = min(self._remaining, remaining)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class Throttle:
+    """
+    Pacing (token bucket), concurrency (AIMD) and retry (RetryPolicy) around one
+    "send" callable; shared by the requests adapter and the HTTP/2 transport.
+    Several adapters/transports may share one bucket/limiter for a host-wide budget.
+    Requests whose URL contains one of `non_idempotent_paths` get the policy's
+    non-idempotent retry rules (see RetryPolicy).
+    """
+
+    def __init__(
+        self,
+        bucket: Optional[TokenBucket] = None,
+        limiter: Optional[AimdLimiter] = None,
+        retry: Optional[RetryPolicy] = None,
+        budget: Optional[RateLimitBudget] = None,
+        non_idempotent_paths=(),
+    ):
+        self.bucket = bucket or TokenBucket(0)
+        self.limiter = limiter
+        self.retry = retry or RetryPolicy(max_retries=0)
+        self.budget = budget
+        self.non_idempotent_paths = tuple(non_idempotent_paths)
+        self.stats = {"requests": 0, "retries": 0, "overloads": 0, "gave_up": 0}
+        self._stats_lock = threading.Lock()
+
+    def is_idempotent(self, url: str) -> bool:
+        return not any(path in url for path in self.non_idempotent_paths)
+
+    def _gives_up(self, exc: BaseException, attempt: int, read_timeouts, connect_failed, idempotent: bool) -> bool:
+        if attempt >= self.retry.max_retries:
+            return True
+        if not idempotent:
+            # the request may have reached the server unless it failed while connecting
+            return connect_failed is None or not connect_failed(exc)
+        return isinstance(exc, read_timeouts) and not self.retry.retry_read_timeouts
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    @contextmanager
+    def _slot(self):
+        if self.limiter is None:
+            yield
+        else:
+            with self.limiter.slot():
+                yield
+
+    def run(self, send, rewind=None, transport_errors=(), read_timeouts=(), connect_failed=None, idempotent=True):
+        """
+        Calls send() until it returns a non-retryable response or retries run out.
+        `transport_errors` are retried (and count as overload) except `read_timeouts`,
+        which only retry when the policy allows it. With idempotent=False only errors
+        for which connect_failed(exc) is true are retried, and only the policy's
+        unsafe statuses. rewind() runs before each retry.
+        """
+        retry_statuses = self.retry.statuses(idempotent)
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            retry_after = None
+            with self._slot():
+                if self.budget is not None:
+                    self.budget.acquire()
+                self._count("requests")
+                started = time.monotonic()
+                try:
+                    resp = send()
+                except transport_errors as e:
+                    if self.budget is not None:
+                        self.budget.update(None)
+                    if self.limiter is not None:
+                        self.limiter.on_overload()
+                    if self._gives_up(e, attempt, read_timeouts, connect_failed, idempotent):
+                        self._count("gave_up")
+                        raise
+                except BaseException:
+                    if self.budget is not None:
+                        self.budget.update(None)
+                    raise
+                else:
+                    if self.budget is not None:
+                        self.budget.update(resp.headers)
+                    status = resp.status_code
+                    if is_overload_status(status):
+                        self._count("overloads")
+                        if self.limiter is not None:
+                            self.limiter.on_overload()
+                    elif self.limiter is not None:
+                        self.limiter.on_success(time.monotonic() - started)
+
+                    if status not in retry_statuses:
+                        return resp
+                    if attempt >= self.retry.max_retries:
+                        self._count("gave_up")
+                        return resp
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    resp.close()
+
+            delay = self.retry.delay(attempt, retry_after)
+            if retry_after is not None:
+                # everyone sharing the bucket backs off, not just this thread
+                self.bucket.pause(delay)
+            else:
+                time.sleep(delay)
+            if rewind is not None:
+                rewind()
+            attempt += 1
+            self._count("retries")
+
+
+class AsyncThrottle(Throttle):
+    """
+    Throttle for coroutines: the same pacing, AIMD window, retries and counters,
+    but every wait is an await, so one event loop can keep hundreds of requests
+    in flight. run() takes an async send(). Use from a single event loop;
+    RateLimitBudget is not supported here.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.budget is not None:
+            raise ValueError("AsyncThrottle does not support a RateLimitBudget")
+        self._in_flight = 0
+        self._cond: Optional[asyncio.Condition] = None
+
+    @asynccontextmanager
+    async def _async_slot(self):
+        if self.limiter is None:
+            yield
+            return
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._in_flight < int(self.limiter.limit))
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._in_flight -= 1
+                self._cond.notify_all()
+
+    async def run(self, send, rewind=None, transport_errors=(), read_timeouts=(), connect_failed=None, idempotent=True):
+        retry_statuses = self.retry.statuses(idempotent)
+        attempt = 0
+        while True:
+            await self.bucket.acquire_async()
+            retry_after = None
+            async with self._async_slot():
+                self._count("requests")
+                started = time.monotonic()
+                try:
+                    resp = await send()
+                except transport_errors as e:
+                    if self.limiter is not None:
+                        self.limiter.on_overload()
+                    if self._gives_up(e, attempt, read_timeouts, connect_failed, idempotent):
+                        self._count("gave_up")
+                        raise
+                else:
+                    status = resp.status_code
+                    if is_overload_status(status):
+                        self._count("overloads")
+                        if self.limiter is not None:
+                            self.limiter.on_overload()
+                    elif self.limiter is not None:
+                        self.limiter.on_success(time.monotonic() - started)
+
+                    if status not in retry_statuses:
+                        return resp
+                    if attempt >= self.retry.max_retries:
+                        self._count("gave_up")
+                        return resp
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                    await resp.aclose()
+
+            delay = self.retry.delay(attempt, retry_after)
+            if retry_after is not None:
+                self.bucket.pause(delay)
+            else:
+                await asyncio.sleep(delay)
+            if rewind is not None:
+                rewind()
+            attempt += 1
+            self._count("retries")
+
+
+def _requests_connect_failed(exc: BaseException) -> bool:
+    # refused, DNS failure or connect timeout: the request never left this host
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(exc.args[0], "reason", None) if exc.args else None
+    # urllib3's NewConnectionError (refused, DNS) is a ConnectTimeoutError
+    return isinstance(reason, urllib3.exceptions.ConnectTimeoutError)
+
+
+class ThrottledAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that runs every request through a Throttle, so callers like
+    validate_email/upload_resume stay plain session.post() calls.
+    """
+
+    def __init__(self, throttle: Optional[Throttle] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.throttle = throttle or Throttle()
+
+    def send(self, request, **kwargs):
+        def rewind():
+            if hasattr(request.body, "seek"):
+                request.body.seek(0)
+
+        return self.throttle.run(
+            lambda: super(ThrottledAdapter, self).send(request, **kwargs),
+            rewind=rewind,
+            transport_errors=(requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+            read_timeouts=(requests.exceptions.ReadTimeout,),
+            connect_failed=_requests_connect_failed,
+            idempotent=self.throttle.is_idempotent(request.url),
+        )
+
+    def connection_stats(self) -> dict:
+        """
+        Requests sent vs TCP(+TLS) connections opened by this adapter's live pools.
+        """
+        pools = self.poolmanager.pools
+        opened = sent = 0
+        for key in list(pools.keys()):
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue
+            opened += pool.num_connections
+            sent += pool.num_requests
+        return {"requests": sent, "new_connections": opened, "reused": max(0, sent - opened)}
+
+
+# ---------------- session factory ----------------
+# Distinct hosts kept in the pool cache, and keep-alive connections kept per host
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 10
+
+
+def create_session(
+    pool_connections: int = POOL_CONNECTIONS,
+    pool_maxsize: int = POOL_MAXSIZE,
+    pool_block: bool = False,
+    max_rps: float = 0,
+    max_concurrency: Optional[int] = None,
+    latency_target: Optional[float] = None,
+    max_retries: int = 0,
+    http2: bool = False,
+    rate_limit_window: Optional[float] = None,
+    non_idempotent_paths=(),
+):
+    """
+    The one HTTP client factory for every script.
+
+    Returns a keep-alive requests.Session whose adapter pools up to `pool_maxsize`
+    connections per host (pool_block=True makes extra threads wait for a free
+    connection instead of opening throwaway ones). max_rps / max_concurrency /
+    max_retries switch on the Throttle; the defaults send every request once, unpaced.
+    rate_limit_window paces by the server's X-RateLimit-* headers (see RateLimitBudget).
+    URLs containing one of non_idempotent_paths are only retried when that is safe.
+
+    http2=True returns an httpx.Client (optional dependency: pip install "httpx[http2]")
+    with the same throttling; its post()/request() calls match how the upload
+    scripts use a requests.Session.
+    """
+    throttle = Throttle(
+        bucket=TokenBucket(max_rps),
+        limiter=AimdLimiter(max_concurrency, latency_target=latency_target) if max_concurrency else None,
+        retry=RetryPolicy(max_retries=max_retries),
+        budget=RateLimitBudget(rate_limit_window) if rate_limit_window else None,
+        non_idempotent_paths=non_idempotent_paths,
+    )
+    if http2:
+        return _create_http2_client(pool_maxsize, throttle)
+
+    session = requests.Session()
+    adapter = ThrottledAdapter(
+        throttle=throttle,
+        pool_connections=max(1, pool_connections),
+        pool_maxsize=max(1, pool_maxsize),
+        pool_block=pool_block,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _create_http2_client(pool_maxsize: int, throttle: Throttle):
+    try:
+        import httpx
+    except ImportError as e:
+        raise RuntimeError('HTTP/2 needs httpx with the h2 extra: pip install "httpx[http2]"') from e
+
+    class ThrottledTransport(httpx.HTTPTransport):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            self.throttle = throttle
+            self._streams = set()
+            self._sent = 0
+
+        def handle_request(self, request):
+            resp = self.throttle.run(
+                lambda: super(ThrottledTransport, self).handle_request(request),
+                transport_errors=(httpx.TransportError,),
+                read_timeouts=(httpx.ReadTimeout,),
+                connect_failed=lambda e: isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout)),
+                idempotent=self.throttle.is_idempotent(str(request.url)),
+            )
+            # one network stream per TCP+TLS connection; HTTP/2 multiplexes many requests on it
+            stream = resp.extensions.get("network_stream")
+            self._sent += 1
+            if stream is not None:
+                self._streams.add(id(stream))
+            return resp
+
+        def connection_stats(self) -> dict:
+            opened = len(self._streams)
+            return {"requests": self._sent, "new_connections": opened, "reused": max(0, self._sent - opened)}
+
+    limits = httpx.Limits(max_connections=max(1, pool_maxsize), max_keepalive_connections=max(1, pool_maxsize))
+    transport = ThrottledTransport(http2=True, limits=limits)
+    return httpx.Client(transport=transport)
+
+
+class AsyncResponse:
+    """
+    A fully read aiohttp response with the attributes the upload scripts use on a
+    requests.Response (status_code, headers, text, json()).
+    """
+
+    def __init__(self, status_code: int, headers, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    async def aclose(self):
+        pass
+
+
+class AsyncSession:
+    """
+    aiohttp.ClientSession behind an AsyncThrottle, with requests-style post()/request().
+    At most `limit_per_host` connections are opened per host; the aiohttp session is
+    created on first use inside the running event loop. Close with aclose().
+    """
+
+    def __init__(self, throttle: AsyncThrottle, limit_per_host: int):
+        self.throttle = throttle
+        self.limit_per_host = max(1, limit_per_host)
+        self._session = None
+        self._sent = 0
+        self._opened = 0
+
+    def _open(self):
+        import aiohttp
+
+        async def on_connection_created(session, ctx, params):
+            self._opened += 1
+
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(on_connection_created)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=0, limit_per_host=self.limit_per_host),
+            trace_configs=[trace],
+        )
+        return self._session
+
+    async def request(self, method: str, url: str, headers: Optional[dict] = None, timeout: Optional[float] = None, **kwargs):
+        import aiohttp
+
+        session = self._session or self._open()
+
+        async def send():
+            # a new request (and body payload) per attempt, so retries resend from the start
+            async with session.request(
+                method, url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout), **kwargs
+            ) as resp:
+                self._sent += 1
+                return AsyncResponse(resp.status, resp.headers, await resp.read())
+
+        # ServerTimeoutError is also an asyncio.TimeoutError: not retried unless the policy allows it.
+        # ConnectionTimeoutError (connect-phase timeout) only exists in newer aiohttp releases.
+        connect_errors = (aiohttp.ClientConnectorError, getattr(aiohttp, "ConnectionTimeoutError", aiohttp.ClientConnectorError))
+        return await self.throttle.run(
+            send,
+            transport_errors=(aiohttp.ClientConnectionError, asyncio.TimeoutError),
+            read_timeouts=(asyncio.TimeoutError,),
+            connect_failed=lambda e: isinstance(e, connect_errors),
+            idempotent=self.throttle.is_idempotent(url),
+        )
+
+    async def post(self, url: str, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        if self._session is not None:
+            await self._session.close()
+
+    def connection_stats(self) -> dict:
+        return {"requests": self._sent, "new_connections": self._opened, "reused": max(0, self._sent - self._opened)}
+
+
+def create_async_client(
+    pool_maxsize: int = POOL_MAXSIZE,
+    max_rps: float = 0,
+    max_concurrency: Optional[int] = None,
+    latency_target: Optional[float] = None,
+    max_retries: int = 0,
+    non_idempotent_paths=(),
+) -> AsyncSession:
+    """
+    asyncio counterpart of create_session (optional dependency: pip install aiohttp):
+    an AsyncSession keeping at most pool_maxsize connections per host, with the same
+    pacing / AIMD / retry settings through an AsyncThrottle.
+    """
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("The asyncio mode needs aiohttp: pip install aiohttp") from e
+
+    throttle = AsyncThrottle(
+        bucket=TokenBucket(max_rps),
+        limiter=AimdLimiter(max_concurrency, latency_target=latency_target) if max_concurrency else None,
+        retry=RetryPolicy(max_retries=max_retries),
+        non_idempotent_paths=non_idempotent_paths,
+    )
+    return AsyncSession(throttle, limit_per_host=pool_maxsize)
+
+
+def session_stats(session) -> dict:
+    """
+    Throttle counters plus connection reuse for a client built by create_session.
+    """
+    if isinstance(session, requests.Session):
+        adapter = session.get_adapter("https://")
+    elif isinstance(session, AsyncSession):
+        adapter = session
+    else:
+        adapter = session._transport
+    stats = {}
+    if isinstance(getattr(adapter, "throttle", None), Throttle):
+        stats.update(adapter.throttle.stats)
+        if adapter.throttle.limiter is not None:
+            stats["concurrency_limit"] = round(adapter.throttle.limiter.limit, 1)
+        if adapter.throttle.budget is not None:
+            stats["rate_limit"] = adapter.throttle.budget.limit
+            stats["rate_limit_waits"] = adapter.throttle.budget.waits
+    if hasattr(adapter, "connection_stats"):
+        stats.update({f"conn_{k}": v for k, v in adapter.connection_stats().items()})
+    return stats
@@ -0,0 +1,154 @@
+import binascii
+import os
+from pathlib import Path
+from typing import Optional
+
+import requests
+
+# Bytes pulled from the PDF per read while sending
+CHUNK_SIZE = 64 * 1024
+
+
+def _quote(value: str) -> str:
+    # same escaping urllib3 uses for multipart header parameters
+    return value.replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+
+class MultipartFileBody:
+    """
+    multipart/form-data body of some text fields plus one file, streamed from disk.
+
+    The field parts and part headers are encoded up front (a few hundred bytes),
+    the file is read CHUNK_SIZE bytes at a time while the request is sent, and the
+    total length is known in advance, so the request carries a Content-Length and
+    memory use does not depend on the file size. Rewindable with seek(0), which the
+    retrying adapter in http_client does before a retry; iterating it always starts
+    from the first byte (see _BodyStream for clients that resend by re-iterating).
+
+    Use as a context manager (or call close()) to release the file handle.
+    """
+
+    def __init__(
+        self,
+        fields: dict,
+        file_field: str,
+        file_path: Path,
+        content_type: str = "application/octet-stream",
+        filename: Optional[str] = None,
+    ):
+        self._path = Path(file_path)
+        boundary = binascii.hexlify(os.urandom(16)).decode("ascii")
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+
+        head = []
+        for name, value in fields.items():
+            head.append(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{_quote(str(name))}"\r\n\r\n{value}\r\n'
+            )
+        head.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{_quote(file_field)}"; '
+            f'filename="{_quote(filename or self._path.name)}"\r\nContent-Type: {content_type}\r\n\r\n'
+        )
+        self._prefix = "".join(head).encode("utf-8")
+        self._suffix = f"\r\n--{boundary}--\r\n".encode("ascii")
+        self._file_size = os.stat(self._path).st_size
+        self._length = len(self._prefix) + self._file_size + len(self._suffix)
+
+        self._f = None
+        self._pos = 0
+
+    def __len__(self):
+        return self._length
+
+    @property
+    def headers(self) -> dict:
+        return {"Content-Type": self.content_type, "Content-Length": str(self._length)}
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = self._length - self._pos
+        out = []
+        while size > 0 and self._pos < self._length:
+            file_start = len(self._prefix)
+            file_end = file_start + self._file_size
+            if self._pos < file_start:
+                piece = self._prefix[self._pos:min(file_start, self._pos + size)]
+            elif self._pos < file_end:
+                if self._f is None:
+                    self._f = open(self._path, "rb")
+                    self._f.seek(self._pos - file_start)
+                piece = self._f.read(min(size, file_end - self._pos, CHUNK_SIZE))
+                if not piece:
+                    raise IOError(f"{self._path} shrank while it was being uploaded")
+            else:
+                offset = self._pos - file_end
+                piece = self._suffix[offset:offset + size]
+            out.append(piece)
+            self._pos += len(piece)
+            size -= len(piece)
+        return b"".join(out)
+
+    def __iter__(self):
+        self.seek(0)
+        while True:
+            chunk = self.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET):
+        if offset != 0 or whence != os.SEEK_SET:
+            raise ValueError("MultipartFileBody can only be rewound to the start")
+        self._pos = 0
+        if self._f is not None:
+            self._f.seek(0)
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _BodyStream:
+    """
+    Iterable-only view of a MultipartFileBody for httpx and aiohttp. Both resend a
+    retried request by iterating the body again (httpx would read() a file-like body
+    from wherever the last attempt stopped), and each iteration starts from the first
+    byte. The chunks are small disk reads, done inline.
+    """
+
+    def __init__(self, body: MultipartFileBody):
+        self._body = body
+
+    def __iter__(self):
+        return iter(self._body)
+
+    async def __aiter__(self):
+        for chunk in self._body:
+            yield chunk
+
+
+def post_multipart(session, url: str, body: MultipartFileBody, headers: Optional[dict] = None, **kwargs):
+    """
+    POSTs a MultipartFileBody with any client built by http_client.create_session
+    (a requests.Session streams it as `data`, the HTTP/2 httpx client as `content`).
+    """
+    headers = {**(headers or {}), **body.headers}
+    if isinstance(session, requests.Session):
+        return session.post(url, data=body, headers=headers, **kwargs)
+    return session.post(url, content=_BodyStream(body), headers=headers, **kwargs)
+
+
+async def post_multipart_async(client, url: str, body: MultipartFileBody, headers: Optional[dict] = None, **kwargs):
+    """
+    post_multipart for the AsyncSession built by http_client.create_async_client;
+    the Content-Length header keeps aiohttp from switching to chunked encoding.
+    """
+    headers = {**(headers or {}), **body.headers}
+    return await client.post(url, data=_BodyStream(body), headers=headers, **kwargs)
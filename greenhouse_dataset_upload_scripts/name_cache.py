@@ -0,0 +1,131 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+# Bump when the on-disk layout changes (the per-heuristic version lives in each row)
+SCHEMA_VERSION = 1
+
+# Uncommitted puts are flushed after this many rows (and always on close)
+COMMIT_EVERY = 50
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def heuristic_version(heuristic: str, bad_keywords: Iterable[str]) -> str:
+    """
+    Version key for cached names, e.g. heuristic_version("first_page_v1", BAD_KEYWORDS).
+    Changing the keyword list or the heuristic tag invalidates every cached entry.
+    """
+    raw = heuristic + "|" + ",".join(sorted(bad_keywords))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class NameCache:
+    """
+    On-disk (first_name, last_name) cache keyed by PDF content hash + heuristic version.
+
+    A second table remembers path -> (size, mtime_ns, digest) so unchanged files on a
+    retry run cost one stat() and one lookup instead of re-hashing or re-parsing.
+    Safe to share between threads of one process.
+    """
+
+    def __init__(self, db_path: Path, version: str):
+        self._db_path = Path(db_path)
+        self._version = version
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, digest TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS names ("
+            " digest TEXT NOT NULL, version TEXT NOT NULL, first_name TEXT NOT NULL, last_name TEXT NOT NULL,"
+            " PRIMARY KEY (digest, version))"
+        )
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        if row and row[0] != str(SCHEMA_VERSION):
+            self._conn.execute("DELETE FROM files")
+            self._conn.execute("DELETE FROM names")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)", (str(SCHEMA_VERSION),)
+        )
+        self._conn.commit()
+
+    def _digest_for(self, pdf_path: Path) -> str:
+        # caller holds self._lock
+        st = os.stat(pdf_path)
+        key = str(Path(pdf_path).resolve())
+        row = self._conn.execute(
+            "SELECT size, mtime_ns, digest FROM files WHERE path = ?", (key,)
+        ).fetchone()
+        if row and row[0] == st.st_size and row[1] == st.st_mtime_ns:
+            return row[2]
+
+        digest = file_digest(pdf_path)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+            (key, st.st_size, st.st_mtime_ns, digest),
+        )
+        self._mark_dirty()
+        return digest
+
+    def _mark_dirty(self):
+        self._pending += 1
+        if self._pending >= COMMIT_EVERY:
+            self._conn.commit()
+            self._pending = 0
+
+    def get(self, pdf_path: Path) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            try:
+                digest = self._digest_for(pdf_path)
+            except OSError:
+                return None
+            row = self._conn.execute(
+                "SELECT first_name, last_name FROM names WHERE digest = ? AND version = ?",
+                (digest, self._version),
+            ).fetchone()
+            if row:
+                self.hits += 1
+                return (row[0], row[1])
+            self.misses += 1
+            return None
+
+    def put(self, pdf_path: Path, names: Tuple[str, str]):
+        with self._lock:
+            try:
+                digest = self._digest_for(pdf_path)
+            except OSError:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO names (digest, version, first_name, last_name) VALUES (?, ?, ?, ?)",
+                (digest, self._version, names[0], names[1]),
+            )
+            self._mark_dirty()
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
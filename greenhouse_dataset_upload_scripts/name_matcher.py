@@ -0,0 +1,76 @@
+import re
+from typing import Iterable, Optional
+
+# Runs of the characters a name may contain. findall() over a line gives the same
+# tokens as replacing every other character with a space, collapsing whitespace and split().
+_NAME_TOKEN_RE = re.compile(r"[A-Za-z\-\']+")
+
+
+def tokenize(line: str) -> list[str]:
+    return _NAME_TOKEN_RE.findall(line)
+
+
+def normalize_line(line: str) -> str:
+    """
+    "  Jane  O'Neil, PhD." -> "Jane O'Neil PhD"
+    """
+    return " ".join(_NAME_TOKEN_RE.findall(line))
+
+
+def compile_reject(keywords: Iterable[str], symbols: str = "", digits: bool = False) -> re.Pattern:
+    """
+    One alternation regex that finds any of `keywords` (as substrings), any of the
+    single `symbols`, and optionally any decimal digit, in a single scan.
+    Match it against the lowercased line; keywords are expected lowercase.
+    """
+    alts = [re.escape(k) for k in sorted(set(keywords), key=lambda k: (-len(k), k)) if k]
+    if symbols:
+        alts.append("[" + "".join(re.escape(c) for c in symbols) + "]")
+    if digits:
+        alts.append(r"\d")
+    return re.compile("|".join(alts) if alts else r"(?!)")
+
+
+def _rejected(reject: re.Pattern, low: str, digits: bool) -> bool:
+    if reject.search(low):
+        return True
+    # \d only covers decimal digits; str.isdigit() also accepts e.g. superscripts,
+    # which can only appear in non-ASCII lines
+    return digits and not low.isascii() and any(ch.isdigit() for ch in low)
+
+
+def reasonable_name_tokens(line: str, reject: re.Pattern, max_len: int = 60, digits: bool = True) -> Optional[list[str]]:
+    """
+    First-page rule: the raw line is at most max_len long and has no reject match;
+    its name tokens are 2-4 words of at least 2 letters each.
+    Returns the tokens, or None if the line is not a name.
+    """
+    if not line or len(line) > max_len:
+        return None
+    if _rejected(reject, line.lower(), digits):
+        return None
+    parts = _NAME_TOKEN_RE.findall(line)
+    if not (2 <= len(parts) <= 4) or any(len(p) < 2 for p in parts):
+        return None
+    return parts
+
+
+def name_candidate_tokens(line: str, reject: re.Pattern, max_len: int = 60) -> Optional[list[str]]:
+    """
+    Normalize-first rule: the line is normalized before the length and reject
+    checks; the normalized line must have at least 3 characters and 2-4 words of
+    at least 2 letters each. Returns the tokens, or None.
+    """
+    parts = _NAME_TOKEN_RE.findall(line)
+    candidate = " ".join(parts)
+    if len(candidate) < 3 or len(candidate) > max_len:
+        return None
+    if reject.search(candidate.lower()):
+        return None
+    if not (2 <= len(parts) <= 4) or any(len(p) < 2 for p in parts):
+        return None
+    return parts
+
+
+def split_name(parts: list[str]) -> tuple[str, str]:
+    return parts[0].title(), " ".join(parts[1:]).title()
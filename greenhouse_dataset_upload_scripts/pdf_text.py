@@ -0,0 +1,87 @@
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TypeVar
+
+import pdfplumber
+
+T = TypeVar("T")
+
+# Tiers, cheapest first. "top" lays out only the top band of page 1, "full" every page read.
+TIER_TOP = "top"
+TIER_FULL = "full"
+# No tier produced a match, or the PDF could not be read at all
+TIER_NONE = "none"
+TIER_ERROR = "error"
+
+# Fraction of the first page height read by the "top" tier; names sit in the header
+TOP_FRACTION = 0.25
+
+
+def iter_text_tiers(pdf_path: Path, max_pages: int = 1, top_fraction: float = TOP_FRACTION) -> Iterator[tuple[str, str]]:
+    """
+    Yields (tier, text) from cheapest to most expensive, opening the PDF once.
+    Stop iterating as soon as the text is good enough; later tiers are never computed.
+
+    The "top" text is the reading-order prefix of the "full" text, so picking the
+    first matching line gives the same answer in either tier whenever the top band
+    contains one.
+    """
+    with pdfplumber.open(str(pdf_path)) as pdf:
+        pages = pdf.pages[:max_pages]
+        if not pages:
+            return
+        first = pages[0]
+        x0, top, x1, bottom = first.bbox
+        band = first.crop((x0, top, x1, top + (bottom - top) * top_fraction))
+        yield TIER_TOP, (band.extract_text() or "").strip()
+        yield TIER_FULL, "\n".join((p.extract_text() or "") for p in pages).strip()
+
+
+def extract_tiered(
+    pdf_path: Path,
+    pick: Callable[[str], Optional[T]],
+    max_pages: int = 1,
+    top_fraction: float = TOP_FRACTION,
+) -> tuple[Optional[T], str, float]:
+    """
+    Runs pick(text) on each tier until it returns something other than None.
+    Returns (value or None, tier that produced it / TIER_NONE / TIER_ERROR, seconds spent).
+    """
+    started = time.perf_counter()
+    try:
+        for tier, text in iter_text_tiers(pdf_path, max_pages, top_fraction):
+            value = pick(text) if text else None
+            if value is not None:
+                return value, tier, time.perf_counter() - started
+        return None, TIER_NONE, time.perf_counter() - started
+    except Exception:
+        return None, TIER_ERROR, time.perf_counter() - started
+
+
+class ParseStats:
+    """
+    Files and parse seconds per tier, to show how often the cheap path was enough.
+    Safe to share between threads of one process.
+    """
+
+    def __init__(self):
+        self._files: dict[str, int] = {}
+        self._seconds: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tier: str, seconds: float):
+        with self._lock:
+            self._files[tier] = self._files.get(tier, 0) + 1
+            self._seconds[tier] = self._seconds.get(tier, 0.0) + seconds
+
+    def summary(self) -> str:
+        with self._lock:
+            if not self._files:
+                return "no PDFs parsed"
+            total = sum(self._files.values())
+            parts = [
+                f"{tier}={n} ({self._seconds[tier] * 1000 / n:.1f} ms/file)"
+                for tier, n in sorted(self._files.items(), key=lambda kv: -kv[1])
+            ]
+            return f"{total} parsed, {sum(self._seconds.values()):.2f}s | " + " ".join(parts)
@@ -0,0 +1,126 @@
+import csv
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from checkpoint import CheckpointJournal
+
+# Buffered rows/lines are written to the OS after this many writes or seconds, whichever comes first
+FLUSH_EVERY = 200
+FLUSH_INTERVAL = 2.0
+# fsync at most this often (seconds); 0 = only on close()
+FSYNC_INTERVAL = 30.0
+
+
+class ResultSink:
+    """
+    Keeps the success CSV, failure CSV and progress log open for the whole run and
+    batches writes, instead of open/stat/append/close per resume.
+
+    Writes are buffered in memory and flushed every FLUSH_EVERY writes or
+    FLUSH_INTERVAL seconds; fsync runs at most every FSYNC_INTERVAL seconds and on
+    close(). If a checkpoint journal is given, successful (job_obj_id, external_id)
+    keys are journaled only after their success rows were flushed (and fsynced
+    together with them), so a resumed run never skips an upload whose success row
+    was lost.
+    Safe to share between threads of one process.
+    """
+
+    def __init__(
+        self,
+        success_path: Path,
+        success_headers: list[str],
+        fail_path: Path,
+        fail_headers: list[str],
+        progress_path: Optional[Path] = None,
+        checkpoint: Optional[CheckpointJournal] = None,
+        flush_every: int = FLUSH_EVERY,
+        flush_interval: float = FLUSH_INTERVAL,
+        fsync_interval: float = FSYNC_INTERVAL,
+    ):
+        self._success_headers = success_headers
+        self._fail_headers = fail_headers
+        self._checkpoint = checkpoint
+        self._flush_every = max(1, flush_every)
+        self._flush_interval = flush_interval
+        self._fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+
+        self._success_f = self._open(success_path, success_headers)
+        self._fail_f = self._open(fail_path, fail_headers)
+        self._progress_f = self._open(progress_path) if progress_path else None
+        self._success_w = csv.writer(self._success_f)
+        self._fail_w = csv.writer(self._fail_f)
+
+        self._unflushed = 0
+        self._pending_done: list[tuple[str, str]] = []
+        self._last_flush = self._last_fsync = time.monotonic()
+
+    @staticmethod
+    def _open(path: Path, headers: Optional[list[str]] = None):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = open(path, "a", newline="", encoding="utf-8", buffering=1024 * 1024)
+        if headers and f.tell() == 0:
+            csv.writer(f).writerow(headers)
+        return f
+
+    def _files(self):
+        return [f for f in (self._success_f, self._fail_f, self._progress_f) if f is not None]
+
+    def write_success(self, **kwargs):
+        with self._lock:
+            self._success_w.writerow([kwargs.get(h, "") for h in self._success_headers])
+            job_obj_id, external_id = kwargs.get("job_obj_id"), kwargs.get("external_id")
+            if self._checkpoint is not None and job_obj_id and external_id:
+                if self._checkpoint.add_pending(job_obj_id, external_id):
+                    self._pending_done.append((job_obj_id, external_id))
+            self._wrote()
+
+    def write_fail(self, **kwargs):
+        with self._lock:
+            self._fail_w.writerow([kwargs.get(h, "") for h in self._fail_headers])
+            self._wrote()
+
+    def write_progress(self, line: str):
+        if self._progress_f is None:
+            return
+        with self._lock:
+            self._progress_f.write(line + "\n")
+            self._wrote()
+
+    def _wrote(self):
+        # caller holds self._lock
+        self._unflushed += 1
+        now = time.monotonic()
+        if self._unflushed >= self._flush_every or now - self._last_flush >= self._flush_interval:
+            self._flush(fsync=bool(self._fsync_interval) and now - self._last_fsync >= self._fsync_interval)
+
+    def _flush(self, fsync: bool):
+        # caller holds self._lock
+        for f in self._files():
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        now = time.monotonic()
+        self._last_flush = now
+        if fsync:
+            self._last_fsync = now
+        self._unflushed = 0
+
+        if self._pending_done:
+            # success rows are already flushed (and fsynced if `fsync`), so the journal never runs ahead
+            self._checkpoint.mark_many(self._pending_done, sync=fsync)
+            self._pending_done = []
+
+    def flush(self, fsync: bool = False):
+        with self._lock:
+            self._flush(fsync=fsync)
+
+    def close(self):
+        with self._lock:
+            self._flush(fsync=True)
+            for f in self._files():
+                f.close()
@@ -0,0 +1,84 @@
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable
+
+# Bump when the on-disk layout changes
+SCHEMA_VERSION = 1
+
+# Keys per SELECT ... IN (...) (SQLite's default host-parameter limit is 999)
+LOOKUP_CHUNK = 900
+
+
+class ScoreStore:
+    """
+    On-disk application_obj_id -> final fit_score map for incremental exports.
+
+    Only non-empty scores are stored: an application that has a score never needs
+    to be queried again, so a refresh only costs the applications still waiting for
+    one. Values keep their JSON type (a float stays a float in the CSV).
+    Safe to share between threads of one process.
+    """
+
+    def __init__(self, db_path: Path):
+        self._db_path = Path(db_path)
+        self._lock = threading.Lock()
+
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self._db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores (application_obj_id TEXT PRIMARY KEY, fit_score TEXT NOT NULL)"
+        )
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+        if row and row[0] != str(SCHEMA_VERSION):
+            self._conn.execute("DELETE FROM scores")
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema', ?)", (str(SCHEMA_VERSION),)
+        )
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+    def get_many(self, application_obj_ids: Iterable[str]) -> dict:
+        """
+        {application_obj_id: fit_score} for the ids that already have a final score.
+        """
+        ids = list(dict.fromkeys(application_obj_ids))
+        found = {}
+        with self._lock:
+            for i in range(0, len(ids), LOOKUP_CHUNK):
+                chunk = ids[i:i + LOOKUP_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                for key, value in self._conn.execute(
+                    f"SELECT application_obj_id, fit_score FROM scores WHERE application_obj_id IN ({marks})", chunk
+                ):
+                    found[key] = json.loads(value)
+        return found
+
+    def put_many(self, scores: dict):
+        """
+        Records final scores; empty ones ("" / None) are skipped so they get re-queried.
+        Values JSON can't encode (Decimal128, ObjectId, ...) are stored as str(), which is
+        also how they end up in the output CSV.
+        """
+        items = [(str(k), json.dumps(v, default=str)) for k, v in scores.items() if v not in ("", None)]
+        if not items:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO scores (application_obj_id, fit_score) VALUES (?, ?)", items
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
@@ -1,7 +1,9 @@
-import csv
 import shutil
 from pathlib import Path
 
+from csv_loader import load_rows
+from dir_scan import file_name_set
+
 CSV_PATH = Path("/home/asim/Desktop/clara-dataset-upload/clara_dataset/Clara - Candidate Matching - 2026-01-20 - Applications.csv")
 
 SRC_DIR = Path("/home/asim/Desktop/clara-dataset-upload/clara_dataset/resume_dataset/profile_resumes")  # where profile_id.pdf files exist
@@ -10,6 +12,9 @@ OUT_DIR = Path("/home/asim/Desktop/clara-dataset-upload/clara_dataset/resume_dat
 PROFILE_COL = "profile_id"
 EXTERNAL_COL = "external_id"
 
+# True: keep a pickle sidecar of the projected columns (csv_loader.SNAPSHOT_DIR) so re-runs skip parsing the big CSV
+CSV_SNAPSHOT = False
+
 
 def main():
     OUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -17,36 +22,31 @@ def main():
     copied = 0
     missing = 0
 
-    with CSV_PATH.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-
-        # quick validation
-        if not reader.fieldnames:
-            raise ValueError("CSV header not found.")
-        if PROFILE_COL not in reader.fieldnames or EXTERNAL_COL not in reader.fieldnames:
-            raise ValueError(
-                f"CSV must contain columns: '{PROFILE_COL}' and '{EXTERNAL_COL}'. "
-                f"Found: {reader.fieldnames}"
-            )
+    rows = load_rows(
+        CSV_PATH,
+        [PROFILE_COL, EXTERNAL_COL],
+        required=[PROFILE_COL, EXTERNAL_COL],
+        snapshot=CSV_SNAPSHOT,
+    )
 
-        for row in reader:
-            profile_id = (row.get(PROFILE_COL) or "").strip()
-            external_id = (row.get(EXTERNAL_COL) or "").strip()
+    # one directory scan up front; the existence checks below are set lookups, not stat() calls
+    src_names = file_name_set(SRC_DIR)
 
-            if not profile_id or not external_id:
-                continue
+    for profile_id, external_id in rows:
+        if not profile_id or not external_id:
+            continue
 
-            src_pdf = SRC_DIR / f"{profile_id}.pdf"
-            dst_pdf = OUT_DIR / f"{external_id}.pdf"
+        src_pdf = SRC_DIR / f"{profile_id}.pdf"
+        dst_pdf = OUT_DIR / f"{external_id}.pdf"
 
-            if not src_pdf.exists():
-                missing += 1
-                print(f"Missing: {src_pdf}")
-                continue
+        if src_pdf.name not in src_names:
+            missing += 1
+            print(f"Missing: {src_pdf}")
+            continue
 
-            # copy + rename (original remains untouched)
-            shutil.copy2(src_pdf, dst_pdf)
-            copied += 1
+        # copy + rename (original remains untouched)
+        shutil.copy2(src_pdf, dst_pdf)
+        copied += 1
 
     print("\nDone.")
     print(f"Copied: {copied}")
@@ -1,7 +1,9 @@
-import csv
 import shutil
 from pathlib import Path
 
+from csv_loader import load_rows
+from dir_scan import file_name_set
+
 CSV_PATH = Path("/home/asim/Desktop/clara-dataset-upload/clara_dataset/Clara - Candidate Matching - 2026-01-20 - Applications.csv")  # your clara-candidate Matching.csv
 
 RENAMED_DIR = Path("/home/asim/Desktop/clara-dataset-upload/clara_dataset/resume_dataset/external_id_resumes")          # where external_id.pdf files exist
@@ -13,6 +15,9 @@ EXTERNAL_COL = "external_id"
 # Change this to False if you want to COPY instead of MOVE
 MOVE_FILES = True
 
+# True: keep a pickle sidecar of the projected columns (csv_loader.SNAPSHOT_DIR) so re-runs skip parsing the big CSV
+CSV_SNAPSHOT = False
+
 
 def normalize_job_folder(job_id: str, external_id: str) -> str | None:
     """
@@ -47,45 +52,41 @@ def main():
     missing = 0
     bad_rows = 0
 
-    with CSV_PATH.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-
-        if not reader.fieldnames:
-            raise ValueError("CSV header not found.")
-        if EXTERNAL_COL not in reader.fieldnames:
-            raise ValueError(f"CSV must contain '{EXTERNAL_COL}'. Found: {reader.fieldnames}")
+    rows = load_rows(CSV_PATH, [EXTERNAL_COL, JOB_COL], required=[EXTERNAL_COL], snapshot=CSV_SNAPSHOT)
 
-        for row in reader:
-            external_id = (row.get(EXTERNAL_COL) or "").strip()
-            job_id = (row.get(JOB_COL) or "").strip()
+    # one directory scan up front; the existence checks below are set lookups, not stat() calls
+    src_names = file_name_set(RENAMED_DIR)
 
-            if not external_id:
-                bad_rows += 1
-                continue
+    for external_id, job_id in rows:
+        if not external_id:
+            bad_rows += 1
+            continue
 
-            folder_name = normalize_job_folder(job_id, external_id)
-            if not folder_name:
-                print(f"BAD (cannot determine job folder): external_id={external_id}, job_id={job_id}")
-                bad_rows += 1
-                continue
+        folder_name = normalize_job_folder(job_id, external_id)
+        if not folder_name:
+            print(f"BAD (cannot determine job folder): external_id={external_id}, job_id={job_id}")
+            bad_rows += 1
+            continue
 
-            src_pdf = RENAMED_DIR / f"{external_id}.pdf"
-            if not src_pdf.exists():
-                print(f"MISSING: {src_pdf}")
-                missing += 1
-                continue
+        src_pdf = RENAMED_DIR / f"{external_id}.pdf"
+        if src_pdf.name not in src_names:
+            print(f"MISSING: {src_pdf}")
+            missing += 1
+            continue
 
-            dest_dir = JOBS_OUT_DIR / folder_name
-            dest_dir.mkdir(parents=True, exist_ok=True)
+        dest_dir = JOBS_OUT_DIR / folder_name
+        dest_dir.mkdir(parents=True, exist_ok=True)
 
-            dest_pdf = dest_dir / src_pdf.name
+        dest_pdf = dest_dir / src_pdf.name
 
-            if MOVE_FILES:
-                shutil.move(str(src_pdf), str(dest_pdf))
-            else:
-                shutil.copy2(src_pdf, dest_pdf)
+        if MOVE_FILES:
+            shutil.move(str(src_pdf), str(dest_pdf))
+            # moved away: a repeated external_id row must now count as missing
+            src_names.discard(src_pdf.name)
+        else:
+            shutil.copy2(src_pdf, dest_pdf)
 
-            moved_or_copied += 1
+        moved_or_copied += 1
 
     print("\nDone.")
     print(f"{'Moved' if MOVE_FILES else 'Copied'}: {moved_or_copied}")
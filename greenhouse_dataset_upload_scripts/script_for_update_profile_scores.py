@@ -1,12 +1,19 @@
+import argparse
 import csv
+import itertools
+import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 from dotenv import load_dotenv
 from bson import ObjectId
 from pymongo import MongoClient
 
+from score_store import ScoreStore
+
 
 # ---------- Load .env ----------
 ENV_PATH = Path(__file__).resolve().parent / ".env"
@@ -15,12 +22,23 @@ load_dotenv(ENV_PATH)
 # ---------- CONFIG ----------
 INPUT_CSV = Path("/home/asim/Desktop/clara-dataset-upload/logs/profile_upload_success.csv")
 OUTPUT_CSV = Path("/home/asim/Desktop/clara-dataset-upload/logs/profile_results.csv")
+# --incremental: application_obj_ids that already have a final fit_score (never re-queried)
+SCORE_STORE_PATH = Path("/home/asim/Desktop/clara-dataset-upload/logs/fit_score_store.sqlite3")
 
 MONGO_URI = (os.getenv("MONGO_URI") or "").strip()
 MONGO_DB = (os.getenv("MONGO_DB") or "").strip()
 MONGO_COLLECTION = (os.getenv("MONGO_COLLECTION") or "").strip()
+
+# ObjectIds per {"_id": {"$in": [...]}} query, and how many of those queries run at once
+BATCH_SIZE = 500
+PARALLEL_BATCHES = 4
+
+# Input rows read, enriched and appended to the output per step (bounds memory and lost work)
+CHUNK_ROWS = 5000
 # --------------------------------
 
+FIT_SCORE_PROJECTION = {"profile.fit_score": 1}
+
 HEX24 = re.compile(r"[a-fA-F0-9]{24}")
 
 
@@ -36,7 +54,115 @@ def to_oid(value: str):
         return None
 
 
+def _fetch_batch(col, batch: list) -> dict:
+    docs = col.find({"_id": {"$in": batch}}, FIT_SCORE_PROJECTION)
+    return {doc["_id"]: ((doc.get("profile") or {}).get("fit_score")) or "" for doc in docs}
+
+
+def fetch_fit_scores(col, oids, batch_size: int = BATCH_SIZE, workers: int = PARALLEL_BATCHES) -> tuple[dict, set]:
+    """
+    Looks up fit_score for every distinct ObjectId with one $in query per batch
+    instead of one find_one per row, running up to `workers` batches concurrently
+    (pymongo's client is thread-safe and pools connections).
+    Returns ({oid: fit_score or ""} for every document found, {oids whose batch query failed}).
+    """
+    unique = list(dict.fromkeys(oids))
+    batches = [unique[i:i + batch_size] for i in range(0, len(unique), max(1, batch_size))]
+    scores: dict = {}
+    failed: set = set()
+
+    def run(batch):
+        try:
+            return batch, _fetch_batch(col, batch), None
+        except Exception as e:
+            return batch, None, e
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for n, (batch, found, error) in enumerate(pool.map(run, batches), start=1):
+            if error is not None:
+                # Print the REAL error and continue
+                print(f"   ❌ Batch {n}/{len(batches)} ({len(batch)} ids) failed: {type(error).__name__}: {error}")
+                failed.update(batch)
+                continue
+            scores.update(found)
+            print(f"Batch {n}/{len(batches)}: {len(found)}/{len(batch)} found")
+    return scores, failed
+
+
+def enrich_rows(col, rows: list[dict], store: Optional[ScoreStore] = None) -> tuple[int, int, int]:
+    """
+    Sets row["fit_score"] for every row (batched lookups, joined back in order).
+    With a store, applications that already have a final score are filled from it
+    and only the rest are queried; new non-empty scores are added to it.
+    Returns (matched, query_failures, filled_from_store).
+    """
+    matched = 0
+    failed = 0
+    from_store = 0
+
+    row_oids = [to_oid((row.get("application_obj_id") or "").strip()) for row in rows]
+    known = store.get_many(str(oid) for oid in row_oids if oid) if store is not None else {}
+    scores, failed_oids = fetch_fit_scores(col, [oid for oid in row_oids if oid and str(oid) not in known])
+    if store is not None:
+        store.put_many({str(oid): score for oid, score in scores.items()})
+
+    for row, oid in zip(rows, row_oids):
+        row["fit_score"] = ""
+        if not oid:
+            continue
+        if str(oid) in known:
+            row["fit_score"] = known[str(oid)]
+            matched += 1
+            from_store += 1
+        elif oid in failed_oids:
+            failed += 1
+        elif oid in scores:
+            row["fit_score"] = scores[oid]
+            matched += 1
+    return matched, failed, from_store
+
+
+def _offset_path(partial: Path) -> Path:
+    return partial.with_name(partial.name + ".offset")
+
+
+def _load_offset(partial: Path, headers: list[str]) -> tuple[int, int]:
+    """
+    (input rows already written, partial-file size at that point) from the last
+    completed chunk, or (0, 0) if there is nothing usable to resume from.
+    """
+    try:
+        saved = json.loads(_offset_path(partial).read_text(encoding="utf-8"))
+        if saved["headers"] != headers or partial.stat().st_size < saved["bytes"]:
+            return (0, 0)
+        return (int(saved["rows"]), int(saved["bytes"]))
+    except (OSError, ValueError, KeyError, TypeError):
+        return (0, 0)
+
+
+def _save_offset(partial: Path, headers: list[str], rows: int, nbytes: int):
+    path = _offset_path(partial)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"rows": rows, "bytes": nbytes, "headers": headers}), encoding="utf-8")
+    os.replace(tmp, path)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Add profile.fit_score from Mongo to the upload success CSV.")
+    parser.add_argument("--chunk_rows", type=int, default=CHUNK_ROWS, help="Input rows read, enriched and written per chunk")
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its last completed chunk instead of starting over",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only query applications without a final fit_score in the score store",
+    )
+    parser.add_argument("--score_store", default=str(SCORE_STORE_PATH), help="Score store (SQLite) path for --incremental")
+    args = parser.parse_args()
+
     if not MONGO_URI or not MONGO_DB or not MONGO_COLLECTION:
         raise ValueError("Missing MONGO_URI / MONGO_DB / MONGO_COLLECTION in .env")
 
@@ -54,56 +180,65 @@ def main():
     col = client[MONGO_DB][MONGO_COLLECTION]
     print(f"Connected: DB={MONGO_DB} | Collection={MONGO_COLLECTION}")
 
-    with open(INPUT_CSV, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-        headers = reader.fieldnames or []
-
-    if "fit_score" not in headers:
-        headers.append("fit_score")
-
     matched = 0
     failed = 0
+    from_store = 0
+    store = ScoreStore(Path(args.score_store)) if args.incremental else None
+    if store is not None:
+        print(f"Score store: {len(store)} final scores | {args.score_store}")
 
-    for i, row in enumerate(rows, start=1):
-        app_raw = (row.get("application_obj_id") or "").strip()
-        oid = to_oid(app_raw)
-
-        if not oid:
-            row["fit_score"] = ""
-            continue
-
-        print(f"#{i} Processing application_obj_id: {app_raw} -> {oid}")
-
-        try:
-            doc = col.find_one(
-                {"_id": oid},
-                {"profile.fit_score": 1}  # projection
-            )
-        except Exception as e:
-            # Print the REAL error and continue
-            print(f"   ❌ Query failed for {oid}: {type(e).__name__}: {e}")
-            row["fit_score"] = ""
-            failed += 1
-            continue
-
-        if not doc:
-            row["fit_score"] = ""
-            continue
-
-        row["fit_score"] = ((doc.get("profile") or {}).get("fit_score")) or ""
-        matched += 1
-
+    # Rows go to <output>.partial one chunk at a time (flushed + fsynced, offset recorded),
+    # and the partial file replaces OUTPUT_CSV only once every row is written.
     OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
-    with open(OUTPUT_CSV, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=headers)
-        w.writeheader()
-        w.writerows(rows)
+    partial = OUTPUT_CSV.with_name(OUTPUT_CSV.name + ".partial")
+
+    with open(INPUT_CSV, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        headers = list(reader.fieldnames or [])
+        if "fit_score" not in headers:
+            headers.append("fit_score")
+
+        done, nbytes = _load_offset(partial, headers) if args.resume else (0, 0)
+        if done:
+            print(f"Resuming after {done} rows")
+
+        with open(partial, "r+" if done else "w", newline="", encoding="utf-8") as out:
+            if done:
+                # drop anything written after the last completed chunk
+                out.truncate(nbytes)
+                out.seek(nbytes)
+            w = csv.DictWriter(out, fieldnames=headers)
+            if not done:
+                w.writeheader()
+
+            rows = itertools.islice(reader, done, None)
+            while True:
+                chunk = list(itertools.islice(rows, max(1, args.chunk_rows)))
+                if not chunk:
+                    break
+                m, fl, st = enrich_rows(col, chunk, store)
+                matched += m
+                failed += fl
+                from_store += st
+
+                w.writerows(chunk)
+                out.flush()
+                os.fsync(out.fileno())
+                done += len(chunk)
+                _save_offset(partial, headers, done, os.fstat(out.fileno()).st_size)
+                print(f"Rows written: {done}")
+
+    os.replace(partial, OUTPUT_CSV)
+    _offset_path(partial).unlink(missing_ok=True)
+    if store is not None:
+        store.close()
 
     print("DONE")
     print("Output:", OUTPUT_CSV)
     print("Matched:", matched)
     print("Query failures:", failed)
+    if store is not None:
+        print("From score store:", from_store)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,196 @@
+import errno
+import os
+import shutil
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+from csv_loader import load_rows
+from dir_scan import file_name_set
+from script_for_job_classification import normalize_job_folder
+
+# One pass from profile_resumes/<profile_id>.pdf straight to job_wise_resumes/job_<id>/<external_id>.pdf,
+# replacing script_file_rename (copy) followed by script_for_job_classification (move).
+
+CSV_PATH = Path("/home/asim/Desktop/clara-dataset-upload/clara_dataset/Clara - Candidate Matching - 2026-01-20 - Applications.csv")
+
+SRC_DIR = Path("/home/asim/Desktop/clara-dataset-upload/clara_dataset/resume_dataset/profile_resumes")  # where profile_id.pdf files exist
+JOBS_OUT_DIR = Path("/home/asim/Downloads/job_wise_resumes")  # output: job_258/app_....pdf
+
+PROFILE_COL = "profile_id"
+EXTERNAL_COL = "external_id"
+JOB_COL = "job_id"
+
+# "link": hardlink (no bytes copied; falls back to reflink, then copy_file_range/sendfile, when
+# SRC_DIR and JOBS_OUT_DIR are on different filesystems). "copy": never hardlink, so the output
+# files are independent of the originals.
+MODE = "link"
+
+# Files placed concurrently (link/copy calls release the GIL)
+WORKERS = 16
+
+# True: keep a pickle sidecar of the projected columns (csv_loader.SNAPSHOT_DIR) so re-runs skip parsing the big CSV
+CSV_SNAPSHOT = False
+
+# Linux FICLONE ioctl: copy-on-write clone on btrfs/XFS/etc.
+_FICLONE = 0x40049409
+
+
+def _reflink(src_fd: int, dst_fd: int) -> bool:
+    try:
+        import fcntl
+
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return True
+    except (ImportError, OSError):
+        return False
+
+
+def _copy_file_range(src_fd: int, dst_fd: int, size: int) -> bool:
+    if not hasattr(os, "copy_file_range"):
+        return False
+    copied = 0
+    try:
+        while copied < size:
+            n = os.copy_file_range(src_fd, dst_fd, size - copied)
+            if n == 0:
+                break
+            copied += n
+    except OSError as e:
+        if copied == 0 and e.errno in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+            return False
+        raise
+    return True
+
+
+def copy_fast(src: Path, dst: Path) -> str:
+    """
+    Copies src to dst in the kernel: reflink if the filesystem supports it, else
+    copy_file_range, else shutil.copy2 (which uses sendfile on Linux).
+    Keeps src's timestamps like copy2. Returns the method used.
+    """
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        if _reflink(fsrc.fileno(), fdst.fileno()):
+            method = "reflink"
+        elif _copy_file_range(fsrc.fileno(), fdst.fileno(), os.fstat(fsrc.fileno()).st_size):
+            method = "copy_file_range"
+        else:
+            method = None
+    if method is None:
+        shutil.copy2(src, dst)
+        return "copy"
+    shutil.copystat(src, dst)
+    return method
+
+
+def place_file(src: Path, dst: Path, mode: str = MODE) -> str:
+    """
+    Makes dst a hardlink to (or a copy of) src, replacing whatever dst was.
+    Returns "exists" if dst already is src's hardlink, else the method used.
+    """
+    if mode == "link":
+        try:
+            os.link(src, dst)
+            return "link"
+        except FileExistsError:
+            if os.path.samefile(src, dst):
+                return "exists"
+            os.unlink(dst)
+            return place_file(src, dst, mode)
+        except OSError as e:
+            # EXDEV: different filesystems; EPERM/ENOTSUP: filesystem without hardlinks
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP):
+                raise
+    # never open an old dst for writing: it may be a hardlink to src from an earlier "link" run
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    return copy_fast(src, dst)
+
+
+def main():
+    JOBS_OUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    missing = 0
+    bad_rows = 0
+    duplicates = 0
+    failed = 0
+    methods: dict[str, int] = {}
+
+    rows = load_rows(
+        CSV_PATH,
+        [PROFILE_COL, EXTERNAL_COL, JOB_COL],
+        required=[PROFILE_COL, EXTERNAL_COL],
+        snapshot=CSV_SNAPSHOT,
+    )
+
+    # one directory scan up front; the existence checks below are set lookups, not stat() calls
+    src_names = file_name_set(SRC_DIR)
+    made_dirs = set()
+    seen_dst = set()
+
+    def tasks():
+        nonlocal missing, bad_rows, duplicates
+        for profile_id, external_id, job_id in rows:
+            if not profile_id or not external_id:
+                bad_rows += 1
+                continue
+
+            folder_name = normalize_job_folder(job_id, external_id)
+            if not folder_name:
+                print(f"BAD (cannot determine job folder): external_id={external_id}, job_id={job_id}")
+                bad_rows += 1
+                continue
+
+            src_name = f"{profile_id}.pdf"
+            if src_name not in src_names:
+                print(f"MISSING: {SRC_DIR / src_name}")
+                missing += 1
+                continue
+
+            dst_pdf = JOBS_OUT_DIR / folder_name / f"{external_id}.pdf"
+            # same external_id twice would race on one destination; the first row wins
+            if dst_pdf in seen_dst:
+                duplicates += 1
+                continue
+            seen_dst.add(dst_pdf)
+
+            if folder_name not in made_dirs:
+                dst_pdf.parent.mkdir(parents=True, exist_ok=True)
+                made_dirs.add(folder_name)
+
+            yield SRC_DIR / src_name, dst_pdf
+
+    def record(fut):
+        nonlocal failed
+        try:
+            method = fut.result()
+        except OSError as e:
+            print(f"FAILED: {e}")
+            failed += 1
+            return
+        methods[method] = methods.get(method, 0) + 1
+
+    # bounded window of in-flight placements so 100k rows never become 100k futures
+    with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="place") as pool:
+        pending = set()
+        for src_pdf, dst_pdf in tasks():
+            pending.add(pool.submit(place_file, src_pdf, dst_pdf, MODE))
+            if len(pending) >= WORKERS * 4:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    record(fut)
+        for fut in wait(pending).done:
+            record(fut)
+
+    print("\nDone.")
+    print(f"Placed: {sum(methods.values())} ({', '.join(f'{k}={v}' for k, v in sorted(methods.items())) or 'none'})")
+    print(f"Missing originals: {missing}")
+    print(f"Duplicate external_ids: {duplicates}")
+    print(f"Bad/empty rows: {bad_rows}")
+    print(f"Failed: {failed}")
+    print(f"Output root: {JOBS_OUT_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+import argparse
+import csv
+import os
+from pathlib import Path
+
+from checkpoint import JOURNAL_HEADERS
+from updated_sjm_script_finalized import (
+    CHECKPOINT_PATH,
+    FAIL_HEADERS,
+    FAILURES_CSV_PATH,
+    SUCCESS_CSV_PATH,
+    SUCCESS_HEADERS,
+    shard_files,
+)
+
+# Folds the per-shard outputs of `updated_sjm_script_finalized.py --shard i/N` back into the
+# canonical profile_upload_success.csv / profile_upload_failures.csv / upload_checkpoint.csv.
+# Rows already in the canonical files are kept; re-running the merge changes nothing.
+# The shard files are left in place (delete them once the merged files look right).
+
+
+def read_rows(paths: list[Path]):
+    for p in paths:
+        if not p.exists():
+            continue
+        with open(p, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+
+def write_rows(path: Path, headers: list[str], rows: list[dict]):
+    # written next to the target and renamed over it, so a crash never leaves half a file
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(headers)
+        for row in rows:
+            w.writerow([row.get(h) or "" for h in headers])
+    os.replace(tmp, path)
+
+
+def merge_success(path: Path) -> tuple[list[dict], int]:
+    """
+    One row per (job_obj_id, external_id), first one wins (canonical file, then shards in order).
+    Returns (rows, number of shard files read).
+    """
+    shards = shard_files(path)
+    seen = set()
+    rows = []
+    for row in read_rows([path, *shards]):
+        key = ((row.get("job_obj_id") or "").strip(), (row.get("external_id") or "").strip())
+        if not all(key) or key in seen:
+            continue
+        seen.add(key)
+        rows.append(row)
+    return rows, len(shards)
+
+
+def merge_failures(path: Path) -> tuple[list[dict], int]:
+    # failures are a log, so only exact duplicates go; files uploaded on a later run stay listed
+    shards = shard_files(path)
+    seen = set()
+    rows = []
+    for row in read_rows([path, *shards]):
+        key = tuple(row.get(h) or "" for h in FAIL_HEADERS)
+        if key in seen:
+            continue
+        seen.add(key)
+        rows.append(row)
+    return rows, len(shards)
+
+
+def merge_checkpoint(path: Path, success_rows: list[dict]) -> tuple[list[dict], int]:
+    shards = shard_files(path)
+    seen = set()
+    rows = []
+    for row in [*read_rows([path, *shards]), *success_rows]:
+        key = ((row.get("job_obj_id") or "").strip(), (row.get("external_id") or "").strip())
+        if not all(key) or key in seen:
+            continue
+        seen.add(key)
+        rows.append({"job_obj_id": key[0], "external_id": key[1]})
+    return rows, len(shards)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge --shard upload outputs into the canonical CSVs.")
+    parser.add_argument("--success_csv", default=str(SUCCESS_CSV_PATH))
+    parser.add_argument("--failures_csv", default=str(FAILURES_CSV_PATH))
+    parser.add_argument("--checkpoint", default=str(CHECKPOINT_PATH))
+    args = parser.parse_args()
+
+    success_path = Path(args.success_csv)
+    failures_path = Path(args.failures_csv)
+    checkpoint_path = Path(args.checkpoint)
+
+    success_rows, success_shards = merge_success(success_path)
+    failure_rows, failure_shards = merge_failures(failures_path)
+    checkpoint_rows, checkpoint_shards = merge_checkpoint(checkpoint_path, success_rows)
+
+    if not (success_shards or failure_shards or checkpoint_shards):
+        print(f"No shard outputs found next to {success_path}")
+        return
+
+    write_rows(success_path, SUCCESS_HEADERS, success_rows)
+    write_rows(failures_path, FAIL_HEADERS, failure_rows)
+    write_rows(checkpoint_path, JOURNAL_HEADERS, checkpoint_rows)
+
+    print(f"Success: {len(success_rows)} uploads from {success_shards} shard files -> {success_path}")
+    print(f"Failures: {len(failure_rows)} rows from {failure_shards} shard files -> {failures_path}")
+    print(f"Checkpoint: {len(checkpoint_rows)} keys from {checkpoint_shards} shard files -> {checkpoint_path}")
+
+
+if __name__ == "__main__":
+    main()
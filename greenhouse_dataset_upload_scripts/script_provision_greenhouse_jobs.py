@@ -0,0 +1,131 @@
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from csv_loader import load_rows
+from greenhouse_client import GreenhouseClient
+from utils import update_csv_with_greenhouse_job_ids
+
+# Bulk version of initial_greenhose_script: every row without a greenhouse_job_id gets a job
+# (from the template), its first job post gets the row's description, and all new ids are
+# written back to the CSV in one pass at the end. Ids already in the output CSV (from an
+# earlier run) count as provisioned and are carried over, so a re-run only creates what is missing.
+
+GREENHOUSE_API_KEY = (os.getenv("GREENHOUSE_API_KEY") or "").strip()
+
+INPUT_CSV = "/home/asim/Desktop/clara-dataset-upload/clara_dataset/update_job_dataset.csv"
+OUTPUT_CSV = "/home/asim/Desktop/clara-dataset-upload/clara_dataset/final_job_dataset.csv"
+
+TEMPLATE_JOB_ID = "4560475007"
+
+# Jobs provisioned concurrently; the client's X-RateLimit pacing keeps them under Harvest's limit
+WORKERS = 4
+
+
+def provision_job(client: GreenhouseClient, template_job_id: str, job_title: str, job_description: str) -> tuple:
+    """
+    create job -> find its first job post -> set the description.
+    Returns (job_id, error); job_id is set as soon as the job exists, even if the
+    job-post step fails, so a re-run does not create it twice.
+    """
+    job = client.create_job(template_job_id=template_job_id, job_title=job_title, openings=1)
+    job_id = job["id"]
+    try:
+        job_posts = client.get_job_posts(job_id)
+        if not job_posts:
+            return job_id, "no job post"
+        client.update_job_post(job_post_id=job_posts[0]["id"], description=job_description)
+    except Exception as e:
+        return job_id, f"{type(e).__name__}: {e}"
+    return job_id, None
+
+
+def load_job_ids(csv_path) -> dict:
+    # title -> greenhouse_job_id for every row that already has one
+    ids = {}
+    for job_title, job_id in load_rows(csv_path, ["job_title", "greenhouse_job_id"], required=["job_title"]):
+        if job_title and job_id:
+            ids.setdefault(job_title, job_id)
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Create Greenhouse jobs for every unprovisioned CSV row.")
+    parser.add_argument("--input_csv", default=INPUT_CSV)
+    parser.add_argument("--output_csv", default=OUTPUT_CSV)
+    parser.add_argument("--template_job_id", default=TEMPLATE_JOB_ID)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    args = parser.parse_args()
+
+    if not GREENHOUSE_API_KEY:
+        raise ValueError("Missing GREENHOUSE_API_KEY")
+
+    # ids written by an earlier run live in the output CSV, not the input
+    existing = {}
+    if Path(args.output_csv).exists() and Path(args.output_csv) != Path(args.input_csv):
+        existing = load_job_ids(args.output_csv)
+
+    # rows are matched back by title, so each title is provisioned once
+    todo = {}
+    already = 0
+    for job_title, job_description, job_id in load_rows(
+        args.input_csv, ["job_title", "job_description", "greenhouse_job_id"], required=["job_title"]
+    ):
+        if not job_title:
+            continue
+        if job_id or job_title in existing:
+            already += 1
+            continue
+        todo.setdefault(job_title, job_description)
+
+    print(f"To provision: {len(todo)} | already provisioned rows: {already}")
+
+    client = GreenhouseClient(api_key=GREENHOUSE_API_KEY)
+    created = {}
+    failed = 0
+
+    def record(fut, title):
+        nonlocal failed
+        try:
+            job_id, error = fut.result()
+        except Exception as e:
+            print(f"[CREATE FAIL] {title} | {type(e).__name__}: {e}")
+            failed += 1
+            return
+        created[title] = job_id
+        if error:
+            print(f"[POST FAIL] {title} -> job {job_id} | {error}")
+            failed += 1
+        else:
+            print(f"[OK] {title} -> job {job_id}")
+
+    pool = ThreadPoolExecutor(max_workers=max(1, args.workers), thread_name_prefix="provision")
+    futures = {
+        pool.submit(provision_job, client, args.template_job_id, title, description): title
+        for title, description in todo.items()
+    }
+    pending = set(futures)
+    try:
+        for fut in as_completed(futures):
+            pending.discard(fut)
+            record(fut, futures[fut])
+    finally:
+        # on Ctrl-C: drop jobs not started yet, let the running ones finish and keep their ids
+        pool.shutdown(wait=True, cancel_futures=True)
+        for fut in pending:
+            if not fut.cancelled():
+                record(fut, futures[fut])
+
+        # one rewrite for every job created, even if the run was interrupted
+        if created or existing:
+            updated = update_csv_with_greenhouse_job_ids(args.input_csv, args.output_csv, {**existing, **created})
+            print(f"Wrote {len(created)} new job ids ({updated} rows) to {args.output_csv}")
+
+    print("\nDone.")
+    print(f"Created: {len(created)}")
+    print(f"Failed: {failed}")
+
+
+if __name__ == "__main__":
+    main()
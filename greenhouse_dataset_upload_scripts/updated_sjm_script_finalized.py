@@ -1,12 +1,31 @@
+import os
 import re
 import csv
+import zlib
+import signal
+import asyncio
 import argparse
+import threading
+import sys
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Callable, Iterator, Optional, Tuple
 
 import requests
-import pdfplumber
+
+from checkpoint import CheckpointJournal
+from csv_loader import load_rows
+from dir_scan import sorted_file_names
+from http_client import create_async_client, create_session, session_stats
+from multipart import MultipartFileBody, post_multipart, post_multipart_async
+from name_cache import NameCache, heuristic_version
+from name_matcher import compile_reject, name_candidate_tokens, reasonable_name_tokens, split_name
+from pdf_text import TIER_ERROR, ParseStats, extract_tiered
+from result_sink import ResultSink
 
 # ============== DEFAULT CONFIG ==============
 DEFAULT_BASE_DIR = Path("/home/asim/Desktop/clara-dataset-upload/clara_dataset/resume_dataset/job_wise_resumes")
@@ -17,7 +36,8 @@ DEFAULT_JOB_MAP_CSV_PATH = Path(
 
 API_BASE = "https://deinqa.infosiphon.com/dein-api/deincore/partner/jobs/standalone/apply-job"
 VALIDATE_EMAIL_URL = f"{API_BASE}/validate-email/"
-UPLOAD_URL_TEMPLATE = f"{API_BASE}/upload-candidate-resume/{{job_obj_id}}"
+UPLOAD_PATH = "/upload-candidate-resume/"
+UPLOAD_URL_TEMPLATE = f"{API_BASE}{UPLOAD_PATH}{{job_obj_id}}"
 
 HEADERS = {"Accept": "application/json"}
 
@@ -31,9 +51,30 @@ OUT_DIR = Path("/home/asim/Desktop/clara-dataset-upload/logs")
 SUCCESS_CSV_PATH = OUT_DIR / "profile_upload_success.csv"
 FAILURES_CSV_PATH = OUT_DIR / "profile_upload_failures.csv"
 PROGRESS_LOG_PATH = OUT_DIR / "progress.log"
+NAME_CACHE_PATH = OUT_DIR / "name_cache.sqlite3"
+CHECKPOINT_PATH = OUT_DIR / "upload_checkpoint.csv"
 
 REQUEST_TIMEOUT_VALIDATE = 60
 REQUEST_TIMEOUT_UPLOAD = 120
+
+# Shared pacing/backoff for the apply-job API (see http_client.Throttle)
+DEFAULT_MAX_RPS = 20.0  # token-bucket rate across all workers; 0 = unpaced
+# retries for 429/5xx/connection errors, jittered exponential backoff; uploads are not
+# idempotent, so they are only retried on 429/503 and when the connection could not be made
+DEFAULT_MAX_RETRIES = 4
+LATENCY_TARGET = 30.0  # seconds; slower responses shrink the concurrency window
+
+# Number of validate/upload pairs kept in flight per job (1 = sequential, original behaviour)
+DEFAULT_WORKERS = 1
+
+# Jobs run at the same time, largest folder first (1 = one after another in CSV order, original behaviour)
+DEFAULT_PARALLEL_JOBS = 1
+
+# Processes extracting names ahead of the uploader (0 = extract inline, original behaviour)
+DEFAULT_PARSE_WORKERS = 0
+# Max extracted-but-not-yet-uploaded resumes per parse worker (bounded queue between stages)
+PARSE_QUEUE_PER_WORKER = 4
+
 # ====================================
 
 FILENAME_RE = re.compile(
@@ -45,6 +86,18 @@ BAD_KEYWORDS = {
     "profile", "objective", "contact", "portfolio", "linkedin",
     "phone", "email", "address", "curriculum", "vitae", "resume", "cv"
 }
+# "@", "|", digits and every bad keyword in one precompiled scan (see name_matcher)
+_BAD_NAME_RE = compile_reject(BAD_KEYWORDS, symbols="@|", digits=True)
+
+# Change the tag whenever extract_first_last_name's heuristic changes, so cached names are re-parsed
+NAME_HEURISTIC = "first_page_reasonable_name_v2"
+NAME_CACHE_VERSION = heuristic_version(NAME_HEURISTIC, BAD_KEYWORDS)
+
+# Looser variant over the first 30 lines of two pages (the working_sjm_script_with_logs heuristic)
+TWO_PAGE_BAD_KEYWORDS = ["resume", "curriculum", "vitae", "cv", "email", "phone", "contact", "address", "linkedin", "objective", "summary"]
+_TWO_PAGE_BAD_RE = compile_reject(TWO_PAGE_BAD_KEYWORDS)
+TWO_PAGE_NAME_HEURISTIC = "two_pages_name_candidate_v1"
+TWO_PAGE_NAME_CACHE_VERSION = heuristic_version(TWO_PAGE_NAME_HEURISTIC, TWO_PAGE_BAD_KEYWORDS)
 
 SUCCESS_HEADERS = [
     "timestamp",
@@ -73,18 +126,38 @@ FAIL_HEADERS = [
 ]
 
 
+# Serializes CSV/log appends when several upload workers finish at the same time
+_WRITE_LOCK = threading.Lock()
+
+# Set by main() for the duration of a run; None = open/append/close per row
+_RESULT_SINK: Optional[ResultSink] = None
+
+# Name-extraction cost per tier for this run (cache hits are not counted)
+_PARSE_STATS = ParseStats()
+
+
+def set_result_sink(sink: Optional[ResultSink]):
+    global _RESULT_SINK
+    _RESULT_SINK = sink
+
+
 # ---------------- progress log ----------------
 def ensure_progress_log_dir():
     OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def log_progress(line: str):
-    ensure_progress_log_dir()
     ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     msg = f"{ts} | {line}"
-    print(msg)
-    with open(PROGRESS_LOG_PATH, "a", encoding="utf-8") as f:
-        f.write(msg + "\n")
+    if _RESULT_SINK is not None:
+        print(msg)
+        _RESULT_SINK.write_progress(msg)
+        return
+    ensure_progress_log_dir()
+    with _WRITE_LOCK:
+        print(msg)
+        with open(PROGRESS_LOG_PATH, "a", encoding="utf-8") as f:
+            f.write(msg + "\n")
 
 
 # ---------------- CSV helpers ----------------
@@ -96,25 +169,34 @@ def ensure_csv_header(path: Path, headers: list[str]):
 
 
 def write_success_row(**kwargs):
-    ensure_csv_header(SUCCESS_CSV_PATH, SUCCESS_HEADERS)
-    with open(SUCCESS_CSV_PATH, "a", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow([kwargs.get(h, "") for h in SUCCESS_HEADERS])
+    if _RESULT_SINK is not None:
+        _RESULT_SINK.write_success(**kwargs)
+        return
+    with _WRITE_LOCK:
+        ensure_csv_header(SUCCESS_CSV_PATH, SUCCESS_HEADERS)
+        with open(SUCCESS_CSV_PATH, "a", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow([kwargs.get(h, "") for h in SUCCESS_HEADERS])
 
 
 def write_fail_row(**kwargs):
-    ensure_csv_header(FAILURES_CSV_PATH, FAIL_HEADERS)
-    with open(FAILURES_CSV_PATH, "a", newline="", encoding="utf-8") as f:
-        w = csv.writer(f)
-        w.writerow([kwargs.get(h, "") for h in FAIL_HEADERS])
+    if _RESULT_SINK is not None:
+        _RESULT_SINK.write_fail(**kwargs)
+        return
+    with _WRITE_LOCK:
+        ensure_csv_header(FAILURES_CSV_PATH, FAIL_HEADERS)
+        with open(FAILURES_CSV_PATH, "a", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow([kwargs.get(h, "") for h in FAIL_HEADERS])
 
 
 # ---------------- Job map CSV ----------------
-def _norm_key(k: str) -> str:
-    k = (k or "").strip().lower()
-    k = re.sub(r"[^a-z0-9]+", "_", k)
-    k = re.sub(r"_+", "_", k).strip("_")
-    return k
+# Column aliases (normalized header names), first non-empty wins
+JOB_MAP_FIELDS = [
+    ("job_id", "job"),
+    ("job_obj_id", "job_objid", "job_obj", "jobobjid"),
+    ("job_title", "jobtitle", "title", "job_name", "jobname"),
+]
 
 
 def normalize_job_id(job_id: str) -> str:
@@ -128,48 +210,143 @@ def normalize_job_folder(job_id: str) -> str:
     return f"job_{num}" if num else ""
 
 
-def load_job_map(csv_path: Path) -> list[dict]:
+class JobMap:
     """
-    Returns list of dict:
+    Unique jobs from the Applications CSV (one row per application), indexed for O(1) filtering.
+
+    jobs:           unique {"job_id", "job_obj_id", "job_title"} dicts, in first-seen order
+    by_job_id:      job_id -> [job, ...]
+    by_job_obj_id:  job_obj_id -> [job, ...]
+    conflicts:      human-readable notes for a job_id mapped to several job_obj_ids (or
+                    vice versa) and for differing titles of the same job
+    """
+
+    def __init__(self):
+        self.jobs: list[dict] = []
+        self.by_job_id: dict[str, list[dict]] = {}
+        self.by_job_obj_id: dict[str, list[dict]] = {}
+        self.conflicts: list[str] = []
+        self.rows_read = 0
+        self._by_pair: dict[tuple[str, str], dict] = {}
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def __iter__(self):
+        return iter(self.jobs)
+
+    def add(self, job_id: str, job_obj_id: str, job_title: str):
+        self.rows_read += 1
+        existing = self._by_pair.get((job_id, job_obj_id))
+        if existing is not None:
+            if job_title and not existing["job_title"]:
+                existing["job_title"] = job_title
+            elif job_title and job_title != existing["job_title"]:
+                note = f"job_id={job_id} job_obj_id={job_obj_id}: title {job_title!r} differs from {existing['job_title']!r}"
+                if note not in self.conflicts:
+                    self.conflicts.append(note)
+            return
+
+        job = {"job_id": job_id, "job_obj_id": job_obj_id, "job_title": job_title}
+        for other in self.by_job_id.get(job_id, []):
+            self.conflicts.append(f"job_id={job_id} maps to job_obj_id={other['job_obj_id']} and {job_obj_id}")
+        for other in self.by_job_obj_id.get(job_obj_id, []):
+            self.conflicts.append(f"job_obj_id={job_obj_id} maps to job_id={other['job_id']} and {job_id}")
+
+        self._by_pair[(job_id, job_obj_id)] = job
+        self.jobs.append(job)
+        self.by_job_id.setdefault(job_id, []).append(job)
+        self.by_job_obj_id.setdefault(job_obj_id, []).append(job)
+
+    def select(self, job_id: Optional[str] = None, job_obj_id: Optional[str] = None) -> list[dict]:
+        if job_id is None and job_obj_id is None:
+            return list(self.jobs)
+        if job_obj_id is not None:
+            jobs = self.by_job_obj_id.get(job_obj_id, [])
+            return [j for j in jobs if job_id is None or j["job_id"] == job_id]
+        return list(self.by_job_id.get(job_id, []))
+
+
+def load_job_map(csv_path: Path, snapshot: bool = False) -> JobMap:
+    """
+    Returns a deduplicated JobMap; each job is:
       {"job_id": "1393", "job_obj_id": "...", "job_title": "..."}
     """
     if not csv_path.exists():
         raise FileNotFoundError(f"Job map CSV not found: {csv_path}")
 
-    rows = []
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        if not reader.fieldnames:
-            return rows
+    job_map = JobMap()
+    try:
+        rows = load_rows(csv_path, JOB_MAP_FIELDS, snapshot=snapshot)
+    except UnicodeDecodeError:
+        raise
+    except ValueError:
+        # no header
+        return job_map
+
+    # errors while streaming the rows (e.g. a bad byte mid-file) propagate
+    for raw_job_id, job_obj_id, job_title in rows:
+        job_id = normalize_job_id(raw_job_id)
+        if not job_id or not job_obj_id:
+            continue
+        job_map.add(job_id, job_obj_id, job_title)
 
-        for raw in reader:
-            row = {_norm_key(k): (v or "").strip() for k, v in raw.items()}
+    return job_map
 
-            raw_job_id = row.get("job_id") or row.get("job") or ""
-            job_id = normalize_job_id(raw_job_id)
 
-            job_obj_id = (
-                row.get("job_obj_id")
-                or row.get("job_objid")
-                or row.get("job_obj")
-                or row.get("jobobjid")
-            )
+# ---------------- Sharding ----------------
+def parse_shard(spec: str) -> tuple[int, int]:
+    # "1/4" -> (1, 4); shards are numbered 0..N-1
+    index, sep, count = spec.partition("/")
+    try:
+        shard = (int(index), int(count))
+    except ValueError:
+        shard = None
+    if not sep or shard is None or shard[1] < 1 or not 0 <= shard[0] < shard[1]:
+        raise argparse.ArgumentTypeError(f"expected i/N with 0 <= i < N, got {spec!r}")
+    return shard
 
-            job_title = (
-                row.get("job_title")
-                or row.get("jobtitle")
-                or row.get("title")
-                or row.get("job_name")
-                or row.get("jobname")
-                or ""
-            )
 
-            if not job_id or not job_obj_id:
-                continue
+def in_shard(key: str, shard: tuple[int, int]) -> bool:
+    # crc32 is stable across processes and machines (unlike hash())
+    index, count = shard
+    return zlib.crc32(key.encode("utf-8")) % count == index
+
+
+def shard_path(path: Path, shard: tuple[int, int]) -> Path:
+    # profile_upload_success.csv -> profile_upload_success.shard-1-of-4.csv
+    index, count = shard
+    return path.with_name(f"{path.stem}.shard-{index}-of-{count}{path.suffix}")
+
+
+def shard_files(path: Path) -> list[Path]:
+    """
+    Every shard's version of `path` that exists next to it, in shard order.
+    """
+    found = []
+    for p in path.parent.glob(f"{path.stem}.shard-*-of-*{path.suffix}"):
+        m = re.fullmatch(rf"{re.escape(path.stem)}\.shard-(\d+)-of-(\d+){re.escape(path.suffix)}", p.name)
+        if m:
+            found.append(((int(m.group(2)), int(m.group(1))), p))
+    return [p for _, p in sorted(found)]
 
-            rows.append({"job_id": job_id, "job_obj_id": job_obj_id, "job_title": job_title})
 
-    return rows
+def run_outputs(shard: Optional[tuple[int, int]] = None) -> dict:
+    """
+    Success/failure CSVs, progress log, checkpoint and name cache for one run. With a
+    shard these are the shard's own files, so shards on a shared disk never write to
+    the same file; script_merge_upload_shards folds the CSVs back into the canonical ones.
+    """
+    paths = {
+        "success": SUCCESS_CSV_PATH,
+        "failures": FAILURES_CSV_PATH,
+        "progress": PROGRESS_LOG_PATH,
+        "checkpoint": CHECKPOINT_PATH,
+        "name_cache": NAME_CACHE_PATH,
+    }
+    if shard:
+        paths = {k: shard_path(p, shard) for k, p in paths.items()}
+    return paths
 
 
 # ---------------- resume helpers ----------------
@@ -194,60 +371,123 @@ def build_fake_email(full_resume_stem: str) -> str:
     return f"{EMAIL_PREFIX}-{full_resume_stem}@{EMAIL_DOMAIN}"
 
 
-def extract_text_first_page(pdf_path: Path) -> str:
-    try:
-        with pdfplumber.open(str(pdf_path)) as pdf:
-            if not pdf.pages:
-                return ""
-            return (pdf.pages[0].extract_text() or "").strip()
-    except Exception:
-        return ""
+def email_from_stem(info: dict) -> str:
+    # app_pcf_1393_100225_0.pdf -> fake-for-warden-app_pcf_1393_100225_0@...
+    return build_fake_email(info["full_stem"])
 
 
-def normalize_line(line: str) -> str:
-    line = re.sub(r"[^A-Za-z\s\-\']", " ", line)
-    line = re.sub(r"\s+", " ", line).strip()
-    return line
+def email_from_profile_id(info: dict) -> str:
+    # app_pcf_1393_100225_0.pdf -> fake-for-warden-pcf_100225@... (the older SJM scripts)
+    return build_fake_email(info["profile_id"])
 
 
 def is_reasonable_name(line: str) -> bool:
-    if not line or len(line) > 60:
-        return False
-    if "@" in line or "|" in line:
-        return False
-    if any(ch.isdigit() for ch in line):
-        return False
-    low = line.lower()
-    if any(k in low for k in BAD_KEYWORDS):
-        return False
-    cleaned = normalize_line(line)
-    parts = cleaned.split()
-    if not (2 <= len(parts) <= 4):
-        return False
-    if any(len(p) < 2 for p in parts):
-        return False
-    return True
+    return reasonable_name_tokens(line, _BAD_NAME_RE) is not None
+
+
+def name_from_text(text: str) -> Optional[Tuple[str, str]]:
+    # first reasonable line among the first 20 non-empty ones
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    for ln in lines[:20]:
+        parts = reasonable_name_tokens(ln, _BAD_NAME_RE)
+        if parts:
+            return split_name(parts)
+    return None
+
+
+def extract_first_last_name_with_cost(pdf_path: Path) -> tuple[Tuple[str, str], str, float]:
+    """
+    Tries the top band of page 1 first and lays out the full page only if no name
+    is found there (see pdf_text.extract_tiered). Returns (names, tier, seconds).
+    """
+    names, tier, seconds = extract_tiered(pdf_path, name_from_text)
+    return (names or ("Unknown", "Candidate")), tier, seconds
 
 
 def extract_first_last_name(pdf_path: Path) -> Tuple[str, str]:
-    text = extract_text_first_page(pdf_path)
-    if not text:
-        return ("Unknown", "Candidate")
+    return extract_first_last_name_with_cost(pdf_path)[0]
 
+
+def name_from_text_two_pages(text: str) -> Optional[Tuple[str, str]]:
+    # first name-like line among the first 30 non-empty ones
     lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    for ln in lines[:30]:
+        parts = name_candidate_tokens(ln, _TWO_PAGE_BAD_RE)
+        if parts:
+            return split_name(parts)
+    return None
 
-    if lines and is_reasonable_name(lines[0]):
-        cleaned = normalize_line(lines[0])
-        parts = cleaned.split()
-        return (parts[0].title(), " ".join(parts[1:]).title())
 
-    for ln in lines[:20]:
-        if is_reasonable_name(ln):
-            cleaned = normalize_line(ln)
-            parts = cleaned.split()
-            return (parts[0].title(), " ".join(parts[1:]).title())
+def extract_first_last_name_two_pages_with_cost(pdf_path: Path) -> tuple[Tuple[str, str], str, float]:
+    """
+    Same tiers as extract_first_last_name_with_cost, but the full-text tier covers
+    pages 1-2 and uses the looser two-page heuristic.
+    """
+    names, tier, seconds = extract_tiered(pdf_path, name_from_text_two_pages, max_pages=2)
+    return (names or ("Unknown", "Candidate")), tier, seconds
 
-    return ("Unknown", "Candidate")
+
+def _parsed(pdf_path: Path, result: tuple[Tuple[str, str], str, float]) -> Tuple[str, str]:
+    names, tier, seconds = result
+    _PARSE_STATS.record(tier, seconds)
+    log_progress(f"[{pdf_path.parent.name}] {pdf_path.name} NAME_PARSE tier={tier} ms={seconds * 1000:.1f}")
+    return names
+
+
+# names placeholder for a file whose parse worker died (BrokenProcessPool): the file is
+# recorded as a parse failure, not uploaded, and so picked up again on resume
+NAMES_UNAVAILABLE = object()
+
+
+def _broken_pool(pdf_path: Path):
+    _PARSE_STATS.record(TIER_ERROR, 0.0)
+    log_progress(f"[{pdf_path.parent.name}] {pdf_path.name} NAME_PARSE FAIL | parse worker pool is broken")
+    return NAMES_UNAVAILABLE
+
+
+def iter_pdfs_with_names(
+    pdfs,
+    parse_pool: Optional[ProcessPoolExecutor] = None,
+    parse_ahead: int = 1,
+    name_cache: Optional[NameCache] = None,
+):
+    """
+    Yields (pdf_path, names) in folder order.
+    Names already in `name_cache` are yielded without touching pdfplumber.
+    With a process pool, the remaining names are extracted at most `parse_ahead` files
+    ahead of the consumer, so pdfplumber runs on all cores while uploads are in flight
+    without buffering a whole folder. names is None when extraction is left to the
+    uploader (no pool, or a bad filename that never reaches the upload stage).
+    """
+    window = deque()
+    for pdf_path in pdfs:
+        names = fut = None
+        if _STAGES.parse(pdf_path.name):
+            if name_cache is not None:
+                names = name_cache.get(pdf_path)
+            if names is None and parse_pool is not None:
+                try:
+                    fut = parse_pool.submit(_STAGES.extract_names, pdf_path)
+                except BrokenProcessPool:
+                    names = _broken_pool(pdf_path)
+        window.append((pdf_path, names, fut))
+        if len(window) >= parse_ahead:
+            yield _resolve_names(window.popleft(), name_cache)
+
+    while window:
+        yield _resolve_names(window.popleft(), name_cache)
+
+
+def _resolve_names(entry, name_cache: Optional[NameCache]):
+    pdf_path, names, fut = entry
+    if fut is not None:
+        try:
+            names = _parsed(pdf_path, fut.result())
+        except BrokenProcessPool:
+            return pdf_path, _broken_pool(pdf_path)
+        if name_cache is not None:
+            name_cache.put(pdf_path, names)
+    return pdf_path, names
 
 
 def safe_json(resp: requests.Response) -> dict | None:
@@ -288,31 +528,491 @@ def upload_resume(session: requests.Session, job_obj_id: str, first_name: str, l
     url = UPLOAD_URL_TEMPLATE.format(job_obj_id=job_obj_id)
     data = {"first_name": first_name, "last_name": last_name, "email": email}
 
-    with open(pdf_path, "rb") as f:
-        files = {UPLOAD_FILE_FIELD: (pdf_path.name, f, "application/pdf")}
-        resp = session.post(
-            url,
-            data=data,
-            files=files,
-            headers=HEADERS,
-            timeout=REQUEST_TIMEOUT_UPLOAD,
-        )
+    # streamed from disk with a known Content-Length instead of building the whole body in memory
+    with MultipartFileBody(data, UPLOAD_FILE_FIELD, pdf_path, "application/pdf") as body:
+        resp = post_multipart(session, url, body, headers=HEADERS, timeout=REQUEST_TIMEOUT_UPLOAD)
 
     js = safe_json(resp)
     ok = 200 <= resp.status_code < 300
     return ok, resp.status_code, js
 
 
+async def validate_email_async(client, email: str, job_obj_id: str):
+    payload = {"email": email, "job_obj_id": job_obj_id}
+    resp = await client.post(
+        VALIDATE_EMAIL_URL,
+        json=payload,
+        headers=HEADERS,
+        timeout=REQUEST_TIMEOUT_VALIDATE,
+    )
+    js = safe_json(resp)
+    ok = 200 <= resp.status_code < 300
+    return ok, resp.status_code, js
+
+
+async def upload_resume_async(client, job_obj_id: str, first_name: str, last_name: str, email: str, pdf_path: Path):
+    url = UPLOAD_URL_TEMPLATE.format(job_obj_id=job_obj_id)
+    data = {"first_name": first_name, "last_name": last_name, "email": email}
+
+    with MultipartFileBody(data, UPLOAD_FILE_FIELD, pdf_path, "application/pdf") as body:
+        resp = await post_multipart_async(client, url, body, headers=HEADERS, timeout=REQUEST_TIMEOUT_UPLOAD)
+
+    js = safe_json(resp)
+    ok = 200 <= resp.status_code < 300
+    return ok, resp.status_code, js
+
+
+# ---------------- Pipeline stages ----------------
+class Stages:
+    """
+    The swappable steps of the pipeline, run in this order for every resume:
+      discover(folder) -> [file name, ...] in processing order
+      parse(file name) -> parse_filename()-style dict, or None for a bad name
+      email(info) -> email address for that dict
+      extract_names(pdf_path) -> ((first, last), tier, seconds); must be a top-level
+                                 function so the parse process pool can pickle it
+      validate(session, email, job_obj_id) -> (ok, status_code, json)
+      upload(session, job_obj_id, first, last, email, pdf_path) -> (ok, status_code, json)
+    validate_async/upload_async are the coroutine versions used by the asyncio mode.
+    Results are recorded by the ResultSink. name_cache_version tags cached names with the
+    extract_names heuristic, so two heuristics never share cache entries.
+    """
+
+    def __init__(
+        self,
+        discover=sorted_file_names,
+        parse=parse_filename,
+        email=email_from_stem,
+        extract_names=extract_first_last_name_with_cost,
+        name_cache_version: str = NAME_CACHE_VERSION,
+        validate=validate_email,
+        upload=upload_resume,
+        validate_async=validate_email_async,
+        upload_async=upload_resume_async,
+    ):
+        self.discover = discover
+        self.parse = parse
+        self.email = email
+        self.extract_names = extract_names
+        self.name_cache_version = name_cache_version
+        self.validate = validate
+        self.upload = upload
+        self.validate_async = validate_async
+        self.upload_async = upload_async
+
+
+# --email_style / --name_heuristic choices
+EMAIL_STYLES = {
+    "stem": email_from_stem,
+    "profile_id": email_from_profile_id,
+}
+NAME_HEURISTICS = {
+    "first_page": (extract_first_last_name_with_cost, NAME_CACHE_VERSION),
+    "two_pages": (extract_first_last_name_two_pages_with_cost, TWO_PAGE_NAME_CACHE_VERSION),
+}
+
+# Stages used by run_one_job and the step functions; replaced with set_stages()
+_STAGES = Stages()
+
+
+def set_stages(stages: Stages):
+    global _STAGES
+    _STAGES = stages
+
+
+def stages_for(email_style: str = "stem", name_heuristic: str = "first_page") -> Stages:
+    extract_names, name_cache_version = NAME_HEURISTICS[name_heuristic]
+    return Stages(
+        email=EMAIL_STYLES[email_style],
+        extract_names=extract_names,
+        name_cache_version=name_cache_version,
+    )
+
+
+def set_api_base(api_base: str):
+    global API_BASE, VALIDATE_EMAIL_URL, UPLOAD_URL_TEMPLATE
+    API_BASE = api_base.rstrip("/")
+    VALIDATE_EMAIL_URL = f"{API_BASE}/validate-email/"
+    UPLOAD_URL_TEMPLATE = f"{API_BASE}{UPLOAD_PATH}{{job_obj_id}}"
+
+
+@contextmanager
+def _run_settings(api_base: Optional[str], stages: Stages):
+    # API base and stages for one main() call; the previous ones are put back afterwards
+    global API_BASE, VALIDATE_EMAIL_URL, UPLOAD_URL_TEMPLATE, _STAGES
+    saved = (API_BASE, VALIDATE_EMAIL_URL, UPLOAD_URL_TEMPLATE, _STAGES)
+    if api_base:
+        set_api_base(api_base)
+    set_stages(stages)
+    try:
+        yield
+    finally:
+        API_BASE, VALIDATE_EMAIL_URL, UPLOAD_URL_TEMPLATE, _STAGES = saved
+
+
 # ---------------- Job runner ----------------
-def run_one_job(base_dir: Path, job_id: str, job_obj_id: str, job_title: str, session: requests.Session):
+def build_session(
+    pool_size: int = 1,
+    max_rps: float = DEFAULT_MAX_RPS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    http2: bool = False,
+) -> requests.Session:
+    """
+    One pooled session shared by every worker thread so uploads reuse keep-alive
+    connections instead of opening a new TCP+TLS connection per request.
+    Every request is paced to max_rps, limited by an AIMD window of at most
+    pool_size in flight, and retried with backoff on 429/5xx/connection errors
+    (uploads only on 429/503 and failed connects, see DEFAULT_MAX_RETRIES).
+    """
+    return create_session(
+        pool_connections=1,
+        pool_maxsize=max(1, pool_size),
+        pool_block=True,
+        max_rps=max_rps,
+        max_concurrency=max(1, pool_size),
+        latency_target=LATENCY_TARGET,
+        max_retries=max_retries,
+        http2=http2,
+        non_idempotent_paths=(UPLOAD_PATH,),
+    )
+
+
+def build_async_client(
+    pool_size: int = 1,
+    max_rps: float = DEFAULT_MAX_RPS,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+):
+    """
+    build_session for the asyncio mode: one aiohttp-backed client with at most
+    pool_size connections to the API host and requests in flight, same pacing and retries.
+    """
+    return create_async_client(
+        pool_maxsize=max(1, pool_size),
+        max_rps=max_rps,
+        max_concurrency=max(1, pool_size),
+        latency_target=LATENCY_TARGET,
+        max_retries=max_retries,
+        non_idempotent_paths=(UPLOAD_PATH,),
+    )
+
+
+def _write_item_fail(job: dict, item: Optional[dict], status_code: str, message: str):
+    item = item or {}
+    write_fail_row(
+        timestamp=datetime.now().isoformat(timespec="seconds"),
+        job_obj_id=job["job_obj_id"],
+        job_id=job["job_id"],
+        job_title=job["job_title"],
+        profile_id=item.get("profile_id", ""),
+        external_id=item.get("full_stem", ""),
+        email=item.get("email", ""),
+        status_code=status_code,
+        message=message,
+    )
+
+
+def parse_step(pdf_path: Path, seq: int, job: dict) -> Optional[dict]:
+    """
+    Returns the parse_filename() dict plus seq/pdf_path/email, or None (failure row written).
+    """
+    info = _STAGES.parse(pdf_path.name)
+    if not info:
+        _write_item_fail(job, None, "", "parse: Bad filename format")
+        log_progress(f"[{normalize_job_folder(job['job_id'])}] #{seq} PARSE_FAIL")
+        return None
+    info["seq"] = seq
+    info["pdf_path"] = pdf_path
+    info["email"] = _STAGES.email(info)
+    return info
+
+
+def validate_step(
+    session: requests.Session,
+    item: dict,
+    job: dict,
+    validation_cache: Optional[dict] = None,
+) -> tuple[bool, int]:
+    """
+    Returns (proceed_to_upload, validate_fail).
+    With a validation_cache, an (email, job_obj_id) pair that failed validation is not
+    sent again this run. Passes are not cached: once one file with that email is
+    uploaded, the next one with the same email must be checked again.
+    """
+    key = (item["email"], job["job_obj_id"])
+    cached = validation_cache.get(key) if validation_cache is not None else None
+    if cached is not None:
+        return _validate_outcome(item, job, cached, cached=True)
+    try:
+        result = _STAGES.validate(session, item["email"], job["job_obj_id"])
+    except Exception as e:
+        return _validate_exception(item, job, e)
+    if validation_cache is not None and not result[0]:
+        validation_cache[key] = result
+    return _validate_outcome(item, job, result)
+
+
+async def validate_step_async(client, item: dict, job: dict, validation_cache: Optional[dict] = None) -> tuple[bool, int]:
+    key = (item["email"], job["job_obj_id"])
+    cached = validation_cache.get(key) if validation_cache is not None else None
+    if cached is not None:
+        return _validate_outcome(item, job, cached, cached=True)
+    try:
+        result = await _STAGES.validate_async(client, item["email"], job["job_obj_id"])
+    except Exception as e:
+        return _validate_exception(item, job, e)
+    if validation_cache is not None and not result[0]:
+        validation_cache[key] = result
+    return _validate_outcome(item, job, result)
+
+
+def _validate_exception(item: dict, job: dict, e: Exception) -> tuple[bool, int]:
+    _write_item_fail(job, item, "", f"validate: Exception: {e}")
+    log_progress(f"[{normalize_job_folder(job['job_id'])}] #{item['seq']} VALIDATE_EXCEPTION")
+    return (False, 1)
+
+
+def _validate_outcome(item: dict, job: dict, result: tuple, cached: bool = False) -> tuple[bool, int]:
+    v_ok, v_status, v_json = result
+    if v_ok:
+        return (True, 0)
+
+    v_msg, v_candidate, v_app = get_message_candidate_app(v_json)
+    _write_item_fail(job, item, str(v_status), f"validate: {v_msg or 'validate_failed'}")
+    log_progress(
+        f"[{normalize_job_folder(job['job_id'])}] #{item['seq']} VALIDATE_FAIL({v_status}){' (cached)' if cached else ''}"
+    )
+    return (not SKIP_ON_VALIDATE_FAIL, 1)
+
+
+def upload_step(session: requests.Session, item: dict, job: dict, first_name: str, last_name: str) -> tuple[int, int]:
+    """
+    Returns (upload_ok, upload_fail).
+    """
+    try:
+        result = _STAGES.upload(session, job["job_obj_id"], first_name, last_name, item["email"], item["pdf_path"])
+    except Exception as e:
+        return _upload_exception(item, job, e)
+    return _upload_outcome(item, job, result)
+
+
+async def upload_step_async(client, item: dict, job: dict, first_name: str, last_name: str) -> tuple[int, int]:
+    try:
+        result = await _STAGES.upload_async(
+            client, job["job_obj_id"], first_name, last_name, item["email"], item["pdf_path"]
+        )
+    except Exception as e:
+        return _upload_exception(item, job, e)
+    return _upload_outcome(item, job, result)
+
+
+def _upload_exception(item: dict, job: dict, e: Exception) -> tuple[int, int]:
+    _write_item_fail(job, item, "", f"upload: Exception: {e}")
+    log_progress(f"[{normalize_job_folder(job['job_id'])}] #{item['seq']} UPLOAD_EXCEPTION")
+    return (0, 1)
+
+
+def _upload_outcome(item: dict, job: dict, result: tuple) -> tuple[int, int]:
+    external_folder = normalize_job_folder(job["job_id"])
+    seq = item["seq"]
+    u_ok, u_status, u_json = result
+    u_msg, u_candidate, u_app = get_message_candidate_app(u_json)
+
+    if not u_ok:
+        _write_item_fail(job, item, str(u_status), f"upload: {u_msg or 'upload_failed'}")
+        log_progress(f"[{external_folder}] #{seq} UPLOAD_FAIL({u_status})")
+        return (0, 1)
+
+    write_success_row(
+        timestamp=datetime.now().isoformat(timespec="seconds"),
+        job_obj_id=job["job_obj_id"],
+        job_id=job["job_id"],
+        job_title=job["job_title"],
+        profile_id=item["profile_id"],
+        external_id=item["full_stem"],
+        email=item["email"],
+        status_code=str(u_status),
+        message=f"upload: {u_msg or 'upload_ok'}",
+        candidate_obj_id=u_candidate or "",
+        application_obj_id=u_app or "",
+    )
+    log_progress(f"[{external_folder}] #{seq} UPLOAD_OK")
+    return (1, 0)
+
+
+def _names_unavailable(item: dict, job: dict) -> tuple[int, int, int, int]:
+    _write_item_fail(job, item, "", "parse: name extraction failed (parse worker pool is broken)")
+    log_progress(f"[{normalize_job_folder(job['job_id'])}] #{item['seq']} NAME_PARSE_FAIL")
+    return (0, 0, 0, 1)
+
+
+def _names_for(pdf_path: Path, names: Optional[Tuple[str, str]], name_cache: Optional[NameCache]) -> Tuple[str, str]:
+    if names is None:
+        # cache already consulted by iter_pdfs_with_names; this is a miss
+        names = _parsed(pdf_path, _STAGES.extract_names(pdf_path))
+        if name_cache is not None:
+            name_cache.put(pdf_path, names)
+    return names
+
+
+class EmailLocks:
+    """
+    One lock per email, created on first use. Files that share an email (--email_style
+    profile_id) hold it across validate + upload, so each one is validated only after the
+    previous upload, as in a sequential run. Safe to share between threads of one process.
+    """
+
+    def __init__(self):
+        self._locks: dict[str, threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def __call__(self, email: str) -> threading.Lock:
+        with self._guard:
+            return self._locks.setdefault(email, threading.Lock())
+
+
+def process_one_pdf(
+    pdf_path: Path,
+    seq: int,
+    job_id: str,
+    job_obj_id: str,
+    job_title: str,
+    session: requests.Session,
+    names: Optional[Tuple[str, str]] = None,
+    name_cache: Optional[NameCache] = None,
+    validation_cache: Optional[dict] = None,
+    email_locks: Optional[EmailLocks] = None,
+) -> tuple[int, int, int, int]:
+    """
+    Parse -> extract name -> validate -> upload for a single resume.
+    `names` is the (first_name, last_name) already extracted by the parse stage, if any.
+    Returns counter deltas: (upload_ok, upload_fail, validate_fail, parse_fail)
+    """
+    job = {"job_id": job_id, "job_obj_id": job_obj_id, "job_title": job_title}
+
+    item = parse_step(pdf_path, seq, job)
+    if item is None:
+        return (0, 0, 0, 1)
+    if names is NAMES_UNAVAILABLE:
+        return _names_unavailable(item, job)
+
+    first_name, last_name = _names_for(pdf_path, names, name_cache)
+
+    with email_locks(item["email"]) if email_locks is not None else nullcontext():
+        proceed, validate_fail = validate_step(session, item, job, validation_cache)
+        if not proceed:
+            return (0, 0, validate_fail, 0)
+
+        upload_ok, upload_fail = upload_step(session, item, job, first_name, last_name)
+    return (upload_ok, upload_fail, validate_fail, 0)
+
+
+# result of a _bounded_map call that was still queued when `stop` was set
+_NOT_STARTED = object()
+
+
+def _bounded_map(pool: ThreadPoolExecutor, fn, arg_tuples, max_pending: int, stop: Optional[threading.Event] = None):
+    """
+    Yields fn(*args) results in completion order, keeping at most `max_pending`
+    submitted-but-unfinished calls so large folders never queue everything at once.
+    Once `stop` is set nothing new is submitted and queued calls are skipped (not
+    yielded); calls already running finish.
+    """
+    def call(*args):
+        if stop is not None and stop.is_set():
+            return _NOT_STARTED
+        return fn(*args)
+
+    pending = set()
+    for args in _until_stopped(arg_tuples, stop):
+        pending.add(pool.submit(call, *args))
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if (result := fut.result()) is not _NOT_STARTED:
+                    yield result
+    for fut in as_completed(pending):
+        if (result := fut.result()) is not _NOT_STARTED:
+            yield result
+
+
+@contextmanager
+def _worker_pool(workers: int, name: str):
+    """
+    `with ThreadPoolExecutor(...)`, except that a KeyboardInterrupt (the second Ctrl-C,
+    see run_jobs_threaded) leaves without waiting for the calls still running.
+    """
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+    abandon = False
+    try:
+        yield pool
+    except KeyboardInterrupt:
+        abandon = True
+        raise
+    finally:
+        pool.shutdown(wait=not abandon, cancel_futures=abandon)
+
+
+def _until_stopped(items, stop: Optional[threading.Event]):
+    # stops handing out work once `stop` is set; whatever was already submitted still finishes
+    for item in items:
+        if stop is not None and stop.is_set():
+            return
+        yield item
+
+
+def _pending_names(
+    names: list[str],
+    job_obj_id: str,
+    checkpoint: Optional[CheckpointJournal],
+    shard: Optional[tuple[int, int]] = None,
+) -> tuple[list[str], int]:
+    """
+    Drops files owned by another shard (by external_id; a bad filename goes to the shard
+    of its name) and, to resume, files already uploaded in an earlier run, before any
+    parsing or requests. Returns (names still to do, number skipped as already done).
+    """
+    resume = checkpoint is not None and len(checkpoint) > 0
+    if not resume and shard is None:
+        return names, 0
+    todo = []
+    skipped = 0
+    for name in names:
+        info = _STAGES.parse(name)
+        if shard is not None and not in_shard(info["full_stem"] if info else name, shard):
+            continue
+        if resume and info and checkpoint.is_done(job_obj_id, info["full_stem"]):
+            skipped += 1
+            continue
+        todo.append(name)
+    return todo, skipped
+
+
+def run_one_job(
+    base_dir: Path,
+    job_id: str,
+    job_obj_id: str,
+    job_title: str,
+    session: requests.Session,
+    workers: int = DEFAULT_WORKERS,
+    parse_pool: Optional[ProcessPoolExecutor] = None,
+    parse_ahead: int = 1,
+    name_cache: Optional[NameCache] = None,
+    checkpoint: Optional[CheckpointJournal] = None,
+    prevalidate: bool = False,
+    validation_cache: Optional[dict] = None,
+    shard: Optional[tuple[int, int]] = None,
+    stop: Optional[threading.Event] = None,
+):
     external_folder = normalize_job_folder(job_id)
     folder_path = base_dir / external_folder
 
     if not folder_path.exists():
         log_progress(f"[FOLDER MISSING] job_id=job_{job_id} | job_obj_id={job_obj_id} | path={folder_path}")
-        return (0, 0, 0, 0, 0)  # totals
+        return (0, 0, 0, 0, 0, 0)  # totals
 
-    pdfs = sorted(folder_path.glob("*.pdf"))
+    # names only (os.scandir); Paths are built lazily as files are processed
+    names, job_skipped = _pending_names(_STAGES.discover(folder_path), job_obj_id, checkpoint, shard)
+    pdfs = (folder_path / name for name in names)
 
     job_total = 0
     job_upload_ok = 0
@@ -321,197 +1021,700 @@ def run_one_job(base_dir: Path, job_id: str, job_obj_id: str, job_title: str, se
     job_parse_fail = 0
 
     log_progress(
-        f"=== START JOB {external_folder} | job_id={job_id} | job_title={job_title} -> job_obj_id={job_obj_id} | files={len(pdfs)} ==="
+        f"=== START JOB {external_folder} | job_id={job_id} | job_title={job_title} -> job_obj_id={job_obj_id} | files={len(names)} | already_done={job_skipped} | workers={workers} | prevalidate={prevalidate} ==="
     )
 
-    for pdf_path in pdfs:
-        job_total += 1
-
-        info = parse_filename(pdf_path.name)
-        if not info:
-            job_parse_fail += 1
-            write_fail_row(
-                timestamp=datetime.now().isoformat(timespec="seconds"),
-                job_obj_id=job_obj_id,
-                job_id=job_id,
-                job_title=job_title,
-                profile_id="",
-                external_id="",
-                email="",
-                status_code="",
-                message="parse: Bad filename format",
-            )
-            log_progress(f"[{external_folder}] #{job_total} PARSE_FAIL")
-            continue
+    def add(counts: tuple[int, int, int, int]):
+        nonlocal job_upload_ok, job_upload_fail, job_validate_fail, job_parse_fail
+        ok, fail, vfail, pfail = counts
+        job_upload_ok += ok
+        job_upload_fail += fail
+        job_validate_fail += vfail
+        job_parse_fail += pfail
+
+    # Keep at most `workers` requests in flight (plus one queued each)
+    # so the pending set stays small even for folders with thousands of resumes.
+    max_pending = workers * 2
+    email_locks = EmailLocks()
+
+    if prevalidate:
+        # Phase 1: parse every filename and validate all (email, job_obj_id) pairs concurrently.
+        # Phase 2: extract names for and upload only the items that passed.
+        # Files sharing an email (--email_style profile_id) are validated in phase 1 only
+        # once. Whichever of them reaches its upload after another one already used the
+        # email is validated again first (under the email's lock), since that upload is
+        # what makes the server reject the email; name extraction decides the order.
+        job = {"job_id": job_id, "job_obj_id": job_obj_id, "job_title": job_title}
+        parsed = []
+        for pdf_path in pdfs:
+            job_total += 1
+            item = parse_step(pdf_path, job_total, job)
+            if item is None:
+                job_parse_fail += 1
+            else:
+                parsed.append(item)
+
+        def check(item: dict):
+            return item, validate_step(session, item, job, validation_cache)
+
+        first_of_email = {}
+        for item in parsed:
+            first_of_email.setdefault(item["email"], item)
+
+        passed = {}
+        with _worker_pool(workers, "validate") as pool:
+            firsts = ((it,) for it in first_of_email.values())
+            for item, (proceed, vfail) in _bounded_map(pool, check, firsts, max_pending, stop):
+                job_validate_fail += vfail
+                if proceed:
+                    passed[item["pdf_path"]] = item
+        for item in parsed:
+            if first_of_email[item["email"]] is not item and first_of_email[item["email"]]["pdf_path"] in passed:
+                passed[item["pdf_path"]] = item
+
+        log_progress(f"[{external_folder}] PREVALIDATE DONE | to_upload={len(passed)} validate_fail={job_validate_fail}")
+
+        # emails already sent in an upload during phase 2; read and written under the email's lock
+        used_emails = set()
+
+        def upload(pdf_path: Path, names: Optional[Tuple[str, str]]) -> tuple[int, int, int, int]:
+            item = passed[pdf_path]
+            if names is NAMES_UNAVAILABLE:
+                return _names_unavailable(item, job)
+            first_name, last_name = _names_for(pdf_path, names, name_cache)
+            vfail = 0
+            with email_locks(item["email"]):
+                if item["email"] in used_emails:
+                    proceed, vfail = validate_step(session, item, job, validation_cache)
+                    if not proceed:
+                        return (0, 0, vfail, 0)
+                # even a failed upload may have created the application server-side
+                used_emails.add(item["email"])
+                ok, fail = upload_step(session, item, job, first_name, last_name)
+            return (ok, fail, vfail, 0)
+
+        to_upload = [item["pdf_path"] for item in parsed if item["pdf_path"] in passed]
+        items = iter_pdfs_with_names(to_upload, parse_pool=parse_pool, parse_ahead=parse_ahead, name_cache=name_cache)
+        if workers <= 1:
+            for pdf_path, names in _until_stopped(items, stop):
+                add(upload(pdf_path, names))
+        else:
+            with _worker_pool(workers, "upload") as pool:
+                for counts in _bounded_map(pool, upload, items, max_pending, stop):
+                    add(counts)
+    else:
+        items = iter_pdfs_with_names(pdfs, parse_pool=parse_pool, parse_ahead=parse_ahead, name_cache=name_cache)
+
+        def numbered():
+            for seq, (pdf_path, names) in enumerate(items, 1):
+                yield (pdf_path, seq, job_id, job_obj_id, job_title, session, names, name_cache, validation_cache, email_locks)
+
+        # total counts files actually processed (a Ctrl-C can leave some queued, never started)
+        if workers <= 1:
+            for args in _until_stopped(numbered(), stop):
+                job_total += 1
+                add(process_one_pdf(*args))
+        else:
+            with _worker_pool(workers, "upload") as pool:
+                for counts in _bounded_map(pool, process_one_pdf, numbered(), max_pending, stop):
+                    job_total += 1
+                    add(counts)
+
+    interrupted = stop is not None and stop.is_set()
+    log_progress(
+        f"=== DONE JOB {external_folder} | total={job_total} ok={job_upload_ok} upload_fail={job_upload_fail} validate_fail={job_validate_fail} parse_fail={job_parse_fail} skipped_done={job_skipped}{' | interrupted' if interrupted else ''} ==="
+    )
+    return (job_total, job_upload_ok, job_upload_fail, job_validate_fail, job_parse_fail, job_skipped)
 
-        profile_id = info["profile_id"]
-        external_id = info["full_stem"]
-        email = build_fake_email(external_id)
 
-        first_name, last_name = extract_first_last_name(pdf_path)
+# ---------------- Multi-job scheduling ----------------
+def order_largest_first(
+    base_dir: Path,
+    job_rows: list[dict],
+    checkpoint: Optional[CheckpointJournal] = None,
+    shard: Optional[tuple[int, int]] = None,
+) -> list[tuple[dict, int]]:
+    """
+    (job, files still to upload) pairs, largest first: started in this order on a fixed
+    number of slots, the longest jobs never end up alone at the tail of the run
+    (longest-processing-time-first). Missing folders count as 0 files.
+    """
+    sized = []
+    for r in job_rows:
+        folder_path = base_dir / normalize_job_folder(r["job_id"])
+        names = _STAGES.discover(folder_path) if folder_path.exists() else []
+        sized.append((r, len(_pending_names(names, r["job_obj_id"], checkpoint, shard)[0])))
+    sized.sort(key=lambda pair: pair[1], reverse=True)
+    return sized
 
-        # VALIDATE
-        try:
-            v_ok, v_status, v_json = validate_email(session, email, job_obj_id)
-        except Exception as e:
-            job_validate_fail += 1
-            write_fail_row(
-                timestamp=datetime.now().isoformat(timespec="seconds"),
-                job_obj_id=job_obj_id,
-                job_id=job_id,
-                job_title=job_title,
-                profile_id=profile_id,
-                external_id=external_id,
-                email=email,
-                status_code="",
-                message=f"validate: Exception: {e}",
-            )
-            log_progress(f"[{external_folder}] #{job_total} VALIDATE_EXCEPTION")
-            continue
 
-        v_msg, v_candidate, v_app = get_message_candidate_app(v_json)
-
-        if not v_ok:
-            job_validate_fail += 1
-            write_fail_row(
-                timestamp=datetime.now().isoformat(timespec="seconds"),
-                job_obj_id=job_obj_id,
-                job_id=job_id,
-                job_title=job_title,
-                profile_id=profile_id,
-                external_id=external_id,
-                email=email,
-                status_code=str(v_status),
-                message=f"validate: {v_msg or 'validate_failed'}",
-            )
-            log_progress(f"[{external_folder}] #{job_total} VALIDATE_FAIL({v_status})")
-            if SKIP_ON_VALIDATE_FAIL:
-                continue
+def run_jobs_parallel(job_rows: list[dict], parallel_jobs: int, run_job: Callable[[dict], tuple]) -> Iterator[tuple]:
+    """
+    Runs run_job(job) for up to parallel_jobs jobs at once, starting them in job_rows
+    order as slots free up, and yields each job's counters as it finishes.
+    On an error, jobs not started yet are dropped and running ones finish (see
+    run_jobs_threaded for stopping those early on Ctrl-C); on a KeyboardInterrupt
+    running jobs are abandoned.
+    """
+    pool = ThreadPoolExecutor(max_workers=max(1, parallel_jobs), thread_name_prefix="job")
+    abandon = False
+    try:
+        futures = [pool.submit(run_job, r) for r in job_rows]
+        for fut in as_completed(futures):
+            yield fut.result()
+    except KeyboardInterrupt:
+        abandon = True
+        raise
+    finally:
+        pool.shutdown(wait=not abandon, cancel_futures=True)
 
-        # UPLOAD
-        try:
-            u_ok, u_status, u_json = upload_resume(session, job_obj_id, first_name, last_name, email, pdf_path)
-        except Exception as e:
-            job_upload_fail += 1
-            write_fail_row(
-                timestamp=datetime.now().isoformat(timespec="seconds"),
-                job_obj_id=job_obj_id,
-                job_id=job_id,
-                job_title=job_title,
-                profile_id=profile_id,
-                external_id=external_id,
-                email=email,
-                status_code="",
-                message=f"upload: Exception: {e}",
-            )
-            log_progress(f"[{external_folder}] #{job_total} UPLOAD_EXCEPTION")
-            continue
 
-        u_msg, u_candidate, u_app = get_message_candidate_app(u_json)
-
-        if u_ok:
-            job_upload_ok += 1
-            write_success_row(
-                timestamp=datetime.now().isoformat(timespec="seconds"),
-                job_obj_id=job_obj_id,
-                job_id=job_id,
-                job_title=job_title,
-                profile_id=profile_id,
-                external_id=external_id,
-                email=email,
-                status_code=str(u_status),
-                message=f"upload: {u_msg or 'upload_ok'}",
-                candidate_obj_id=u_candidate or "",
-                application_obj_id=u_app or "",
-            )
-            log_progress(f"[{external_folder}] #{job_total} UPLOAD_OK")
+def run_jobs_threaded(job_rows: list[dict], run_job: Callable[..., tuple], parallel_jobs: int = 1) -> tuple[list[tuple], bool]:
+    """
+    Runs run_job(job, stop) for each job, up to parallel_jobs at a time (see run_jobs_parallel).
+    Ctrl-C sets `stop`: no new job or file is started and requests already in flight
+    finish, so their rows are written and the summary stays complete. A second Ctrl-C
+    puts the previous handler back and raises KeyboardInterrupt: requests still in
+    flight are abandoned, without their rows. Returns (counters of each finished job, interrupted).
+    """
+    results = []
+    stop = threading.Event()
+
+    def on_sigint(signum, frame):
+        if stop.is_set():
+            signal.signal(signal.SIGINT, previous if previous is not None else signal.default_int_handler)
+            raise KeyboardInterrupt
+        stop.set()
+        # logged from another thread: the handler can run while this one holds the log lock
+        threading.Thread(target=log_progress, args=("INTERRUPT | finishing in-flight uploads (Ctrl-C again to abort them)",)).start()
+
+    try:
+        previous = signal.signal(signal.SIGINT, on_sigint)
+        installed = True
+    except ValueError:
+        installed = False  # not the main thread: Ctrl-C stays a KeyboardInterrupt
+
+    def run_unless_stopped(r: dict):
+        # a job still queued when Ctrl-C arrives is never started
+        return None if stop.is_set() else run_job(r, stop)
+
+    try:
+        if parallel_jobs > 1:
+            counts = run_jobs_parallel(job_rows, parallel_jobs, run_unless_stopped)
         else:
-            job_upload_fail += 1
-            write_fail_row(
-                timestamp=datetime.now().isoformat(timespec="seconds"),
-                job_obj_id=job_obj_id,
-                job_id=job_id,
-                job_title=job_title,
-                profile_id=profile_id,
-                external_id=external_id,
-                email=email,
-                status_code=str(u_status),
-                message=f"upload: {u_msg or 'upload_failed'}",
-            )
-            log_progress(f"[{external_folder}] #{job_total} UPLOAD_FAIL({u_status})")
+            counts = (run_job(r, stop) for r in _until_stopped(job_rows, stop))
+        for c in counts:
+            if c is not None:
+                results.append(c)
+    finally:
+        if installed:
+            signal.signal(signal.SIGINT, previous if previous is not None else signal.default_int_handler)
+    return results, stop.is_set()
+
+
+# ---------------- asyncio mode ----------------
+async def run_one_job_async(
+    base_dir: Path,
+    job_id: str,
+    job_obj_id: str,
+    job_title: str,
+    client,
+    workers: int = DEFAULT_WORKERS,
+    parse_pool: Optional[ProcessPoolExecutor] = None,
+    extractors: int = 1,
+    parse_ahead: int = 1,
+    name_cache: Optional[NameCache] = None,
+    checkpoint: Optional[CheckpointJournal] = None,
+    validation_cache: Optional[dict] = None,
+    stop: Optional[asyncio.Event] = None,
+    shard: Optional[tuple[int, int]] = None,
+):
+    """
+    run_one_job as asyncio stages joined by bounded queues:
+      scan (parse filenames) -> `extractors` name-extraction tasks (parse_pool, or
+      threads) -> `workers` validate/upload coroutines sharing one async client.
+    Once `stop` is set nothing new is started; requests already in flight finish and
+    are recorded (or are abandoned if the task is then cancelled). Returns the same
+    counters as run_one_job.
+    """
+    loop = asyncio.get_running_loop()
+    external_folder = normalize_job_folder(job_id)
+    folder_path = base_dir / external_folder
+
+    if not folder_path.exists():
+        log_progress(f"[FOLDER MISSING] job_id=job_{job_id} | job_obj_id={job_obj_id} | path={folder_path}")
+        return (0, 0, 0, 0, 0, 0)  # totals
+
+    names = await loop.run_in_executor(None, _STAGES.discover, folder_path)
+    names, job_skipped = _pending_names(names, job_obj_id, checkpoint, shard)
 
     log_progress(
-        f"=== DONE JOB {external_folder} | total={job_total} ok={job_upload_ok} upload_fail={job_upload_fail} validate_fail={job_validate_fail} parse_fail={job_parse_fail} ==="
+        f"=== START JOB {external_folder} | job_id={job_id} | job_title={job_title} -> job_obj_id={job_obj_id} | files={len(names)} | already_done={job_skipped} | workers={workers} | mode=async ==="
     )
-    return (job_total, job_upload_ok, job_upload_fail, job_validate_fail, job_parse_fail)
+
+    job = {"job_id": job_id, "job_obj_id": job_obj_id, "job_title": job_title}
+    counts = {"total": 0, "ok": 0, "fail": 0, "vfail": 0, "pfail": 0}
+    # files sharing an email validate + upload one at a time (see EmailLocks)
+    email_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+    parsed_q: asyncio.Queue = asyncio.Queue(maxsize=max(1, parse_ahead))
+    named_q: asyncio.Queue = asyncio.Queue(maxsize=max(1, workers))
+
+    def stopping() -> bool:
+        return stop is not None and stop.is_set()
+
+    async def scan():
+        for seq, name in enumerate(names, 1):
+            if stopping():
+                break
+            item = parse_step(folder_path / name, seq, job)
+            if item is None:
+                counts["total"] += 1
+                counts["pfail"] += 1
+                continue
+            await parsed_q.put(item)
+        for _ in range(extractors):
+            await parsed_q.put(None)
+
+    async def extract():
+        while (item := await parsed_q.get()) is not None:
+            if stopping():
+                continue
+            pdf_path = item["pdf_path"]
+            names = None
+            if name_cache is not None:
+                names = await loop.run_in_executor(None, name_cache.get, pdf_path)
+            if names is None:
+                try:
+                    names = _parsed(pdf_path, await loop.run_in_executor(parse_pool, _STAGES.extract_names, pdf_path))
+                except BrokenProcessPool:
+                    names = _broken_pool(pdf_path)
+                else:
+                    if name_cache is not None:
+                        await loop.run_in_executor(None, name_cache.put, pdf_path, names)
+            await named_q.put((item, names))
+
+    async def extract_all():
+        await asyncio.gather(*(extract() for _ in range(extractors)))
+        for _ in range(workers):
+            await named_q.put(None)
+
+    async def send():
+        while (entry := await named_q.get()) is not None:
+            if stopping():
+                continue
+            item, names = entry
+            if names is NAMES_UNAVAILABLE:
+                counts["total"] += 1
+                counts["pfail"] += _names_unavailable(item, job)[3]
+                continue
+            first_name, last_name = names
+            async with email_locks[item["email"]]:
+                proceed, vfail = await validate_step_async(client, item, job, validation_cache)
+                ok = fail = 0
+                if proceed:
+                    ok, fail = await upload_step_async(client, item, job, first_name, last_name)
+            counts["total"] += 1
+            counts["ok"] += ok
+            counts["fail"] += fail
+            counts["vfail"] += vfail
+
+    tasks = [asyncio.ensure_future(c) for c in (scan(), extract_all(), *(send() for _ in range(workers)))]
+    try:
+        await asyncio.gather(*tasks)
+    except asyncio.CancelledError:
+        if not stopping():
+            raise
+        # second Ctrl-C: requests still in flight are abandoned; the counters cover what finished
+        asyncio.current_task().uncancel()
+        log_progress(f"[{external_folder}] INTERRUPT | in-flight uploads cancelled")
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    log_progress(
+        f"=== DONE JOB {external_folder} | total={counts['total']} ok={counts['ok']} upload_fail={counts['fail']} validate_fail={counts['vfail']} parse_fail={counts['pfail']} skipped_done={job_skipped}{' | interrupted' if stopping() else ''} ==="
+    )
+    return (counts["total"], counts["ok"], counts["fail"], counts["vfail"], counts["pfail"], job_skipped)
+
+
+def run_jobs_async(job_rows: list[dict], client, parallel_jobs: int = 1, **job_kwargs) -> tuple[list[tuple], bool]:
+    """
+    Runs run_one_job_async for each job on one event loop, up to parallel_jobs at a time
+    (started in job_rows order), then closes the client.
+    The first Ctrl-C stops starting new work and lets in-flight requests finish so
+    their rows are written; a second Ctrl-C cancels them.
+    Returns (counters of each finished job, interrupted).
+    """
+    results = []
+
+    async def run_all() -> bool:
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        main_task = asyncio.current_task()
+
+        def on_sigint():
+            if stop.is_set():
+                main_task.cancel()
+                return
+            log_progress("INTERRUPT | finishing in-flight uploads (Ctrl-C again to abort them)")
+            stop.set()
+
+        try:
+            loop.add_signal_handler(signal.SIGINT, on_sigint)
+        except (NotImplementedError, RuntimeError):
+            pass  # e.g. Windows: Ctrl-C cancels right away
+
+        queue = deque(job_rows)
+
+        async def runner():
+            while queue and not stop.is_set():
+                r = queue.popleft()
+                results.append(
+                    await run_one_job_async(
+                        job_id=r["job_id"],
+                        job_obj_id=r["job_obj_id"],
+                        job_title=r.get("job_title", ""),
+                        client=client,
+                        stop=stop,
+                        **job_kwargs,
+                    )
+                )
+
+        try:
+            await asyncio.gather(*(runner() for _ in range(max(1, parallel_jobs))))
+        finally:
+            await client.aclose()
+        return stop.is_set()
+
+    try:
+        interrupted = asyncio.run(run_all())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        log_progress("INTERRUPT | in-flight uploads cancelled")
+        interrupted = True
+    return results, interrupted
 
 
 # ---------------- Main ----------------
-def main():
+def parse_job_spec(spec: str) -> tuple[str, str]:
+    # "job_1393=6970c43309b0d28599ec8071" -> ("1393", "6970c43309b0d28599ec8071")
+    folder, sep, job_obj_id = spec.partition("=")
+    job_id = normalize_job_id(folder)
+    if not sep or not job_id or not job_obj_id.strip():
+        raise argparse.ArgumentTypeError(f"expected job_<id>=<job_obj_id>, got {spec!r}")
+    return job_id, job_obj_id.strip()
+
+
+def main(argv: Optional[list[str]] = None):
     parser = argparse.ArgumentParser(description="Upload resumes for one job or all jobs from CSV.")
     parser.add_argument("--job_obj_id", help="Run only this job_obj_id", default=None)
     parser.add_argument("--job_id", help="Run only this numeric job_id (e.g., 1393)", default=None)
     parser.add_argument("--job_map_csv", help="Job map CSV path", default=str(DEFAULT_JOB_MAP_CSV_PATH))
     parser.add_argument("--base_dir", help="Base resume folder", default=str(DEFAULT_BASE_DIR))
-    args = parser.parse_args()
+    parser.add_argument(
+        "--job_map_snapshot",
+        action="store_true",
+        help="Keep a pickle snapshot of the job map columns (csv_loader.SNAPSHOT_DIR) so re-runs skip parsing the CSV",
+    )
+    parser.add_argument(
+        "--job",
+        dest="jobs",
+        action="append",
+        type=parse_job_spec,
+        default=[],
+        metavar="job_<id>=<job_obj_id>",
+        help="Run this job instead of reading --job_map_csv (repeatable)",
+    )
+    parser.add_argument("--api_base", help=f"apply-job API base URL (default {API_BASE})", default=None)
+    parser.add_argument(
+        "--email_style",
+        choices=sorted(EMAIL_STYLES),
+        default="stem",
+        help="stem: <prefix>-app_pcf_1393_100225_0@...; profile_id: <prefix>-pcf_100225@...",
+    )
+    parser.add_argument(
+        "--name_heuristic",
+        choices=sorted(NAME_HEURISTICS),
+        default="first_page",
+        help="first_page: reasonable-name line on page 1; two_pages: looser name check over pages 1-2",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Validate/upload pairs kept in flight (1 = sequential); parallel jobs share this cap",
+    )
+    parser.add_argument(
+        "--parallel_jobs",
+        type=int,
+        default=DEFAULT_PARALLEL_JOBS,
+        help="Jobs processed at the same time, largest folder first (1 = one after another)",
+    )
+    parser.add_argument(
+        "--parse_workers",
+        type=int,
+        default=DEFAULT_PARSE_WORKERS,
+        help="Processes extracting resume names ahead of the uploader (0 = inline)",
+    )
+    parser.add_argument(
+        "--max_rps", type=float, default=DEFAULT_MAX_RPS, help="Max API requests per second (0 = unpaced)"
+    )
+    parser.add_argument(
+        "--max_retries", type=int, default=DEFAULT_MAX_RETRIES, help="Retries per request on 429/5xx/connection errors (uploads: 429/503 and failed connects only)"
+    )
+    parser.add_argument("--http2", action="store_true", help='Use the HTTP/2 client (needs "httpx[http2]")')
+    parser.add_argument(
+        "--async",
+        dest="async_mode",
+        action="store_true",
+        help="asyncio pipeline: --workers validate/upload coroutines on one async client (needs aiohttp); "
+        "use hundreds of workers, e.g. --async --workers 200",
+    )
+    parser.add_argument(
+        "--name_cache", help=f"Extracted-name cache (SQLite) path (default {NAME_CACHE_PATH}, per shard with --shard)", default=None
+    )
+    parser.add_argument("--no_name_cache", action="store_true", help="Always re-parse PDFs for names")
+    parser.add_argument(
+        "--checkpoint", help=f"Completed-upload journal path (default {CHECKPOINT_PATH}, per shard with --shard)", default=None
+    )
+    parser.add_argument(
+        "--shard",
+        type=parse_shard,
+        default=None,
+        metavar="i/N",
+        help="Process only shard i of N (0-based) and write per-shard CSVs/checkpoint; "
+        "combine them with script_merge_upload_shards",
+    )
+    parser.add_argument(
+        "--shard_by",
+        choices=["job_id", "external_id"],
+        default="job_id",
+        help="job_id: whole jobs per shard; external_id: a stable hash of each resume's external_id",
+    )
+    parser.add_argument(
+        "--prevalidate",
+        action="store_true",
+        help="Validate every email of a job concurrently first, then upload only the ones that passed",
+    )
+    parser.add_argument(
+        "--no_resume",
+        action="store_true",
+        help="Process every file even if the journal/success CSV says it was uploaded (still journals)",
+    )
+    args = parser.parse_args(argv)
+    if args.async_mode and (args.prevalidate or args.http2):
+        parser.error("--prevalidate and --http2 are not supported with --async")
+
+    with _run_settings(args.api_base, stages_for(args.email_style, args.name_heuristic)):
+        interrupted = run_upload(args)
+    if interrupted:
+        raise SystemExit(130)
+
+
+def run_preset(email_style: str, jobs: dict[str, str], argv: Optional[list[str]] = None, **defaults):
+    """
+    Entry point for the per-environment preset scripts. `jobs` maps job folders to
+    job_obj_ids, each keyword in `defaults` becomes its --flag (e.g. base_dir=..., api_base=...),
+    and command-line arguments (sys.argv[1:] unless `argv` is given) go last, so they win.
+    """
+    preset = ["--email_style", email_style]
+    for flag, value in defaults.items():
+        preset += [f"--{flag}", str(value)]
+    for job_folder, job_obj_id in jobs.items():
+        preset += ["--job", f"{job_folder}={job_obj_id}"]
+    run_cli(preset + (sys.argv[1:] if argv is None else argv))
+
+
+def run_cli(argv: Optional[list[str]] = None):
+    """
+    main() for a command line. A KeyboardInterrupt out of main() (the second Ctrl-C)
+    comes after main() closed its outputs, so exit right away instead of joining
+    worker threads still stuck in requests.
+    """
+    try:
+        main(argv)
+    except KeyboardInterrupt:
+        sys.stdout.flush()
+        os._exit(130)
+
+
+def run_upload(args: argparse.Namespace) -> bool:
+    """
+    One upload run for main()'s parsed arguments. Output paths are worked out here
+    (per shard with --shard), never written back to the module, so main() can be
+    called again in the same process. Returns True if the run was interrupted.
+    """
+    workers = max(1, args.workers)
+    parse_workers = max(0, args.parse_workers)
+    parallel_jobs = max(1, args.parallel_jobs)
 
     base_dir = Path(args.base_dir)
     job_map_csv_path = Path(args.job_map_csv)
 
-    ensure_csv_header(SUCCESS_CSV_PATH, SUCCESS_HEADERS)
-    ensure_csv_header(FAILURES_CSV_PATH, FAIL_HEADERS)
+    outputs = run_outputs(args.shard)
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else outputs["checkpoint"]
+    name_cache_path = Path(args.name_cache) if args.name_cache else outputs["name_cache"]
+    # canonical outputs (merged shards) also count as done when resuming a shard
+    resume_seeds = [outputs["success"], SUCCESS_CSV_PATH, CHECKPOINT_PATH] if args.shard else [SUCCESS_CSV_PATH]
+    file_shard = args.shard if args.shard_by == "external_id" else None
+
+    ensure_csv_header(outputs["success"], SUCCESS_HEADERS)
+    ensure_csv_header(outputs["failures"], FAIL_HEADERS)
     ensure_progress_log_dir()
 
-    session = requests.Session()
+    # One open handle per output file for the whole run (opened first, so every log line
+    # lands in this run's progress log); also journals successes into the checkpoint
+    checkpoint = CheckpointJournal(checkpoint_path)
+    sink = ResultSink(
+        outputs["success"],
+        SUCCESS_HEADERS,
+        outputs["failures"],
+        FAIL_HEADERS,
+        progress_path=outputs["progress"],
+        checkpoint=checkpoint,
+    )
+    set_result_sink(sink)
+    parse_pool = name_cache = None
+    try:
+        if args.async_mode:
+            session = build_async_client(pool_size=workers, max_rps=args.max_rps, max_retries=max(0, args.max_retries))
+        else:
+            session = build_session(
+                pool_size=workers, max_rps=args.max_rps, max_retries=max(0, args.max_retries), http2=args.http2
+            )
 
-    job_rows = load_job_map(job_map_csv_path)
-    if not job_rows:
-        log_progress(f"RUN START | ERROR: No valid rows loaded from {job_map_csv_path}")
-        log_progress("Tip: Ensure your CSV has job_id and job_obj_id columns.")
-        log_progress("RUN END")
-        return
+        if args.jobs:
+            job_map = JobMap()
+            for job_id, job_obj_id in args.jobs:
+                job_map.add(job_id, job_obj_id, "")
+        else:
+            job_map = load_job_map(job_map_csv_path, snapshot=args.job_map_snapshot)
+        if not job_map:
+            log_progress(f"RUN START | ERROR: No valid rows loaded from {job_map_csv_path}")
+            log_progress("Tip: Ensure your CSV has job_id and job_obj_id columns.")
+            log_progress("RUN END")
+            return False
+
+        log_progress(f"JOB MAP | rows={job_map.rows_read} unique_jobs={len(job_map)} conflicts={len(job_map.conflicts)}")
+        for note in job_map.conflicts:
+            log_progress(f"[JOB MAP CONFLICT] {note}")
+
+        # Filter: one job only
+        job_rows = job_map.select(
+            job_id=normalize_job_id(args.job_id) if args.job_id else None,
+            job_obj_id=args.job_obj_id.strip() if args.job_obj_id else None,
+        )
 
-    # Filter: one job only
-    if args.job_obj_id:
-        job_rows = [r for r in job_rows if (r.get("job_obj_id") or "") == args.job_obj_id.strip()]
-    if args.job_id:
-        jid = normalize_job_id(args.job_id)
-        job_rows = [r for r in job_rows if (r.get("job_id") or "") == jid]
+        if not job_rows:
+            log_progress("RUN START | ERROR: No job matched your filter (--job_obj_id/--job_id).")
+            log_progress("RUN END")
+            return False
 
-    if not job_rows:
-        log_progress("RUN START | ERROR: No job matched your filter (--job_obj_id/--job_id).")
-        log_progress("RUN END")
-        return
+        if args.shard:
+            if args.shard_by == "job_id":
+                job_rows = [r for r in job_rows if in_shard(r["job_id"], args.shard)]
+            log_progress(f"SHARD {args.shard[0]}/{args.shard[1]} by {args.shard_by} | jobs={len(job_rows)}")
 
-    log_progress(f"RUN START | BASE_DIR={base_dir} | API_BASE={API_BASE} | jobs_to_run={len(job_rows)}")
+        log_progress(
+            f"RUN START | BASE_DIR={base_dir} | API_BASE={API_BASE} | jobs_to_run={len(job_rows)} | workers={workers} | parallel_jobs={parallel_jobs} | parse_workers={parse_workers} | mode={'async' if args.async_mode else 'threads'}"
+        )
 
-    grand_total = grand_ok = grand_fail = grand_validate_fail = grand_parse_fail = 0
+        grand_total = grand_ok = grand_fail = grand_validate_fail = grand_parse_fail = grand_skipped = 0
 
-    for r in job_rows:
-        t, ok, fail, vfail, pফail = run_one_job(
-            base_dir=base_dir,
-            job_id=r["job_id"],
-            job_obj_id=r["job_obj_id"],
-            job_title=r.get("job_title", ""),
-            session=session,
+        if not args.no_resume:
+            done = checkpoint.load(seed_csv_paths=resume_seeds)
+            log_progress(
+                f"RESUME | {done} completed uploads loaded from {checkpoint_path} + {' + '.join(map(str, resume_seeds))}"
+            )
+
+        # (email, job_obj_id) -> failed validate result, so a rejected pair is not sent again
+        validation_cache: dict = {}
+
+        # workers ignore SIGINT: a Ctrl-C sent to the process group must reach only this process,
+        # which drains in-flight uploads, instead of killing the pool under it
+        parse_pool = (
+            ProcessPoolExecutor(max_workers=parse_workers, initializer=signal.signal, initargs=(signal.SIGINT, signal.SIG_IGN))
+            if parse_workers
+            else None
         )
-        grand_total += t
-        grand_ok += ok
-        grand_fail += fail
-        grand_validate_fail += vfail
-        grand_parse_fail += pফail
-
-    log_progress("====== GRAND SUMMARY ======")
-    log_progress(f"Total processed: {grand_total}")
-    log_progress(f"Uploaded OK:     {grand_ok}")
-    log_progress(f"Upload Failed:   {grand_fail}")
-    log_progress(f"Validate Failed: {grand_validate_fail}")
-    log_progress(f"Parse Failed:    {grand_parse_fail}")
-    log_progress(f"Success CSV: {SUCCESS_CSV_PATH}")
-    log_progress(f"Failures CSV: {FAILURES_CSV_PATH}")
-    log_progress(f"Progress log: {PROGRESS_LOG_PATH}")
-    log_progress("RUN END")
+        name_cache = None if args.no_name_cache else NameCache(name_cache_path, _STAGES.name_cache_version)
+        if parallel_jobs > 1:
+            sized = order_largest_first(base_dir, job_rows, checkpoint, file_shard)
+            job_rows = [r for r, _ in sized]
+            order = ", ".join(f"{normalize_job_folder(r['job_id'])}={n}" for r, n in sized[:10])
+            log_progress(f"SCHEDULE | largest first: {order}{' ...' if len(sized) > 10 else ''}")
+
+        interrupted = False
+        if args.async_mode:
+            job_results, interrupted = run_jobs_async(
+                job_rows,
+                session,
+                parallel_jobs=parallel_jobs,
+                base_dir=base_dir,
+                workers=workers,
+                parse_pool=parse_pool,
+                extractors=max(1, parse_workers),
+                parse_ahead=max(1, parse_workers * PARSE_QUEUE_PER_WORKER),
+                name_cache=name_cache,
+                checkpoint=checkpoint,
+                validation_cache=validation_cache,
+                shard=file_shard,
+            )
+        else:
+            # every job gets `workers` threads; the shared session caps requests in flight
+            # at `workers` overall, so running jobs share it and a lone job can use all of it
+            def run_job(r: dict, stop: threading.Event):
+                return run_one_job(
+                    base_dir=base_dir,
+                    job_id=r["job_id"],
+                    job_obj_id=r["job_obj_id"],
+                    job_title=r.get("job_title", ""),
+                    session=session,
+                    workers=workers,
+                    parse_pool=parse_pool,
+                    parse_ahead=max(1, parse_workers * PARSE_QUEUE_PER_WORKER),
+                    name_cache=name_cache,
+                    checkpoint=checkpoint,
+                    prevalidate=args.prevalidate,
+                    validation_cache=validation_cache,
+                    shard=file_shard,
+                    stop=stop,
+                )
+
+            job_results, interrupted = run_jobs_threaded(job_rows, run_job, parallel_jobs)
+        for t, ok, fail, vfail, pfail, skipped in job_results:
+            grand_total += t
+            grand_ok += ok
+            grand_fail += fail
+            grand_validate_fail += vfail
+            grand_parse_fail += pfail
+            grand_skipped += skipped
+
+        log_progress("====== GRAND SUMMARY ======")
+        log_progress(f"Total processed: {grand_total}")
+        log_progress(f"Uploaded OK:     {grand_ok}")
+        log_progress(f"Upload Failed:   {grand_fail}")
+        log_progress(f"Validate Failed: {grand_validate_fail}")
+        log_progress(f"Parse Failed:    {grand_parse_fail}")
+        log_progress(f"Already Done:    {grand_skipped}")
+        log_progress(f"Success CSV: {outputs['success']}")
+        log_progress(f"Failures CSV: {outputs['failures']}")
+        log_progress(f"Progress log: {outputs['progress']}")
+        log_progress(f"Checkpoint: {checkpoint_path}")
+        if name_cache is not None:
+            log_progress(f"Name cache: hits={name_cache.hits} misses={name_cache.misses} | {name_cache_path}")
+        log_progress(f"Name parse: {_PARSE_STATS.summary()}")
+        log_progress(f"HTTP: {session_stats(session)}")
+        log_progress("RUN INTERRUPTED" if interrupted else "RUN END")
+        return interrupted
+    finally:
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+        if name_cache is not None:
+            name_cache.close()
+        set_result_sink(None)
+        sink.close()
+        checkpoint.close()
 
 
 if __name__ == "__main__":
-    main()
+    run_cli()
@@ -1,4 +1,8 @@
 import csv
+import os
+from pathlib import Path
+
+from csv_loader import load_rows, norm_key
 
 def make_fake_email(profile_id):
     return f"fake-for-warden-{profile_id}@fake-domain.com"
@@ -49,22 +53,67 @@ def update_csv_with_profile_emails(input_csv, output_csv):
 
 def fetch_details_from_csv(input_csv):
     jobs_name_description = []
-    with open(input_csv, newline="", encoding="utf-8") as infile:
-
-        reader = csv.DictReader(infile)
-        for row in reader:
-            # Fetch job data (for Greenhouse later)
-            job_title = row.get("job_title", "").strip()
-            job_description = row.get("job_description", "").strip()
-            job_id = row.get("greenhouse_job_id", "").strip()
-            if job_id:
-                jobs_name_description.append({"job_title": job_title, "job_description": job_description, "job_id": job_id})
-            else:
-                jobs_name_description.append({"job_title": job_title, "job_description": job_description})
-        return jobs_name_description[1]
+    # single streaming pass over just the three columns we need
+    rows = load_rows(input_csv, ["job_title", "job_description", "greenhouse_job_id"])
+    for job_title, job_description, job_id in rows:
+        # Fetch job data (for Greenhouse later)
+        if job_id:
+            jobs_name_description.append({"job_title": job_title, "job_description": job_description, "job_id": job_id})
+        else:
+            jobs_name_description.append({"job_title": job_title, "job_description": job_description})
+    return jobs_name_description[1]
+
+
+# print(fetch_details_from_csv(input_csv="/home/asim/Desktop/clara-dataset-upload/clara_dataset/final_job_dataset.csv"))
+
+
+def update_csv_with_greenhouse_job_ids(input_csv, output_csv, job_ids_by_title):
+    """
+    One pass over the CSV for any number of jobs: fills greenhouse_job_id for every
+    row whose job_title is in job_ids_by_title and has no id yet.
+    Header names are matched like load_rows does (BOM, case and separators ignored), so
+    the rows it reads are the rows that get updated; raises ValueError if there is no
+    job_title column.
+    The output is written to a temp file and renamed into place, so input_csv may
+    equal output_csv. Returns the number of rows updated.
+    """
+    ids = {title.strip(): str(job_id) for title, job_id in job_ids_by_title.items()}
+    output_csv = Path(output_csv)
+    tmp_csv = output_csv.with_name(output_csv.name + ".tmp")
+    updated = 0
+
+    with open(input_csv, newline="", encoding="utf-8-sig") as infile:
+        reader = csv.reader(infile)
+        header = next(reader, None) or []
+        columns = {}
+        for i, name in enumerate(header):
+            columns.setdefault(norm_key(name), i)
+        if "job_title" not in columns:
+            raise ValueError(f"CSV must contain a job_title column. Found: {header} ({input_csv})")
+        title_col = columns["job_title"]
+        id_col = columns.get("greenhouse_job_id")
+        if id_col is None:
+            header = header + ["greenhouse_job_id"]
+            id_col = len(header) - 1
+
+        with open(tmp_csv, "w", newline="", encoding="utf-8") as outfile:
+            writer = csv.writer(outfile)
+            writer.writerow(header)
+
+            for row in reader:
+                if not row:
+                    continue
+                row = row + [""] * (len(header) - len(row))
+                # Match the job row; only update if not already set
+                job_id = ids.get(row[title_col].strip())
+                if job_id and not row[id_col].strip():
+                    row[id_col] = job_id
+                    updated += 1
 
+                writer.writerow(row)
 
-print(fetch_details_from_csv(input_csv="/home/asim/Desktop/clara-dataset-upload/clara_dataset/final_job_dataset.csv"))
+    os.replace(tmp_csv, output_csv)
+    return updated
 
 
 def update_csv_with_greenhouse_job_id(
@@ -73,23 +122,4 @@ def update_csv_with_greenhouse_job_id(
     job_title,
     greenhouse_job_id
 ):
-    with open(input_csv, newline="", encoding="utf-8") as infile, \
-         open(output_csv, "w", newline="", encoding="utf-8") as outfile:
-
-        reader = csv.DictReader(infile)
-
-        fieldnames = reader.fieldnames
-        if "greenhouse_job_id" not in fieldnames:
-            fieldnames = fieldnames + ["greenhouse_job_id"]
-
-        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-        writer.writeheader()
-
-        for row in reader:
-            # Match the job row
-            if row.get("job_title", "").strip() == job_title.strip():
-                # Only update if not already set
-                if not row.get("greenhouse_job_id", "").strip():
-                    row["greenhouse_job_id"] = str(greenhouse_job_id)
-
-            writer.writerow(row)
+    update_csv_with_greenhouse_job_ids(input_csv, output_csv, {job_title: greenhouse_job_id})
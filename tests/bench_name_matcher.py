@@ -0,0 +1,58 @@
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Per-line cost of the name rules, legacy (tests/legacy_name_rules.py) vs name_matcher:
+#   python tests/bench_name_matcher.py [--lines 150000]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import conftest  # noqa: E402,F401  (puts the scripts on sys.path)
+import legacy_name_rules as legacy  # noqa: E402
+import updated_sjm_script_finalized as uploader  # noqa: E402
+from test_name_matcher import CORPUS, random_lines  # noqa: E402
+
+WORDS = "managed developed python team led data systems analysis project delivered improved jane doe smith".split()
+
+
+def resume_lines(n: int, seed: int = 5) -> list[str]:
+    # title-cased body lines: mostly non-names that pass the cheap checks
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 6))).title() for _ in range(n)]
+
+
+def per_line_us(fn, lines: list[str], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        for line in lines:
+            fn(line)
+        best = min(best, time.perf_counter() - t)
+    return best / len(lines) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the name-line rules, legacy vs name_matcher.")
+    parser.add_argument("--lines", type=int, default=150000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    sets = {
+        "resume-like": resume_lines(args.lines),
+        "random": random_lines(args.lines),
+        "corpus": CORPUS * max(1, args.lines // len(CORPUS)),
+    }
+    rules = [
+        ("first_page", legacy.is_reasonable_name, uploader.is_reasonable_name),
+        ("two_pages", legacy.find_name_in_text, uploader.name_from_text_two_pages),
+    ]
+    print(f"{'rule':<11} {'lines':<12} {'legacy us':>10} {'new us':>8} {'speedup':>8}")
+    for rule, old_fn, new_fn in rules:
+        for name, lines in sets.items():
+            old_us = per_line_us(old_fn, lines, args.repeat)
+            new_us = per_line_us(new_fn, lines, args.repeat)
+            print(f"{rule:<11} {name:<12} {old_us:>10.2f} {new_us:>8.2f} {old_us / new_us:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import argparse
+import io
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Wall time of a full upload run against the stub API with injected latency, sequential
+# vs the bounded worker pool (and asyncio), with the most calls ever queued on the pool:
+#   python tests/bench_upload_run.py [--files 40] [--latency 0.05]
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import conftest  # noqa: E402,F401  (puts the scripts on sys.path)
+import updated_sjm_script_finalized as uploader  # noqa: E402
+from conftest import make_job_folder  # noqa: E402
+from test_upload_run import counting_pools, timed_run  # noqa: E402
+
+
+def use_outputs(out: Path):
+    # what the uploader_outputs fixture does for the tests
+    uploader.OUT_DIR = out
+    uploader.SUCCESS_CSV_PATH = out / "profile_upload_success.csv"
+    uploader.FAILURES_CSV_PATH = out / "profile_upload_failures.csv"
+    uploader.PROGRESS_LOG_PATH = out / "progress.log"
+    uploader.NAME_CACHE_PATH = out / "name_cache.sqlite3"
+    uploader.CHECKPOINT_PATH = out / "upload_checkpoint.csv"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the upload run, sequential vs bounded worker pool.")
+    parser.add_argument("--files", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the stub API takes per reply")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    modes = [
+        ("sequential", []),
+        ("workers=2", ["--workers", "2"]),
+        ("workers=4", ["--workers", "4"]),
+        ("workers=8", ["--workers", "8"]),
+        ("async=8", ["--async", "--workers", "8"]),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        base_dir = Path(tmp) / "resumes"
+        out = Path(tmp) / "logs"
+        make_job_folder(base_dir, "1393", args.files)
+        use_outputs(out)
+
+        print(f"{'mode':<11} {'files':>6} {'seconds':>8} {'speedup':>8} {'max pending':>12}")
+        baseline = None
+        for name, extra in modes:
+            best = float("inf")
+            peak = 0
+            for _ in range(args.repeat):
+                # the run's progress lines would bury the table
+                with counting_pools() as pools, redirect_stdout(io.StringIO()):
+                    best = min(best, timed_run(base_dir, out, args.latency, *extra))
+                peak = max([peak] + [p.peak for p in pools])
+            baseline = baseline or best
+            print(f"{name:<11} {args.files:>6} {best:>8.2f} {baseline / best:>7.1f}x {peak or '-':>12}")
+
+
+if __name__ == "__main__":
+    main()
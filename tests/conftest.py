@@ -0,0 +1,91 @@
+import csv
+import email
+import email.policy
+import sys
+from pathlib import Path
+
+import pytest
+
+# The scripts import each other as flat sibling modules
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "greenhouse_dataset_upload_scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
+
+JOB_OBJ_ID = "6970c43309b0d28599ec8071"
+
+
+def make_pdf(path: Path, lines: list[str]):
+    """
+    Smallest one-page PDF pdfplumber reads text from: each line drawn in Helvetica.
+    """
+    content = "BT /F1 14 Tf 72 720 Td " + " ".join(f"({ln}) Tj 0 -20 Td" for ln in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content)} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("ascii")
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode("ascii")
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("ascii")
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_bytes(out)
+
+
+def make_job_folder(base_dir: Path, job_id: str, count: int) -> list[Path]:
+    # job_<id>/app_pcf_<id>_<resume>_0.pdf, one distinct name per resume
+    paths = []
+    for i in range(count):
+        path = base_dir / f"job_{job_id}" / f"app_pcf_{job_id}_{100000 + i}_0.pdf"
+        make_pdf(path, ["Curriculum Vitae", f"Jane Doe{'e' * i}", "Email: jane@example.com"])
+        paths.append(path)
+    return paths
+
+
+def parse_multipart(content_type: str, body: bytes) -> dict:
+    """
+    {field name: (filename or None, payload bytes)} for a multipart/form-data body.
+    """
+    msg = email.message_from_bytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode("ascii") + body, policy=email.policy.HTTP
+    )
+    assert msg.is_multipart() and not msg.defects, msg.defects
+    return {
+        part.get_param("name", header="content-disposition"): (part.get_filename(), part.get_payload(decode=True))
+        for part in msg.iter_parts()
+    }
+
+
+def read_csv(path: Path) -> list[dict]:
+    if not path.exists():
+        return []
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.fixture
+def uploader_outputs(tmp_path, monkeypatch):
+    """
+    Points the uploader's success/failure CSVs, progress log, checkpoint and name
+    cache at tmp_path/logs; returns that directory.
+    """
+    import updated_sjm_script_finalized as uploader
+
+    out = tmp_path / "logs"
+    monkeypatch.setattr(uploader, "OUT_DIR", out)
+    monkeypatch.setattr(uploader, "SUCCESS_CSV_PATH", out / "profile_upload_success.csv")
+    monkeypatch.setattr(uploader, "FAILURES_CSV_PATH", out / "profile_upload_failures.csv")
+    monkeypatch.setattr(uploader, "PROGRESS_LOG_PATH", out / "progress.log")
+    monkeypatch.setattr(uploader, "NAME_CACHE_PATH", out / "name_cache.sqlite3")
+    monkeypatch.setattr(uploader, "CHECKPOINT_PATH", out / "upload_checkpoint.csv")
+    return out
@@ -0,0 +1,94 @@
+import re
+from typing import Optional, Tuple
+
+# The name rules as the scripts had them before name_matcher, logic unchanged. The
+# precompiled matcher must agree with them (see test_name_matcher / bench_name_matcher).
+
+# updated_sjm_script_finalized: first-page rule
+BAD_KEYWORDS = {
+    "summary", "experience", "education", "skills", "certifications", "projects",
+    "profile", "objective", "contact", "portfolio", "linkedin",
+    "phone", "email", "address", "curriculum", "vitae", "resume", "cv"
+}
+
+
+def normalize_line(line: str) -> str:
+    line = re.sub(r"[^A-Za-z\s\-\']", " ", line)
+    line = re.sub(r"\s+", " ", line).strip()
+    return line
+
+
+def is_reasonable_name(line: str) -> bool:
+    if not line or len(line) > 60:
+        return False
+    if "@" in line or "|" in line:
+        return False
+    if any(ch.isdigit() for ch in line):
+        return False
+    low = line.lower()
+    if any(k in low for k in BAD_KEYWORDS):
+        return False
+    cleaned = normalize_line(line)
+    parts = cleaned.split()
+    if not (2 <= len(parts) <= 4):
+        return False
+    if any(len(p) < 2 for p in parts):
+        return False
+    return True
+
+
+def name_from_text(text: str) -> Optional[Tuple[str, str]]:
+    # first reasonable line among the first 20 non-empty ones
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    for ln in lines[:20]:
+        if is_reasonable_name(ln):
+            cleaned = normalize_line(ln)
+            parts = cleaned.split()
+            return (parts[0].title(), " ".join(parts[1:]).title())
+    return None
+
+
+# working_sjm_script_with_logs: two-page rule
+NAME_BAD_KEYWORDS = ["resume", "curriculum", "vitae", "cv", "email", "phone", "contact", "address", "linkedin", "objective", "summary"]
+
+
+def is_name_candidate(line: str) -> bool:
+    line = line.strip()
+    if not line:
+        return False
+    if len(line) > 60:
+        return False
+
+    low = line.lower()
+    if any(k in low for k in NAME_BAD_KEYWORDS):
+        return False
+
+    cleaned = re.sub(r"[^A-Za-z\s\-\']", "", line)
+    if len(cleaned) < 3:
+        return False
+
+    parts = cleaned.split()
+    if not (2 <= len(parts) <= 4):
+        return False
+
+    if any(len(p) < 2 for p in parts):
+        return False
+
+    return True
+
+
+def find_name_in_text(text: str) -> tuple[str, str] | None:
+    lines = [ln.strip() for ln in text.splitlines()]
+    lines = [ln for ln in lines if ln]
+
+    for ln in lines[:30]:
+        candidate = re.sub(r"[^A-Za-z\s\-\']", " ", ln).strip()
+        candidate = re.sub(r"\s+", " ", candidate)
+
+        if is_name_candidate(candidate):
+            parts = candidate.split()
+            first = parts[0].title()
+            last = " ".join(parts[1:]).title()
+            return first, last
+
+    return None
@@ -0,0 +1,137 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, NamedTuple, Optional
+
+
+class Recorded(NamedTuple):
+    method: str
+    path: str
+    headers: dict
+    body: bytes
+
+
+class Reply(NamedTuple):
+    status: Optional[int] = 200
+    body: object = b""
+    headers: Optional[dict] = None
+
+
+class StubServer:
+    """
+    Local HTTP/1.1 server on a free port, run on a background thread.
+
+    Every request is recorded (see `requests`). Replies come from the queue first
+    (queue(...), one per request, in order), then from `handler(recorded) -> Reply`;
+    `delay` seconds are slept before each reply. A dict/list body is sent as JSON,
+    and Reply(None) drops the connection without a response.
+    """
+
+    def __init__(self, handler: Optional[Callable[[Recorded], Reply]] = None, delay: float = 0.0):
+        self.handler = handler or (lambda req: Reply())
+        self.delay = delay
+        self.requests: list[Recorded] = []
+        self._queued: list[Reply] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def queue(self, *replies: Reply):
+        with self._lock:
+            self._queued.extend(replies)
+
+    def matching(self, fragment: str) -> list[Recorded]:
+        with self._lock:
+            return [r for r in self.requests if fragment in r.path]
+
+    def _reply(self, req: Recorded) -> Reply:
+        with self._lock:
+            self.requests.append(req)
+            if self._queued:
+                return self._queued.pop(0)
+        return self.handler(req)
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _serve(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                reply = stub._reply(Recorded(self.command, self.path, dict(self.headers), body))
+                if stub.delay:
+                    time.sleep(stub.delay)
+                if reply.status is None:
+                    # hang up without answering, after the request was read
+                    self.close_connection = True
+                    return
+                payload = reply.body
+                if isinstance(payload, (dict, list)):
+                    payload = json.dumps(payload).encode("utf-8")
+                self.send_response(reply.status)
+                for name, value in (reply.headers or {}).items():
+                    self.send_header(name, str(value))
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = _serve
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def apply_job_api(rejected_emails=()) -> Callable[[Recorded], Reply]:
+    """
+    Handler for the apply-job endpoints the uploader calls, like the real API:
+    validate-email fails for `rejected_emails` and for every email already uploaded,
+    and a second upload with the same email is refused with 409.
+    """
+    uploaded = set()
+    lock = threading.Lock()
+
+    def handle(req: Recorded) -> Reply:
+        if "validate-email" in req.path:
+            email = json.loads(req.body)["email"]
+            with lock:
+                taken = email in rejected_emails or email in uploaded
+            if taken:
+                return Reply(400, {"error": "Email already exists."})
+            return Reply(200, {"message": "ok"})
+        if "upload-candidate-resume" in req.path:
+            email = _form_field(req, "email")
+            with lock:
+                duplicate = email in uploaded
+                uploaded.add(email)
+            if duplicate:
+                return Reply(409, {"error": "dup"})
+            return Reply(200, {"message": "uploaded", "data": {"candidate_obj_id": "c" * 24, "application_obj_id": "a" * 24}})
+        return Reply(404, {"error": "not found"})
+
+    return handle
+
+
+def _form_field(req: Recorded, name: str) -> str:
+    # value of a text field in a multipart/form-data body
+    marker = f'Content-Disposition: form-data; name="{name}"\r\n\r\n'.encode("utf-8")
+    start = req.body.index(marker) + len(marker)
+    return req.body[start:req.body.index(b"\r\n", start)].decode("utf-8")
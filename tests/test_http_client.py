@@ -0,0 +1,269 @@
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+import requests
+
+from http_client import (
+    RateLimitBudget,
+    RetryPolicy,
+    Throttle,
+    ThrottledAdapter,
+    create_async_client,
+    create_session,
+    parse_retry_after,
+)
+from stub_server import Reply, StubServer
+
+
+def throttled_session(retry: RetryPolicy, budget: RateLimitBudget = None) -> requests.Session:
+    session = requests.Session()
+    adapter = ThrottledAdapter(throttle=Throttle(retry=retry, budget=budget), pool_maxsize=16)
+    session.mount("http://", adapter)
+    return session
+
+
+def fast_retry(max_retries: int) -> RetryPolicy:
+    return RetryPolicy(max_retries=max_retries, backoff_base=0.01)
+
+
+def test_retries_until_success():
+    with StubServer() as stub:
+        stub.queue(Reply(503), Reply(502), Reply(429))
+        session = throttled_session(fast_retry(3))
+        resp = session.post(f"{stub.url}/x", json={"a": 1})
+
+    assert resp.status_code == 200
+    assert len(stub.requests) == 4
+    assert {r.body for r in stub.requests} == {b'{"a": 1}'}
+    assert session.get_adapter("http://").throttle.stats == {"requests": 4, "retries": 3, "overloads": 3, "gave_up": 0}
+
+
+def test_gives_up_with_last_response():
+    with StubServer(lambda req: Reply(503)) as stub:
+        session = throttled_session(fast_retry(2))
+        resp = session.get(f"{stub.url}/x")
+
+    assert resp.status_code == 503
+    assert len(stub.requests) == 3
+    assert session.get_adapter("http://").throttle.stats["gave_up"] == 1
+
+
+def test_client_errors_are_not_retried():
+    with StubServer(lambda req: Reply(400, {"error": "bad"})) as stub:
+        resp = throttled_session(fast_retry(3)).get(f"{stub.url}/x")
+
+    assert resp.status_code == 400
+    assert len(stub.requests) == 1
+
+
+def test_retry_after_is_honoured():
+    with StubServer() as stub:
+        stub.queue(Reply(429, headers={"Retry-After": "0.3"}))
+        started = time.monotonic()
+        resp = throttled_session(fast_retry(1)).get(f"{stub.url}/x")
+        elapsed = time.monotonic() - started
+
+    assert resp.status_code == 200
+    assert elapsed >= 0.3
+
+
+def test_connection_errors_are_retried_then_raised():
+    with StubServer() as stub:
+        url = f"{stub.url}/x"
+    # the port is closed now
+    session = throttled_session(fast_retry(2))
+    with pytest.raises(requests.exceptions.ConnectionError):
+        session.get(url)
+    assert session.get_adapter("http://").throttle.stats == {"requests": 3, "retries": 2, "overloads": 0, "gave_up": 1}
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("2.5") == 2.5
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 28 <= parse_retry_after(later) <= 30
+
+
+class Budgeted:
+    """
+    Handler enforcing `limit` requests per `window` seconds, Harvest style:
+    X-RateLimit-* headers on every reply and a 429 once the window is spent.
+    """
+
+    def __init__(self, limit: int, window: float):
+        self.limit = limit
+        self.window = window
+        self.rejected = 0
+        self._start = time.monotonic()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, req):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._start >= self.window:
+                self._start, self._used = now, 0
+            headers = {"X-RateLimit-Limit": self.limit}
+            if self._used >= self.limit:
+                self.rejected += 1
+                return Reply(429, headers={**headers, "X-RateLimit-Remaining": 0})
+            self._used += 1
+            return Reply(200, headers={**headers, "X-RateLimit-Remaining": self.limit - self._used})
+
+
+def send_concurrently(session, url: str, count: int, threads: int = 8) -> list[int]:
+    statuses = []
+    lock = threading.Lock()
+    jobs = iter(range(count))
+
+    def worker():
+        for _ in jobs:
+            status = session.get(url).status_code
+            with lock:
+                statuses.append(status)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return statuses
+
+
+def test_budget_keeps_under_the_server_limit():
+    handler = Budgeted(limit=10, window=0.5)
+    budget = RateLimitBudget(window=0.5)
+    with StubServer(handler) as stub:
+        started = time.monotonic()
+        statuses = send_concurrently(throttled_session(RetryPolicy(max_retries=0), budget), f"{stub.url}/x", 25)
+        elapsed = time.monotonic() - started
+
+    assert statuses == [200] * 25
+    assert handler.rejected == 0
+    assert budget.limit == 10
+    # 25 requests at 10 per half second cannot finish inside two windows
+    assert elapsed >= 1.0
+
+
+def test_budget_stops_pacing_without_headers():
+    budget = RateLimitBudget(window=10, probe_responses=3)
+    with StubServer(delay=0.1) as stub:
+        started = time.monotonic()
+        statuses = send_concurrently(throttled_session(RetryPolicy(max_retries=0), budget), f"{stub.url}/x", 24)
+        elapsed = time.monotonic() - started
+
+    assert statuses == [200] * 24
+    assert budget.limit is None
+    # 3 probes one at a time, then 8 in flight; serialized it would take 2.4 s
+    assert elapsed < 1.8
+
+
+def test_budget_picks_up_headers_after_probing():
+    budget = RateLimitBudget(window=10, probe_responses=2)
+    for _ in range(2):
+        budget.acquire()
+        budget.update({})
+    budget.acquire()
+    budget.update({"X-RateLimit-Limit": "50", "X-RateLimit-Remaining": "49"})
+    assert budget.limit == 50
+
+
+CLIENTS = ["requests", "httpx", "aiohttp"]
+
+
+def post_upload(client: str, url: str, max_retries: int = 2):
+    """
+    POSTs to `url` through the client create_session/create_async_client builds with
+    "/upload" marked non-idempotent; returns (status code or raised error, throttle stats).
+    """
+    if client == "httpx":
+        pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+    if client == "aiohttp":
+        pytest.importorskip("aiohttp")
+
+        async def post():
+            session = create_async_client(max_retries=max_retries, non_idempotent_paths=("/upload",))
+            session.throttle.retry = fast_retry(max_retries)
+            try:
+                return (await session.post(url, data=b"resume")).status_code
+            except Exception as e:
+                return e
+            finally:
+                await session.aclose()
+                stats.update(session.throttle.stats)
+
+        stats = {}
+        return asyncio.run(post()), stats
+
+    session = create_session(max_retries=max_retries, http2=client == "httpx", non_idempotent_paths=("/upload",))
+    throttle = session._transport.throttle if client == "httpx" else session.get_adapter("http://").throttle
+    throttle.retry = fast_retry(max_retries)
+    try:
+        outcome = session.post(url, content=b"resume") if client == "httpx" else session.post(url, data=b"resume")
+        outcome = outcome.status_code
+    except Exception as e:
+        outcome = e
+    finally:
+        session.close()
+    return outcome, throttle.stats
+
+
+@pytest.mark.parametrize("client", CLIENTS)
+@pytest.mark.parametrize("status", [500, 502, 504])
+def test_upload_not_retried_after_server_error(client, status):
+    with StubServer(lambda req: Reply(status)) as stub:
+        outcome, _ = post_upload(client, f"{stub.url}/upload/1")
+
+    assert outcome == status
+    assert len(stub.requests) == 1
+
+
+@pytest.mark.parametrize("client", CLIENTS)
+def test_upload_retried_when_turned_away(client):
+    with StubServer() as stub:
+        stub.queue(Reply(429), Reply(503))
+        outcome, _ = post_upload(client, f"{stub.url}/upload/1")
+
+    assert outcome == 200
+    assert len(stub.requests) == 3
+
+
+@pytest.mark.parametrize("client", CLIENTS)
+def test_upload_not_retried_after_dropped_connection(client):
+    with StubServer() as stub:
+        stub.queue(Reply(None))
+        outcome, stats = post_upload(client, f"{stub.url}/upload/1")
+
+    # the server read the body before hanging up, so it may have stored the upload
+    assert isinstance(outcome, Exception)
+    assert len(stub.requests) == 1
+    assert stats["retries"] == 0
+
+
+@pytest.mark.parametrize("client", CLIENTS)
+def test_upload_retried_when_connect_fails(client):
+    with StubServer() as stub:
+        url = f"{stub.url}/upload/1"
+    # the port is closed now
+    outcome, stats = post_upload(client, url)
+
+    assert isinstance(outcome, Exception)
+    assert stats["requests"] == 3
+    assert stats["retries"] == 2
+
+
+@pytest.mark.parametrize("client", CLIENTS)
+def test_other_requests_still_retried(client):
+    with StubServer() as stub:
+        stub.queue(Reply(500), Reply(None))
+        outcome, _ = post_upload(client, f"{stub.url}/validate-email/")
+
+    assert outcome == 200
+    assert len(stub.requests) == 3
@@ -0,0 +1,38 @@
+import pytest
+
+import csv_loader
+import updated_sjm_script_finalized as uploader
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(csv_loader, "SNAPSHOT_DIR", tmp_path / "snapshots")
+
+
+def write_job_map(path, rows: int, tail: bytes = b""):
+    lines = [b"Job ID,Job Obj ID,Job Title"]
+    lines += [f"job_{1000 + i},{i:024x},Title {i}".encode("utf-8") for i in range(rows)]
+    path.write_bytes(b"\n".join(lines) + b"\n" + tail)
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_loads_every_job(tmp_path, snapshot):
+    path = tmp_path / "apps.csv"
+    write_job_map(path, 500)
+    job_map = uploader.load_job_map(path, snapshot=snapshot)
+    assert len(job_map) == 500
+    assert job_map.select(job_id="1000") == [{"job_id": "1000", "job_obj_id": f"{0:024x}", "job_title": "Title 0"}]
+
+
+@pytest.mark.parametrize("snapshot", [False, True])
+def test_bad_byte_mid_file_raises(tmp_path, snapshot):
+    path = tmp_path / "apps.csv"
+    write_job_map(path, 20000, tail=b"job_9,\xff\xfe,broken\n")
+    with pytest.raises(UnicodeDecodeError):
+        uploader.load_job_map(path, snapshot=snapshot)
+
+
+def test_missing_header_gives_empty_map(tmp_path):
+    path = tmp_path / "apps.csv"
+    path.write_bytes(b"")
+    assert len(uploader.load_job_map(path)) == 0
@@ -0,0 +1,95 @@
+import asyncio
+import os
+
+import pytest
+
+from conftest import parse_multipart
+from http_client import RetryPolicy, create_async_client, create_session
+from multipart import CHUNK_SIZE, MultipartFileBody, post_multipart, post_multipart_async
+from stub_server import Reply, StubServer
+
+FIELDS = {"first_name": "Jane", "last_name": "O'Neil \"JD\"", "email": "jane@example.com"}
+
+
+@pytest.fixture
+def resume(tmp_path):
+    # a few chunks plus a partial one, so reads cross the prefix/file/suffix edges
+    path = tmp_path / "app_pcf_1393_100225_0.pdf"
+    path.write_bytes(os.urandom(3 * CHUNK_SIZE + 123))
+    return path
+
+
+def test_wire_format(resume):
+    with MultipartFileBody(FIELDS, "file", resume, "application/pdf") as body:
+        raw = body.read()
+        assert len(raw) == len(body) == int(body.headers["Content-Length"])
+        parts = parse_multipart(body.content_type, raw)
+
+    assert parts == {
+        "first_name": (None, b"Jane"),
+        "last_name": (None, b"O'Neil \"JD\""),
+        "email": (None, b"jane@example.com"),
+        "file": (resume.name, resume.read_bytes()),
+    }
+
+
+def test_reads_and_iteration_agree(resume):
+    with MultipartFileBody(FIELDS, "file", resume) as body:
+        whole = body.read()
+        assert body.read() == b""
+        body.seek(0)
+        assert b"".join(iter(lambda: body.read(777), b"")) == whole
+        assert b"".join(body) == whole
+        # iteration starts over even after a partial read
+        body.seek(0)
+        body.read(10)
+        assert b"".join(body) == whole
+
+
+def test_only_rewinds_to_start(resume):
+    with MultipartFileBody(FIELDS, "file", resume) as body:
+        with pytest.raises(ValueError):
+            body.seek(5)
+
+
+@pytest.mark.parametrize("http2", [False, True], ids=["requests", "httpx"])
+def test_retry_resends_whole_body(resume, http2):
+    if http2:
+        pytest.importorskip("httpx")
+        pytest.importorskip("h2")
+    with StubServer() as stub:
+        stub.queue(Reply(503), Reply(503))
+        session = create_session(max_retries=2, http2=http2)
+        # same throttle the session was built with, minus the real backoff delays
+        throttle = session._transport.throttle if http2 else session.get_adapter("http://").throttle
+        throttle.retry = RetryPolicy(max_retries=2, backoff_base=0.01)
+        with MultipartFileBody(FIELDS, "file", resume) as body:
+            resp = post_multipart(session, f"{stub.url}/upload", body)
+            body.seek(0)
+            expected = body.read()
+        session.close()
+
+    assert resp.status_code == 200
+    assert [r.body for r in stub.requests] == [expected] * 3
+
+
+def test_async_retry_resends_whole_body(resume):
+    pytest.importorskip("aiohttp")
+
+    async def post(url):
+        client = create_async_client(max_retries=2)
+        client.throttle.retry = RetryPolicy(max_retries=2, backoff_base=0.01)
+        try:
+            with MultipartFileBody(FIELDS, "file", resume) as body:
+                resp = await post_multipart_async(client, url, body)
+                body.seek(0)
+                return resp.status_code, body.read()
+        finally:
+            await client.aclose()
+
+    with StubServer() as stub:
+        stub.queue(Reply(503), Reply(503))
+        status, expected = asyncio.run(post(f"{stub.url}/upload"))
+
+    assert status == 200
+    assert [r.body for r in stub.requests] == [expected] * 3
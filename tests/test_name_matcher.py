@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+import legacy_name_rules as legacy
+import updated_sjm_script_finalized as uploader
+from conftest import FIXTURES_DIR
+from name_matcher import compile_reject, normalize_line
+
+# One name-ish line per row; whitespace is significant, so rows are not stripped
+CORPUS = (FIXTURES_DIR / "name_lines.txt").read_text(encoding="utf-8").split("\n")[:-1]
+
+
+def random_lines(n: int, seed: int = 7) -> list[str]:
+    alphabet = list("abcdefghijKLMNOPqrstuvwxyz   -'.,@|0123456789\t²①é") + [
+        "resume", "cv", "Email", "PHONE", "Jane", "O'Neil", "Smith-Jones", "İ", " "
+    ]
+    rng = random.Random(seed)
+    return ["".join(rng.choice(alphabet) for _ in range(rng.randint(0, 70))) for _ in range(n)]
+
+
+@pytest.mark.parametrize("line", CORPUS)
+def test_first_page_rule_matches_legacy(line):
+    assert uploader.is_reasonable_name(line) == legacy.is_reasonable_name(line)
+    assert uploader.name_from_text(line) == legacy.name_from_text(line)
+
+
+@pytest.mark.parametrize("line", CORPUS)
+def test_two_page_rule_matches_legacy(line):
+    assert uploader.name_from_text_two_pages(line) == legacy.find_name_in_text(line)
+
+
+@pytest.mark.parametrize("line", CORPUS)
+def test_normalize_line_matches_legacy(line):
+    assert normalize_line(line) == legacy.normalize_line(line)
+
+
+def test_random_lines_match_legacy():
+    for line in random_lines(20000):
+        assert uploader.is_reasonable_name(line) == legacy.is_reasonable_name(line), line
+        assert uploader.name_from_text_two_pages(line) == legacy.find_name_in_text(line), line
+
+
+def test_multi_line_texts_match_legacy():
+    rng = random.Random(11)
+    pool = CORPUS + random_lines(2000, seed=3)
+    for _ in range(1000):
+        text = "\n".join(rng.sample(pool, 35))
+        assert uploader.name_from_text(text) == legacy.name_from_text(text)
+        assert uploader.name_from_text_two_pages(text) == legacy.find_name_in_text(text)
+
+
+def test_known_lines():
+    assert uploader.name_from_text("RESUME\njane.doe@example.com\nmary ann smith") == ("Mary", "Ann Smith")
+    assert uploader.name_from_text("Jane Doe²") is None
+    assert uploader.name_from_text_two_pages("Jane Doe 2024") == ("Jane", "Doe")
+
+
+def test_compile_reject_without_alternatives_matches_nothing():
+    assert compile_reject([]).search("anything") is None
@@ -0,0 +1,290 @@
+import csv
+import io
+import json
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+from bson import ObjectId  # noqa: E402
+from pymongo.errors import AutoReconnect  # noqa: E402
+
+import script_for_update_profile_scores as scores  # noqa: E402
+
+HEADERS = ["job_obj_id", "external_id", "application_obj_id", "fit_score"]
+
+
+class FakeCollection:
+    """
+    The part of a pymongo collection the export uses, over {_id: document}.
+    Every find() records its $in batch; a query touching one of `fail_ids` raises
+    like a dropped connection, and the first batch answers `first_delay` seconds late.
+    """
+
+    def __init__(self, docs: dict, fail_ids=(), first_delay: float = 0.0):
+        self.docs = docs
+        self.fail_ids = set(fail_ids)
+        self.first_delay = first_delay
+        self.batches: list[list] = []
+        self._lock = threading.Lock()
+
+    def _project(self, oid):
+        doc = self.docs.get(oid)
+        if doc is None:
+            return None
+        return {"_id": oid, **({"profile": {"fit_score": doc["profile"]["fit_score"]}} if doc.get("profile") else {})}
+
+    def find(self, query, projection):
+        assert projection == {"profile.fit_score": 1}
+        ids = query["_id"]["$in"]
+        with self._lock:
+            first = not self.batches
+            self.batches.append(list(ids))
+        if first and self.first_delay:
+            time.sleep(self.first_delay)
+        if self.fail_ids.intersection(ids):
+            raise AutoReconnect("connection reset")
+        return iter([d for d in map(self._project, ids) if d is not None])
+
+    def find_one(self, query, projection):
+        if query["_id"] in self.fail_ids:
+            raise AutoReconnect("connection reset")
+        return self._project(query["_id"])
+
+
+def make_dataset(count: int):
+    """
+    `count` success rows over distinct applications plus the awkward cases: repeated
+    ids, unparseable ids, applications with no document, no profile, or a falsy score.
+    Returns (rows, documents).
+    """
+    oids = [ObjectId(f"{i:024x}") for i in range(1, count + 1)]
+    values = [0.5, 87, "72.5", 0, None, ""]
+    docs = {}
+    for i, oid in enumerate(oids):
+        if i % 11 == 3:
+            continue  # no document
+        docs[oid] = {"profile": None} if i % 13 == 5 else {"profile": {"fit_score": values[i % len(values)]}}
+    rows = [{"job_obj_id": "a" * 24, "external_id": f"app_pcf_1_{i}_0", "application_obj_id": str(oid)} for i, oid in enumerate(oids)]
+    rows[10:10] = [
+        {"job_obj_id": "a" * 24, "external_id": "bad", "application_obj_id": ""},
+        {"job_obj_id": "a" * 24, "external_id": "bad", "application_obj_id": "n/a"},
+        {"job_obj_id": "a" * 24, "external_id": "dup", "application_obj_id": f" ObjectId('{oids[0]}') "},
+    ]
+    rows.append(dict(rows[-1]))
+    return rows, docs
+
+
+def per_row_fit_scores(col, rows: list[dict]):
+    # the export as it was before batching: one find_one per row
+    for row in rows:
+        oid = scores.to_oid((row.get("application_obj_id") or "").strip())
+        row["fit_score"] = ""
+        if not oid:
+            continue
+        try:
+            doc = col.find_one({"_id": oid}, {"profile.fit_score": 1})
+        except Exception:
+            continue
+        if doc:
+            row["fit_score"] = ((doc.get("profile") or {}).get("fit_score")) or ""
+
+
+def csv_bytes(rows: list[dict]) -> bytes:
+    out = io.StringIO()
+    w = csv.DictWriter(out, fieldnames=HEADERS)
+    w.writeheader()
+    w.writerows(rows)
+    return out.getvalue().encode("utf-8")
+
+
+def copy(rows: list[dict]) -> list[dict]:
+    return [dict(r) for r in rows]
+
+
+def test_batches_split_at_batch_size():
+    rows, docs = make_dataset(2 * scores.BATCH_SIZE + 37)
+    col = FakeCollection(docs)
+    scores.enrich_rows(col, rows)
+
+    assert sorted(len(b) for b in col.batches) == [37, scores.BATCH_SIZE, scores.BATCH_SIZE]
+    queried = [oid for batch in col.batches for oid in batch]
+    # every distinct id exactly once, repeated rows included
+    assert len(queried) == len(set(queried)) == 2 * scores.BATCH_SIZE + 37
+
+
+def test_output_matches_per_row_lookups():
+    rows, docs = make_dataset(2 * scores.BATCH_SIZE + 37)
+    expected = copy(rows)
+    per_row_fit_scores(FakeCollection(docs), expected)
+
+    # the first batch finishing last must not reorder anything
+    matched, failed, from_store = scores.enrich_rows(FakeCollection(docs, first_delay=0.2), rows)
+
+    assert csv_bytes(rows) == csv_bytes(expected)
+    assert [r["external_id"] for r in rows] == [r["external_id"] for r in expected]
+    assert (failed, from_store) == (0, 0)
+    assert matched == sum(1 for r in expected if scores.to_oid(r["application_obj_id"]) in docs)
+
+
+def test_failed_batch_leaves_its_rows_empty():
+    rows, docs = make_dataset(2 * scores.BATCH_SIZE + 37)
+    expected = copy(rows)
+    per_row_fit_scores(FakeCollection(docs), expected)
+
+    probe = FakeCollection(docs)
+    scores.enrich_rows(probe, copy(rows))
+    second = set(sorted(probe.batches, key=lambda b: b[0])[1])
+    col = FakeCollection(docs, fail_ids=[next(iter(second))])
+    matched, failed, _ = scores.enrich_rows(col, rows)
+
+    in_batch = [scores.to_oid(r["application_obj_id"]) in second for r in rows]
+    assert failed == sum(in_batch)
+    for row, want, hit in zip(rows, expected, in_batch):
+        assert row["fit_score"] == ("" if hit else want["fit_score"])
+    assert matched == sum(1 for r, hit in zip(rows, in_batch) if not hit and scores.to_oid(r["application_obj_id"]) in docs)
+
+
+class InterruptedCollection(FakeCollection):
+    # a Ctrl-C during the query after `queries` successful ones
+    def __init__(self, docs: dict, queries: int):
+        super().__init__(docs)
+        self.queries = queries
+
+    def find(self, query, projection):
+        if len(self.batches) >= self.queries:
+            raise KeyboardInterrupt
+        return super().find(query, projection)
+
+
+class FakeClient:
+    def __init__(self, col):
+        self.col = col
+        self.admin = self
+
+    def command(self, name):
+        return {"ok": 1}
+
+    def __getitem__(self, name):
+        return {"profiles": self.col}
+
+
+@pytest.fixture
+def export(tmp_path, monkeypatch):
+    """
+    Runs main() on tmp_path/success.csv -> tmp_path/out/results.csv against a given
+    collection: export(col, *flags). export.source is the input CSV.
+    """
+    rows, _ = make_dataset(1000)
+    source = tmp_path / "success.csv"
+    with open(source, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=HEADERS[:-1])
+        w.writeheader()
+        w.writerows(rows)
+    monkeypatch.setattr(scores, "INPUT_CSV", source)
+    monkeypatch.setattr(scores, "OUTPUT_CSV", tmp_path / "out" / "results.csv")
+    monkeypatch.setattr(scores, "SCORE_STORE_PATH", tmp_path / "out" / "store.sqlite3")
+    monkeypatch.setattr(scores, "MONGO_URI", "mongodb://stub")
+    monkeypatch.setattr(scores, "MONGO_DB", "db")
+    monkeypatch.setattr(scores, "MONGO_COLLECTION", "profiles")
+
+    def run(col, *flags):
+        monkeypatch.setattr(scores, "MongoClient", lambda uri, **kwargs: FakeClient(col))
+        monkeypatch.setattr("sys.argv", ["script_for_update_profile_scores.py", "--chunk_rows", "100", *flags])
+        scores.main()
+
+    run.source = source
+    return run
+
+
+def partial_files():
+    partial = scores.OUTPUT_CSV.with_name(scores.OUTPUT_CSV.name + ".partial")
+    return partial, scores._offset_path(partial)
+
+
+def queried(col) -> list:
+    return [oid for batch in col.batches for oid in batch]
+
+
+def test_resume_matches_uninterrupted_run(export):
+    _, docs = make_dataset(1000)
+    export(FakeCollection(docs))
+    expected = scores.OUTPUT_CSV.read_bytes()
+    scores.OUTPUT_CSV.write_bytes(b"previous export\n")
+
+    with pytest.raises(KeyboardInterrupt):
+        export(InterruptedCollection(docs, queries=3))
+    partial, offset = partial_files()
+    assert json.loads(offset.read_text(encoding="utf-8"))["rows"] == 300
+    # the finished export is only replaced once every row is written
+    assert scores.OUTPUT_CSV.read_bytes() == b"previous export\n"
+
+    # a chunk written but never recorded, longer than everything still to come
+    with open(partial, "a", encoding="utf-8") as f:
+        f.write(("a" * 24 + ",half-written,row\r\n") * 20000)
+
+    col = FakeCollection(docs)
+    export(col, "--resume")
+
+    assert scores.OUTPUT_CSV.read_bytes() == expected
+    assert not partial.exists() and not offset.exists()
+    # only the rows after the last completed chunk were looked up again
+    with open(export.source, newline="", encoding="utf-8") as f:
+        rest = list(csv.DictReader(f))[300:]
+    assert set(queried(col)) == {scores.to_oid(r["application_obj_id"]) for r in rest} - {None}
+
+
+def test_resume_with_changed_header_starts_over(export):
+    _, docs = make_dataset(1000)
+    with pytest.raises(KeyboardInterrupt):
+        export(InterruptedCollection(docs, queries=3))
+
+    # the input gained a column since the interrupted run
+    text = export.source.read_text(encoding="utf-8").splitlines(keepends=True)
+    export.source.write_text(
+        text[0].rstrip("\r\n") + ",note\r\n" + "".join(line.rstrip("\r\n") + ",x\r\n" for line in text[1:]), encoding="utf-8"
+    )
+    col = FakeCollection(docs)
+    export(col, "--resume")
+    resumed = scores.OUTPUT_CSV.read_bytes()
+
+    export(FakeCollection(docs))
+    assert resumed == scores.OUTPUT_CSV.read_bytes()
+    assert resumed.startswith(b"job_obj_id,external_id,application_obj_id,note,fit_score\r\n")
+    assert len(queried(col)) == 1000
+
+
+def test_without_resume_starts_over(export):
+    _, docs = make_dataset(1000)
+    with pytest.raises(KeyboardInterrupt):
+        export(InterruptedCollection(docs, queries=3))
+
+    col = FakeCollection(docs)
+    export(col)
+    assert len(queried(col)) == 1000
+    assert not any(p.exists() for p in partial_files())
+
+
+def test_incremental_rerun_queries_only_missing_scores(tmp_path):
+    rows, docs = make_dataset(2 * scores.BATCH_SIZE + 37)
+    expected = copy(rows)
+    per_row_fit_scores(FakeCollection(docs), expected)
+    store = scores.ScoreStore(tmp_path / "store.sqlite3")
+    try:
+        first = FakeCollection(docs)
+        assert scores.enrich_rows(first, copy(rows), store)[2] == 0
+
+        col = FakeCollection(docs)
+        again = copy(rows)
+        matched, failed, from_store = scores.enrich_rows(col, again, store)
+    finally:
+        store.close()
+
+    final = {scores.to_oid(r["application_obj_id"]) for r in expected if r["fit_score"] != ""}
+    assert set(queried(col)) == set(queried(first)) - final
+    assert len(queried(col)) == len(set(queried(col)))
+    assert csv_bytes(again) == csv_bytes(expected)
+    assert from_store == sum(1 for r in expected if r["fit_score"] != "")
+    assert failed == 0
@@ -0,0 +1,68 @@
+import pytest
+
+import score_store
+from score_store import ScoreStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ScoreStore(tmp_path / "store.sqlite3")
+    yield s
+    s.close()
+
+
+def test_round_trip_keeps_json_types(tmp_path):
+    path = tmp_path / "store.sqlite3"
+    s = ScoreStore(path)
+    s.put_many({"a": 0.5, "b": 87, "c": "72.5", "d": {"overall": 3}})
+    s.close()
+
+    # a later run reads back what an earlier one stored
+    s = ScoreStore(path)
+    assert s.get_many(["a", "b", "c", "d", "missing"]) == {"a": 0.5, "b": 87, "c": "72.5", "d": {"overall": 3}}
+    assert len(s) == 4
+    s.close()
+
+
+def test_empty_scores_are_never_stored(store):
+    store.put_many({"a": "", "b": None, "c": 0.25})
+    assert store.get_many(["a", "b", "c"]) == {"c": 0.25}
+    assert len(store) == 1
+
+
+def test_later_score_replaces_earlier(store):
+    store.put_many({"a": 1})
+    store.put_many({"a": 2, "b": ""})
+    assert store.get_many(["a", "b"]) == {"a": 2}
+
+
+def test_lookups_past_the_parameter_limit(store):
+    ids = [f"{i:024x}" for i in range(3 * score_store.LOOKUP_CHUNK + 7)]
+    store.put_many({key: i for i, key in enumerate(ids) if i % 2})
+    found = store.get_many(ids + ids[:10])
+    assert found == {key: i for i, key in enumerate(ids) if i % 2}
+
+
+def test_bson_values_stored_as_strings(store):
+    bson = pytest.importorskip("bson")
+    oid = bson.ObjectId()
+    store.put_many({"a": bson.Decimal128("71.25"), "b": oid})
+    assert store.get_many(["a", "b"]) == {"a": "71.25", "b": str(oid)}
+
+
+def test_schema_change_drops_stored_scores(tmp_path, monkeypatch):
+    path = tmp_path / "store.sqlite3"
+    s = ScoreStore(path)
+    s.put_many({"a": 1})
+    s.close()
+
+    monkeypatch.setattr(score_store, "SCHEMA_VERSION", score_store.SCHEMA_VERSION + 1)
+    s = ScoreStore(path)
+    assert len(s) == 0
+    s.put_many({"b": 2})
+    s.close()
+
+    # same version again: nothing is dropped
+    s = ScoreStore(path)
+    assert s.get_many(["a", "b"]) == {"b": 2}
+    s.close()
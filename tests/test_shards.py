@@ -0,0 +1,123 @@
+import argparse
+import shutil
+import sys
+
+import pytest
+
+import script_merge_upload_shards as merge
+import updated_sjm_script_finalized as uploader
+from conftest import make_job_folder, read_csv
+from stub_server import StubServer, apply_job_api
+
+JOBS = {"1393": "a" * 24, "1394": "b" * 24, "1395": "c" * 24}
+
+
+@pytest.mark.parametrize("spec, expected", [("0/1", (0, 1)), ("2/3", (2, 3)), (" 1/4", (1, 4))])
+def test_parse_shard(spec, expected):
+    assert uploader.parse_shard(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["3/3", "-1/2", "0/0", "1", "a/b", "1/2/3"])
+def test_parse_shard_rejects(spec):
+    with pytest.raises(argparse.ArgumentTypeError):
+        uploader.parse_shard(spec)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7])
+def test_every_key_in_exactly_one_shard(count):
+    keys = [f"app_pcf_{1000 + i % 50}_{100000 + i}_{i % 3}" for i in range(5000)]
+    owners = [[i for i in range(count) if uploader.in_shard(k, (i, count))] for k in keys]
+    assert all(len(o) == 1 for o in owners)
+    assert {o[0] for o in owners} == set(range(count))
+
+
+def test_shard_files_in_shard_order(tmp_path):
+    target = tmp_path / "profile_upload_success.csv"
+    for index in (10, 2, 0):
+        uploader.shard_path(target, (index, 12)).touch()
+    uploader.shard_path(target, (1, 2)).touch()
+    (tmp_path / "profile_upload_success.shard-x-of-2.csv").touch()
+    (tmp_path / "profile_upload_failures.shard-0-of-2.csv").touch()
+
+    assert [p.name for p in uploader.shard_files(target)] == [
+        "profile_upload_success.shard-1-of-2.csv",
+        "profile_upload_success.shard-0-of-12.csv",
+        "profile_upload_success.shard-2-of-12.csv",
+        "profile_upload_success.shard-10-of-12.csv",
+    ]
+
+
+def run(stub, base_dir, *extra: str):
+    jobs = [arg for job_id, oid in JOBS.items() for arg in ("--job", f"job_{job_id}={oid}")]
+    uploader.main([
+        "--base_dir", str(base_dir),
+        *jobs,
+        "--api_base", f"{stub.url}/apply-job",
+        "--no_name_cache",
+        "--workers", "4",
+        *extra,
+    ])
+
+
+def run_shards(stub, base_dir, count: int, shard_by: str):
+    for index in range(count):
+        run(stub, base_dir, "--shard", f"{index}/{count}", "--shard_by", shard_by)
+
+
+def run_merge(out, monkeypatch):
+    monkeypatch.setattr(sys, "argv", [
+        "script_merge_upload_shards.py",
+        "--success_csv", str(out / "profile_upload_success.csv"),
+        "--failures_csv", str(out / "profile_upload_failures.csv"),
+        "--checkpoint", str(out / "upload_checkpoint.csv"),
+    ])
+    merge.main()
+
+
+@pytest.mark.parametrize("shard_by", ["job_id", "external_id"])
+def test_shards_cover_input_once_and_merge(tmp_path, uploader_outputs, monkeypatch, shard_by):
+    base_dir = tmp_path / "resumes"
+    pdfs = [p for job_id in JOBS for p in make_job_folder(base_dir, job_id, 9)]
+
+    with StubServer(apply_job_api()) as stub:
+        run_shards(stub, base_dir, 3, shard_by)
+
+    assert len(stub.matching("/upload-candidate-resume/")) == len(pdfs)
+
+    shard_rows = [read_csv(uploader.shard_path(uploader_outputs / "profile_upload_success.csv", (i, 3))) for i in range(3)]
+    keys = [(r["job_obj_id"], r["external_id"]) for rows in shard_rows for r in rows]
+    expected = {(JOBS[p.parent.name.split("_")[1]], p.stem) for p in pdfs}
+    assert sorted(keys) == sorted(expected)
+    if shard_by == "job_id":
+        # no job is split across shards
+        owners = [{r["job_obj_id"] for r in rows} for rows in shard_rows]
+        assert sum(len(o) for o in owners) == len(set().union(*owners)) == len(JOBS)
+
+    # a shard that was run twice (or rerun as another split) leaves overlapping rows behind
+    shutil.copy(
+        uploader.shard_path(uploader_outputs / "profile_upload_success.csv", (0, 3)),
+        uploader.shard_path(uploader_outputs / "profile_upload_success.csv", (0, 1)),
+    )
+    run_merge(uploader_outputs, monkeypatch)
+    merged = read_csv(uploader_outputs / "profile_upload_success.csv")
+    checkpoint = read_csv(uploader_outputs / "upload_checkpoint.csv")
+    assert sorted((r["job_obj_id"], r["external_id"]) for r in merged) == sorted(expected)
+    assert sorted((r["job_obj_id"], r["external_id"]) for r in checkpoint) == sorted(expected)
+
+    # merging again changes nothing
+    before = (uploader_outputs / "profile_upload_success.csv").read_bytes()
+    run_merge(uploader_outputs, monkeypatch)
+    assert (uploader_outputs / "profile_upload_success.csv").read_bytes() == before
+
+
+def test_unsharded_run_resumes_from_merged_shards(tmp_path, uploader_outputs, monkeypatch):
+    base_dir = tmp_path / "resumes"
+    for job_id in JOBS:
+        make_job_folder(base_dir, job_id, 4)
+
+    with StubServer(apply_job_api()) as stub:
+        run_shards(stub, base_dir, 2, "external_id")
+        run_merge(uploader_outputs, monkeypatch)
+        run(stub, base_dir)
+
+    assert len(stub.matching("/upload-candidate-resume/")) == 12
@@ -0,0 +1,216 @@
+import shutil
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+import updated_sjm_script_finalized as uploader
+from conftest import JOB_OBJ_ID, make_job_folder, make_pdf, parse_multipart, read_csv
+from stub_server import StubServer, apply_job_api
+
+MODES = {
+    "sequential": [],
+    "workers": ["--workers", "4"],
+    "prevalidate": ["--workers", "4", "--prevalidate"],
+    "async": ["--async", "--workers", "8"],
+}
+
+
+def run(stub: StubServer, base_dir, *extra: str):
+    uploader.main([
+        "--base_dir", str(base_dir),
+        "--job", f"job_1393={JOB_OBJ_ID}",
+        "--api_base", f"{stub.url}/apply-job",
+        "--no_name_cache",
+        *extra,
+    ])
+
+
+class CountingPool:
+    """
+    Worker pool wrapper tracking calls submitted but not finished yet (peak = most at once).
+    """
+
+    def __init__(self, pool):
+        self.pool = pool
+        self.pending = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        with self._lock:
+            self.pending += 1
+            self.peak = max(self.peak, self.pending)
+        fut = self.pool.submit(fn, *args)
+        fut.add_done_callback(self._done)
+        return fut
+
+    def _done(self, fut):
+        with self._lock:
+            self.pending -= 1
+
+
+@contextmanager
+def counting_pools():
+    """
+    Swaps the uploader's worker pools for CountingPools while active; yields the
+    list of pools opened meanwhile.
+    """
+    pools = []
+    original = uploader._worker_pool
+
+    @contextmanager
+    def counting(workers, name):
+        with original(workers, name) as pool:
+            pools.append(CountingPool(pool))
+            yield pools[-1]
+
+    uploader._worker_pool = counting
+    try:
+        yield pools
+    finally:
+        uploader._worker_pool = original
+
+
+def timed_run(base_dir, out_dir, delay: float, *extra: str) -> float:
+    """
+    Seconds for one unpaced run from scratch (fresh outputs and API) whose replies
+    take `delay` seconds each.
+    """
+    shutil.rmtree(out_dir, ignore_errors=True)
+    with StubServer(apply_job_api(), delay=delay) as stub:
+        started = time.perf_counter()
+        run(stub, base_dir, "--max_rps", "0", *extra)
+        elapsed = time.perf_counter() - started
+    assert len(stub.matching("/upload-candidate-resume/")) == sum(1 for _ in Path(base_dir).rglob("*.pdf"))
+    return elapsed
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_every_resume_uploaded_once(tmp_path, uploader_outputs, mode):
+    if mode == "async":
+        pytest.importorskip("aiohttp")
+    pdfs = make_job_folder(tmp_path / "resumes", "1393", 12)
+    rejected = uploader.build_fake_email("app_pcf_1393_100003_0")
+
+    with StubServer(apply_job_api(rejected_emails={rejected})) as stub:
+        run(stub, tmp_path / "resumes", *MODES[mode])
+
+    uploads = stub.matching(f"/upload-candidate-resume/{JOB_OBJ_ID}")
+    by_email = {}
+    for req in uploads:
+        parts = parse_multipart(req.headers["Content-Type"], req.body)
+        by_email[parts["email"][1].decode()] = parts
+
+    expected = {uploader.build_fake_email(p.stem): p for p in pdfs if uploader.build_fake_email(p.stem) != rejected}
+    assert len(uploads) == len(expected)
+    assert by_email.keys() == expected.keys()
+    for addr, parts in by_email.items():
+        pdf = expected[addr]
+        assert parts["file"] == (pdf.name, pdf.read_bytes())
+        assert parts["first_name"][1] == b"Jane"
+        assert parts["last_name"][1].decode() == "Doe" + "e" * (int(pdf.stem.split("_")[3]) - 100000)
+
+    success = read_csv(uploader_outputs / "profile_upload_success.csv")
+    failures = read_csv(uploader_outputs / "profile_upload_failures.csv")
+    assert sorted(r["email"] for r in success) == sorted(expected)
+    assert [r["email"] for r in failures] == [rejected]
+
+
+def test_rerun_skips_uploaded_resumes(tmp_path, uploader_outputs):
+    make_job_folder(tmp_path / "resumes", "1393", 6)
+
+    with StubServer(apply_job_api()) as stub:
+        run(stub, tmp_path / "resumes", "--workers", "3")
+        first = len(stub.matching("/upload-candidate-resume/"))
+        run(stub, tmp_path / "resumes", "--workers", "3")
+
+    assert first == 6
+    assert len(stub.matching("/upload-candidate-resume/")) == 6
+    assert len(read_csv(uploader_outputs / "upload_checkpoint.csv")) == 6
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_files_sharing_an_email_upload_once(tmp_path, uploader_outputs, monkeypatch, mode):
+    if mode == "async":
+        pytest.importorskip("aiohttp")
+    # three files of one profile -> one email with --email_style profile_id
+    folder = tmp_path / "resumes" / "job_4001"
+    for idx in range(3):
+        make_pdf(folder / f"app_pcf_4001_100001_{idx}.pdf", ["Jane Doe"])
+
+    # the first file's names come last, so a later file reaches the email lock first
+    names_for = uploader._names_for
+
+    def slow_first(pdf_path, names, name_cache):
+        if pdf_path.name.endswith("_0.pdf"):
+            time.sleep(0.3)
+        return names_for(pdf_path, names, name_cache)
+
+    monkeypatch.setattr(uploader, "_names_for", slow_first)
+
+    with StubServer(apply_job_api()) as stub:
+        uploader.main([
+            "--base_dir", str(tmp_path / "resumes"),
+            "--job", f"job_4001={JOB_OBJ_ID}",
+            "--api_base", f"{stub.url}/apply-job",
+            "--no_name_cache",
+            "--email_style", "profile_id",
+            *MODES[mode],
+        ])
+
+    assert len(stub.matching("/upload-candidate-resume/")) == 1
+    assert len(read_csv(uploader_outputs / "profile_upload_success.csv")) == 1
+    assert len(read_csv(uploader_outputs / "profile_upload_failures.csv")) == 2
+
+
+@pytest.mark.parametrize("parallel_jobs", [1, 2])
+def test_second_ctrl_c_abandons_running_jobs(uploader_outputs, parallel_jobs):
+    release = threading.Event()
+
+    def ctrl_c():
+        # like a terminal's Ctrl-C: delivered to the main thread, whichever thread runs the job
+        signal.pthread_kill(threading.main_thread().ident, signal.SIGINT)
+
+    def hung_job(job, stop):
+        ctrl_c()
+        assert stop.wait(5)
+        ctrl_c()
+        # an upload that never answers
+        release.wait(10)
+        return (1, 1, 0, 0, 0, 0)
+
+    handler = signal.getsignal(signal.SIGINT)
+    started = time.monotonic()
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            uploader.run_jobs_threaded([{"job_id": "1393"}], hung_job, parallel_jobs)
+        assert time.monotonic() - started < 5
+        assert signal.getsignal(signal.SIGINT) is handler
+    finally:
+        release.set()
+    # the first Ctrl-C is logged from its own thread; let it finish while the log path is patched
+    log = uploader_outputs / "progress.log"
+    deadline = time.monotonic() + 5
+    while not (log.exists() and "INTERRUPT" in log.read_text()) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert "INTERRUPT" in log.read_text()
+
+
+def test_worker_pool_beats_sequential_within_its_window(tmp_path, uploader_outputs):
+    base_dir = tmp_path / "resumes"
+    make_job_folder(base_dir, "1393", 16)
+
+    # 16 files x (validate + upload) x 0.05 s is at least 1.6 s one at a time
+    sequential = timed_run(base_dir, uploader_outputs, 0.05)
+    with counting_pools() as pools:
+        pooled = timed_run(base_dir, uploader_outputs, 0.05, "--workers", "4")
+
+    assert sequential >= 1.6
+    assert pooled < sequential / 2
+    # calls are queued ahead of the 4 workers, but never more than workers * 2
+    assert len(pools) == 1
+    assert 4 < pools[0].peak <= 8